@@ -1,12 +1,15 @@
 import os
 import errno
 import gta.gxt
+from gta.cache import ParseCache
 import ctypes
 from PyQt6 import QtWidgets, QtGui, QtCore
 from builder.IVGXT import *
 from builder.LCGXT import *
 from builder.SAGXT import *
 from builder.VCGXT import *
+from builder.gxt_layout import GXTLayout
+from builder.gxt_text import detect_version, open_text
 from PyQt6.QtWidgets import (
     QApplication, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QGroupBox, QFileDialog,
     QMessageBox, QTableWidget, QTableWidgetItem, QLineEdit, QWidget, QComboBox, QAbstractItemView, QDialog, QHeaderView, QSizePolicy,
@@ -28,6 +31,8 @@ from PyQt6.QtNetwork import QNetworkRequest, QNetworkAccessManager
 
 from master.about_window import open_about_window
 from master.convert_using_table import convert_using_table
+from master.gxt_table_model import GXTTableView, parseTableContent, isSectionKey
+from master.gxt_search_index import TrigramIndex, scanRows, regexRows
 from master.check_update import UpdateChecker
 from Debug_menu.debug_menu import DebugMenu
 
@@ -80,27 +85,12 @@ class CustomTableWidgetItem(QTableWidgetItem):
         self.setFlags(self.flags() | Qt.ItemFlag.ItemIsEditable)  # 修正命名空间
         self._last_text = text  # 添加文本历史记录属性
 
-class TableItemHistoryManager:
-    """表格项修改历史管理器"""
-    def __init__(self):
-        self._item_history = {}  # 存储表格项的修改历史
-        
-    def set_last_text(self, item, text):
-        """设置表格项的上次文本"""
-        item_id = id(item)
-        self._item_history[item_id] = text
-        
-    def get_last_text(self, item):
-        """获取表格项的上次文本"""
-        item_id = id(item)
-        return self._item_history.get(item_id, "")
-
 class GXTViewer(QWidget):
     def __init__(self):
         super().__init__()
         self.gxt_file_path = None
         self.gxt_txt_path = None
-        self.parsed_content = ""
+        self.gxt_layout = None  # 打开的GXT的表布局，保存时只重新编码有改动的表
         self.translations = {}
         self._current_language = '简体中文.lang'  # 添加当前语言属性
         self._row_cache = None  # 新增：缓存表格行数据
@@ -117,7 +107,9 @@ class GXTViewer(QWidget):
         self.value_column_font.setBold(True)  # 默认粗体
         self.mounted_table = None  # 添加挂载的码表属性
         self.table_conversion_state = 'original'  # 添加码表转换状态属性
-        self.table_item_history = TableItemHistoryManager()  # 添加表格项历史管理器
+        self._export_workers = []  # 后台TXT导出线程
+        self.gxt_encoding = None  # 打开的GXT检测到的文本编码（SA），保存时沿用
+        self.parse_cache = ParseCache()  # 解析结果的磁盘缓存，重复打开未修改的GXT时直接读回
         
         self.load_language_file()
         self.initUI()
@@ -230,8 +222,10 @@ class GXTViewer(QWidget):
         self.search_timer = QtCore.QTimer(self)
         self.search_timer.setSingleShot(True)
         self.search_timer.timeout.connect(self.perform_search)
-        self.search_cache = {}  # 搜索缓存
-        self.table_data_cache = []  # 表格数据缓存
+        self.search_index = None  # 当前文档的三元组搜索索引（后台构建）
+        self._search_index_worker = None
+        self._index_workers = []
+        self._search_index_pending_rows = set()  # 索引构建期间被编辑的行
         self.regex_mode = False  # 添加正则表达式模式标志
 
         font = QtGui.QFont("Microsoft YaHei UI", 10)
@@ -458,10 +452,14 @@ class GXTViewer(QWidget):
             }
         """
 
-        self.output_table = QTableWidget(self)
+        self.output_table = GXTTableView(self)
         self.output_table.setUpdatesEnabled(False)
         self.output_table.setViewportMargins(0, 0, 0, 0)
-        self.output_table.setColumnCount(3)
+        # 单元格修改由模型统一通知（含修改前文本），只需连接一次
+        self.output_table.gxtModel().cellEdited.connect(self.on_table_cell_edited)
+        # 行数变化后行号失效，需要重建搜索索引
+        self.output_table.gxtModel().rowsInserted.connect(self.start_search_index_build)
+        self.output_table.gxtModel().rowsRemoved.connect(self.start_search_index_build)
         self.output_table.setHorizontalHeaderLabels([self.tr("table_column_key"), self.tr("table_column_value"), self.tr("change_the_row")])
         # 修改为PyQt6的EditTrigger
         self.output_table.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked)
@@ -874,8 +872,7 @@ class GXTViewer(QWidget):
         with open(output_file_path, 'w', encoding='utf-8') as f:
             f.write(f'[{name}]\n')
             if reader is not None and hasattr(reader, "parseTKeyTDat"):
-                for text in reader.parseTKeyTDat(gxt):
-                    f.write(text[0] + '=' + text[1] + '\n')
+                f.writelines(f"{key}={value}\n" for key, value in reader.parseTKeyTDat(gxt))
 
     @staticmethod
     def createOutputDir(path: str):
@@ -888,98 +885,128 @@ class GXTViewer(QWidget):
             if e.errno != errno.EEXIST:
                 raise
 
-    def gxt_processing(self, file_path: str, outDirName: str, render_only=False):
+    def gxt_processing(self, file_path: str):
+        """解析 GXT 为 GXTDocument（整个文件只解析一次），失败时返回 None"""
         import time
-        gxt_name = os.path.splitext(os.path.basename(file_path))[0]
         try:
             start_time = time.perf_counter()
             # 记录解析开始时的 Unix 时间戳
             timestamp = int(time.time())
             self.timestamp_label.setText(f"{timestamp}")
             
-            with open(file_path, 'rb') as gxt:
+            with gta.gxt.MemoryMappedFile(file_path) as gxt:
                 gxtversion = gta.gxt.getVersion(gxt)
                 if not gxtversion:
                     self.version_icon_label.setVisible(False)
                     QMessageBox.critical(self, self.tr("error"), self.tr("error_unknown_gxt_version"))
-                    return ""
+                    return None
                 # 更新状态栏中的版本信息和图标
                 self.version_label.setText(f"{self.tr('title_version')} {gxtversion}")
                 self.update_version_icon(gxtversion)
                 # 保持窗口标题不变
                 self.setWindowTitle(self.tr("window_title"))
 
-                gxtReader = gta.gxt.getReader(gxtversion)
-                if gxtReader is None:
-                    self.version_icon_label.setVisible(False)
-                    QMessageBox.critical(self, self.tr("error"), self.tr("error_unknown_gxt_version"))
-                    return ""
-
-                content_lines = []
-                if gxtversion == 'III':
-                    if hasattr(gxtReader, "parseTKeyTDat"):
-                        for text in gxtReader.parseTKeyTDat(gxt):
-                            # 修正：保留所有内容，包括最后一个字符
-                            content_lines.append(f"{text[0]}={text[1]}")
-                    content_str = "\n".join(content_lines)
-                    if not render_only:
-                        self.gxt_txt_path = os.path.join(os.path.dirname(file_path), f"{gxt_name}.txt")
-                        with open(self.gxt_txt_path, 'w', encoding='utf-8') as output_file:
-                            output_file.write(content_str)
-                else:
-                    gxt_dir = os.path.join(os.path.dirname(file_path), gxt_name)
-                    if not render_only:
-                        self.createOutputDir(gxt_dir)
-                    Tables = []
-                    if hasattr(gxtReader, "hasTables") and gxtReader.hasTables() and hasattr(gxtReader, "parseTables"):
-                        Tables = gxtReader.parseTables(gxt)
-                    all_table_content = []
-                    for table_name, _ in Tables:
-                        table_lines = [f"[{table_name}]"]
-                        if hasattr(gxtReader, "parseTKeyTDat"):
-                            for text in gxtReader.parseTKeyTDat(gxt):
-                                # 修正：保留所有内容，包括最后一个字符
-                                table_lines.append(f"{text[0]}={text[1]}")
-                        all_table_content.append("\n".join(table_lines))
-                        if not render_only:
-                            table_file_path = os.path.join(gxt_dir, f"{table_name}.txt")
-                            with open(table_file_path, 'w', encoding='utf-8') as table_file:
-                                table_file.write("\n".join(table_lines))
-                    content_str = "\n\n".join(all_table_content)
-                    if not render_only:
-                        self.gxt_txt_path = os.path.join(os.path.dirname(file_path), f"{outDirName}.txt")
-                        with open(self.gxt_txt_path, 'w', encoding='utf-8') as output_file:
-                            output_file.write(content_str)
-
-                elapsed = time.perf_counter() - start_time
-                # 更新状态栏中的版本和解析时间信息
-                self.version_label.setText(f"{self.tr('title_version')} {gxtversion}")
-                self.update_version_icon(gxtversion)
-                self.elapsed_label.setText(f"{elapsed:.3f}s")
-                # 保留原有的窗口标题设置
-                self.setWindowTitle(self.tr("window_title"))
-                return content_str
+            document = self.parse_cache.loadDocument(file_path)
+
+            elapsed = time.perf_counter() - start_time
+            # 更新状态栏中的版本和解析时间信息
+            self.version_label.setText(f"{self.tr('title_version')} {gxtversion}")
+            self.update_version_icon(gxtversion)
+            self.elapsed_label.setText(f"{elapsed:.3f}s")
+            # 保留原有的窗口标题设置
+            self.setWindowTitle(self.tr("window_title"))
+            return document
         except Exception as e:
             self.version_icon_label.setVisible(False)
             QMessageBox.critical(self, self.tr("error"), self.tr("error_opening_gxt_file", error=str(e)))
-            return ""
+            return None
 
     def open_gxt_file(self, file_path: str):
         if os.path.isfile(file_path) and file_path.lower().endswith(".gxt"):
             self.gxt_file_path = file_path
             outDirName = os.path.splitext(os.path.basename(file_path))[0]
-            # 优先解析并渲染表格
-            content_str = self.gxt_processing(file_path, outDirName, render_only=True)
+            # 只解析一次，表格渲染与 TXT 导出共用同一份文档
+            document = self.gxt_processing(file_path)
+            self.gxt_encoding = document.encoding if document is not None else None
             self.output_table.clearContents()
-            if content_str:
-                self.display_gxt_content_in_table(content_str)
-                # 文件生成延后，异步或后台生成
-                QtCore.QTimer.singleShot(0, lambda: self.gxt_processing(file_path, outDirName, render_only=False))
+            self.gxt_layout = None
+            columns = document.columns if document is not None else None
+            if columns is not None and (len(columns) or any(name is not None for name in columns.names)):
+                # 读取器产出的列式数据直接交给表格模型，不再拼接为整份文本后重新拆分
+                self.display_gxt_content_in_table(columns)
+                self.capture_gxt_layout(file_path, document.version, document.spans, columns.iterTables)
+                # 文件写出放到后台线程，不阻塞界面
+                self.start_txt_export(document, file_path, outDirName)
             else:
                 QMessageBox.critical(self, self.tr("error_messages"), self.tr("error_invalid_gxt_file_path"))
         else:
             QMessageBox.critical(self, self.tr("error_messages"), self.tr("error_invalid_gxt_file_path"))
 
+    def capture_gxt_layout(self, file_path, version, spans, tables):
+        """
+        记录GXT文件的表布局（III 没有 TABL，不支持增量保存）。
+        tables 返回文件内容的 (表名, 条目) 序列，各表指纹在第一次保存时才由它计算。
+        """
+        self.gxt_layout = None
+        if version == 'III':
+            return
+        try:
+            self.gxt_layout = GXTLayout.capture(file_path, version, spans, tables)
+        except OSError:
+            pass
+
+    def start_txt_export(self, document, file_path: str, outDirName: str):
+        """在后台线程中将已解析的文档写出为 TXT（集成文本 + 分文本）"""
+        worker = TxtExportWorker(document, os.path.dirname(file_path), outDirName)
+
+        def on_finished(txt_path):
+            # 仅当导出的仍是当前打开的文件时才更新路径
+            if self.gxt_file_path == file_path:
+                self.gxt_txt_path = txt_path
+
+        def on_error(msg):
+            QMessageBox.critical(self, self.tr("error"), self.tr("error_opening_gxt_file", error=msg))
+
+        def on_done():
+            if worker in self._export_workers:
+                self._export_workers.remove(worker)
+
+        worker.exported.connect(on_finished)
+        worker.error.connect(on_error)
+        worker.finished.connect(on_done)
+        # 保持引用，避免线程运行中被回收
+        self._export_workers.append(worker)
+        worker.start()
+
+    def start_search_index_build(self, *args):
+        """在后台线程中为当前表格内容构建搜索索引，构建完成前搜索退回线性扫描"""
+        model = self.output_table.gxtModel()
+        self.search_index = None
+        self._search_index_pending_rows = set()
+        # 传入列表副本，构建期间的编辑记入待更新行
+        worker = SearchIndexWorker(*model.snapshot())
+        self._search_index_worker = worker
+
+        def on_built(index):
+            # 构建期间文档已更换或已开始新的构建时丢弃结果
+            if worker is not self._search_index_worker:
+                return
+            keys, values = model.keys(), model.values()
+            for row in self._search_index_pending_rows:
+                index.updateRow(row, keys[row], values[row])
+            self._search_index_pending_rows = set()
+            self.search_index = index
+
+        def on_done():
+            if worker in self._index_workers:
+                self._index_workers.remove(worker)
+
+        worker.built.connect(on_built)
+        worker.finished.connect(on_done)
+        # 保持引用，避免被新构建取代的线程在运行中被回收
+        self._index_workers.append(worker)
+        worker.start()
+
     def open_txt_file(self, file_path: str):
         """支持直接打开txt文件并渲染到表格，自动校验格式错误"""
         if os.path.isfile(file_path) and file_path.lower().endswith(".txt"):
@@ -1001,6 +1028,7 @@ class GXTViewer(QWidget):
                     return
                 self.gxt_file_path = None
                 self.gxt_txt_path = file_path
+                self.gxt_encoding = None
                 # 显示表格并隐藏占位符
                 self.output_table.setVisible(True)
                 self.placeholder_label.setVisible(False)
@@ -1055,25 +1083,8 @@ class GXTViewer(QWidget):
             return
 
         try:
-            content = []
-            current_section = ""
-            
-            for row in range(self.output_table.rowCount()):
-                key_item = self.output_table.item(row, 0)
-                value_item = self.output_table.item(row, 1)
-                
-                if key_item and value_item:
-                    key = key_item.text()
-                    value = value_item.text()
-                    
-                    if key.startswith('[') and key.endswith(']'):
-                        current_section = key
-                        content.append(key)
-                    else:
-                        content.append(f"{key}={value}")
-            
             with open(txt_file_path, 'w', encoding='utf-8') as target_file:
-                target_file.write("\n".join(content))
+                target_file.write(self.output_table.gxtModel().toText())
             
             QMessageBox.information(self, self.tr("prompt_messages"), self.tr("info_file_saved", path=txt_file_path))
         except Exception as e:
@@ -1115,18 +1126,12 @@ class GXTViewer(QWidget):
             QMessageBox.warning(self, self.tr("warning_messages"), self.tr("warning_select_and_parse_gxt_first"))
             return
 
-        debug_dir = os.path.join(gxt_dir, "Debug")
-
-        if os.path.exists(debug_dir):
-            shutil.rmtree(debug_dir)
-        self.createOutputDir(debug_dir)
-
         # 判断版本
         version = None
         auto_detected_version = None
         if self.gxt_file_path:
             try:
-                with open(self.gxt_file_path, 'rb') as gxt:
+                with gta.gxt.MemoryMappedFile(self.gxt_file_path) as gxt:
                     version = gta.gxt.getVersion(gxt)
             except Exception:
                 pass
@@ -1142,57 +1147,22 @@ class GXTViewer(QWidget):
             auto_detected_version = None
             if self.gxt_txt_path:
                 try:
-                    with open(self.gxt_txt_path, 'r', encoding='utf-8') as f:
-                        txt_content = f.read()
-                    lines = [line.strip() for line in txt_content.splitlines() if line.strip()]
-                    sections = [line for line in lines if line.startswith("[") and line.endswith("]")]
-                    keys = [line for line in lines if '=' in line and not (line.startswith("[") and line.endswith("]"))]
-                    section_names = set(s.lower() for s in sections)
-                    # 1. 没有section，且全部为key=value，极大概率为GTA3（III）
-                    if not sections:
-                        auto_detected_version = "III"
-                    else:
-                        # 2. 有section，分析section名和key格式
-                        import re
-                        vc_section_re = re.compile(r"^\[[0-9A-Z_]{1,7}\]$")
-                        vc_key_re = re.compile(r"^[0-9A-Z_]{1,7}$")
-                        sa_section_re = re.compile(r"^\[[A-Z_]{1,7}\]$")  # SA表名只能大写字母和下划线
-                        sa_key_re = re.compile(r"^[0-9A-F]{8}$", re.IGNORECASE)
-                        iv_section_re = re.compile(r"^\[[0-9A-Za-z_]{1,7}\]$")  # IV表名可有小写
-                        # 检查所有section和key是否符合VC、SA、IV格式
-                        is_vc = all(vc_section_re.match(s) for s in sections) and all(vc_key_re.match(k.split('=')[0]) for k in keys)
-                        is_sa = all(sa_section_re.match(s) for s in sections) and all(sa_key_re.match(k.split('=')[0]) for k in keys)
-                        is_iv = all(iv_section_re.match(s) for s in sections) and all(sa_key_re.match(k.split('=')[0]) for k in keys)
-                        if is_sa:
-                            # 优化：如果所有section都是大写字母和下划线，提示“识别为SA/IV”
-                            auto_detected_version = "SA"
-                            if all(sa_section_re.match(s) for s in sections):
-                                auto_detected_version = "SA/IV"
-                        elif is_vc:
+                    # 流式扫描一遍TXT，按表名与键名格式识别版本
+                    with open_text(self.gxt_txt_path) as f:
+                        auto_detected_version = detect_version(f)
+                    if auto_detected_version is None:
+                        # fallback: 文件名判断
+                        txt_name = os.path.basename(self.gxt_txt_path).lower()
+                        if "gta3" in txt_name:
+                            auto_detected_version = "III"
+                        elif "gtavc" in txt_name:
                             auto_detected_version = "VC"
-                        elif is_iv:
+                        elif "gtasa" in txt_name:
+                            auto_detected_version = "SA"
+                        elif "gta4" in txt_name:
                             auto_detected_version = "IV"
-                        elif "[main]" in section_names and len(section_names) == 1:
-                            # 只有[MAIN]，进一步判断key格式
-                            crc32_key = re.compile(r"^[0-9A-Fa-f]{8}$")
-                            key_samples = [k.split('=')[0].strip() for k in keys[:10]]
-                            if all(crc32_key.match(k) for k in key_samples if k):
-                                auto_detected_version = "IV"
-                            else:
-                                auto_detected_version = "SA"
                         else:
-                            # fallback: 文件名判断
-                            txt_name = os.path.basename(self.gxt_txt_path).lower()
-                            if "gta3" in txt_name:
-                                auto_detected_version = "III"
-                            elif "gtavc" in txt_name:
-                                auto_detected_version = "VC"
-                            elif "gtasa" in txt_name:
-                                auto_detected_version = "SA"
-                            elif "gta4" in txt_name:
-                                auto_detected_version = "IV"
-                            else:
-                                auto_detected_version = "SA"
+                            auto_detected_version = "SA"
                 except Exception:
                     auto_detected_version = "SA"
 
@@ -1216,131 +1186,102 @@ class GXTViewer(QWidget):
             else:
                 return  # 用户取消
 
-        output_txt_path = {
-            'III': os.path.join(debug_dir, "gta3.txt"),
-            'VC': os.path.join(debug_dir, "gtavc.txt"),
-            'SA': os.path.join(debug_dir, "gtasa.txt"),
-            'IV': os.path.join(debug_dir, "gta4.txt")
-        }.get(str(version))
-
-        if not output_txt_path:
+        if version not in ('III', 'VC', 'SA', 'IV'):
             self.version_icon_label.setVisible(False)
             QMessageBox.critical(self, self.tr("error_messages"), self.tr("error_unknown_gxt_version"))
             return
 
-        with open(output_txt_path, 'w', encoding='utf-8') as output_file:
-            for row in range(self.output_table.rowCount()):
-                # 遍历表格的每一行
-                key_item = self.output_table.item(row, 0)  # 获取第0列（key）的单元格
-                value_item = self.output_table.item(row, 1)  # 获取第1列（value）的单元格
-                if key_item and value_item:
-                    # 如果key和value都存在
-                    line = f"{key_item.text()}={value_item.text()}\n"  # 构造"key=value"格式的字符串并换行
-                    if '[' in key_item.text():
-                        # 如果key中包含'['，说明是section行，需要去掉等号
-                        line = line.replace('=', '', 1)  # 只替换第一个等号
-                    output_file.write(line)  # 写入到输出文件
-
-        builder_exe = {
-            'III': 'LCGXT.py',  # GTA3版本使用LCGXT.py
-            'VC': 'VCGXT.py',   # GTAVC版本使用VCGXT.py
-            'SA': 'SAGXT.py',   # GTASA版本使用SAGXT.py
-            'IV': 'IVGXT.py'    # GTAIV版本使用IVGXT.py
-        }.get(str(version))  # 根据版本选择对应的构建器
-
-        if not builder_exe:
-            # 如果没有找到对应的构建器，弹出错误提示
-            self.version_icon_label.setVisible(False)
-            QMessageBox.critical(self, self.tr("error_messages"), self.tr("error_unknown_gxt_version"))
-            return
-
-        # 根据版本选择对应的模块
-        if version == "III":
-            from builder.LCGXT import LCGXT
-            generator = LCGXT()
-            if not generator.load_text(output_txt_path):
-                QMessageBox.critical(self, self.tr("error_messages"), self.tr("error_loading_text"))
-                return
-            # 直接生成最终GXT文件
-            if self.gxt_file_path:
-                base_name = os.path.splitext(os.path.basename(self.gxt_file_path))[0]
-                final_gxt_path = os.path.join(gxt_dir, f"{base_name}.gxt")
+        # 直接生成最终GXT文件（与打开的GXT/TXT同目录同名）
+        base_name = os.path.splitext(os.path.basename(self.gxt_file_path or self.gxt_txt_path or ""))[0]
+        final_gxt_path = os.path.join(gxt_dir, f"{base_name}.gxt")
+
+        # 表格内容按表分组后直接交给构建器，不再经过 Debug 目录下的TXT中转
+        tables = self.output_table.gxtModel().toTables()
+        # 打开的GXT未被外部修改且表结构未变时，只重新编码有改动的表，其余表从原文件整块拷贝
+        layout = self.gxt_layout
+        changed = None
+        if (layout is not None and self.gxt_file_path and layout.path == self.gxt_file_path
+                and layout.version == version and layout.is_current()):
+            changed = layout.changed_tables(tables)
+            # IV 构建器会将表名转为大写，表名不是大写时无法按原布局拼接
+            if version == "IV" and changed is not None and any(name != name.upper() for name in tables):
+                changed = None
+        build_tables = tables if changed is None else {name: tables[name] for name in changed}
+        try:
+            # 根据版本选择对应的构建器
+            if version == "III":
+                from builder.LCGXT import LCGXT
+                generator = LCGXT()
+                loaded = generator.load_tables(build_tables)
+                build = generator.build_gxt
+            elif version == "VC":
+                from builder.VCGXT import VCGXT
+                generator = VCGXT()
+                loaded = generator.LoadTables(build_tables)
+                build = generator.BuildGXT
+                build_blocks = generator.BuildTableBlocks
+            elif version == "SA":
+                from builder.SAGXT import SAGXT
+                generator = SAGXT(encoding=self.gxt_encoding or 'utf-8')
+                loaded = generator.load_tables(build_tables)
+                build = generator.build_gxt
+                build_blocks = generator.build_table_blocks
             else:
-                base_name = os.path.splitext(os.path.basename(self.gxt_txt_path or ""))[0]
-                final_gxt_path = os.path.join(gxt_dir, f"{base_name}.gxt")
-            generator.save_as_gxt(final_gxt_path)
-            generated_gxt_path = final_gxt_path
-        elif version == "VC":
-            from builder.VCGXT import VCGXT
-            generator = VCGXT()
-            if not generator.LoadText(output_txt_path):
+                from builder.IVGXT import load_tables, build_gxt, build_table_blocks
+                iv_tables = load_tables(build_tables)
+                loaded = True
+                build = lambda: build_gxt(iv_tables)
+                build_blocks = lambda: build_table_blocks(iv_tables)
+
+            if not loaded:
                 QMessageBox.critical(self, self.tr("error_messages"), self.tr("error_loading_text"))
                 return
-            # 直接生成最终GXT文件
-            if self.gxt_file_path:
-                base_name = os.path.splitext(os.path.basename(self.gxt_file_path))[0]
-                final_gxt_path = os.path.join(gxt_dir, f"{base_name}.gxt")
+
+            if changed is not None:
+                blocks = dict(build_blocks())
             else:
-                base_name = os.path.splitext(os.path.basename(self.gxt_txt_path or ""))[0]
-                final_gxt_path = os.path.join(gxt_dir, f"{base_name}.gxt")
-            generator.SaveAsGXT(final_gxt_path)
-            generated_gxt_path = final_gxt_path
-        elif version == "SA":
-            from builder.SAGXT import SAGXT
-            generator = SAGXT()
-            if not generator.load_text(output_txt_path):
-                QMessageBox.critical(self, self.tr("error_messages"), self.tr("error_loading_text"))
-                return
-            # 直接生成最终GXT文件
+                gxt_data = build()
+
+            backup_gxt_path = None
             if self.gxt_file_path:
-                base_name = os.path.splitext(os.path.basename(self.gxt_file_path))[0]
-                final_gxt_path = os.path.join(gxt_dir, f"{base_name}.gxt")
+                # 覆盖前备份原始GXT文件
+                backup_gxt_path = os.path.join(gxt_dir, f"{base_name}_backup.gxt")
+                shutil.copy(self.gxt_file_path, backup_gxt_path)
+            if changed is not None:
+                layout.save(blocks, tables, final_gxt_path)
             else:
-                base_name = os.path.splitext(os.path.basename(self.gxt_txt_path or ""))[0]
-                final_gxt_path = os.path.join(gxt_dir, f"{base_name}.gxt")
-            generator.save_as_gxt(final_gxt_path)
-            generated_gxt_path = final_gxt_path
-        elif version == "IV":
-            from builder.IVGXT import generate_gxt
-            try:
-                # 直接生成最终GXT文件
-                if self.gxt_file_path:
-                    base_name = os.path.splitext(os.path.basename(self.gxt_file_path))[0]
-                    final_gxt_path = os.path.join(gxt_dir, f"{base_name}.gxt")
-                else:
-                    base_name = os.path.splitext(os.path.basename(self.gxt_txt_path or ""))[0]
-                    final_gxt_path = os.path.join(gxt_dir, f"{base_name}.gxt")
-                generate_gxt(output_txt_path, final_gxt_path)
-                generated_gxt_path = final_gxt_path
-            except Exception as e:
-                self.version_icon_label.setVisible(False)
-                QMessageBox.critical(self, self.tr("error_messages"), self.tr("error_running_builder", error=str(e)))
-                return
-        else:
+                with open(final_gxt_path, 'wb') as f:
+                    f.write(gxt_data)
+        except Exception as e:
             self.version_icon_label.setVisible(False)
-            QMessageBox.critical(self, self.tr("error_messages"), self.tr("error_unknown_gxt_version"))
+            QMessageBox.critical(self, self.tr("error_messages"), self.tr("error_running_builder", error=str(e)))
             return
 
         # 保存到txt或gxt同目录
         if self.gxt_file_path:
-            base_name = os.path.splitext(os.path.basename(self.gxt_file_path))[0]
-            # 备份原始GXT文件
-            backup_gxt_path = os.path.join(gxt_dir, f"{base_name}_backup.gxt")
-            shutil.copy(self.gxt_file_path, backup_gxt_path)
             # 替换原始GXT文件（如果生成的文件和目标文件不是同一个文件）
             try:
-                if not os.path.samefile(generated_gxt_path, self.gxt_file_path):
-                    shutil.copy(generated_gxt_path, self.gxt_file_path)
+                if not os.path.samefile(final_gxt_path, self.gxt_file_path):
+                    shutil.copy(final_gxt_path, self.gxt_file_path)
             except FileNotFoundError:
                 # 如果文件不存在，则直接复制
-                shutil.copy(generated_gxt_path, self.gxt_file_path)
+                shutil.copy(final_gxt_path, self.gxt_file_path)
+            if changed is None or layout.path != final_gxt_path:
+                # 完整重建后按新文件重新记录布局，下次保存即可增量进行
+                self.gxt_layout = None
+                if version != "III":
+                    try:
+                        with gta.gxt.GXTIndex.open(self.gxt_file_path) as index:
+                            self.capture_gxt_layout(self.gxt_file_path, version, index.spans, tables.items)
+                        if self.gxt_layout is not None:
+                            # 保存时表格已展开为 tables，直接算出指纹，不再持有 tables
+                            self.gxt_layout.fingerprints
+                    except Exception:
+                        pass
             QMessageBox.information(self, self.tr("prompt_messages"), self.tr("info_file_saved", path=self.gxt_file_path, backup_path=backup_gxt_path))
         else:
-            base_name = os.path.splitext(os.path.basename(self.gxt_txt_path or ""))[0]
-            # 生成同名GXT文件并备份原始文件（如果存在）
-            new_gxt_path = os.path.join(gxt_dir, f"{base_name}.gxt")
-            # 注意：这里不需要复制，因为文件已经直接生成在目标位置
-            QMessageBox.information(self, self.tr("prompt_messages"), self.tr("info_gxt_saved", path=new_gxt_path))
+            # 同名GXT文件已直接生成在目标位置
+            QMessageBox.information(self, self.tr("prompt_messages"), self.tr("info_gxt_saved", path=final_gxt_path))
 
     def add_row_buttons(self, row):
         widget = QWidget()
@@ -1398,7 +1339,7 @@ class GXTViewer(QWidget):
         if sender is not None:
             pw = sender.parent()
             if isinstance(pw, QWidget):  # 确保是 QWidget 实例
-                row_position = self.output_table.indexAt(pw.pos()).row()
+                row_position = self.output_table.sourceRowAt(pw.pos())
                 self.safe_add_row(row_position)
 
     def handle_delete_button_clicked(self):
@@ -1406,24 +1347,27 @@ class GXTViewer(QWidget):
         if sender is not None:
             pw = sender.parent()
             if isinstance(pw, QWidget):  # 确保是 QWidget 实例
-                row_position = self.output_table.indexAt(pw.pos()).row()
+                row_position = self.output_table.sourceRowAt(pw.pos())
                 self.safe_delete_row(row_position)
 
+    @property
+    def parsed_content(self):
+        """表格内容的 "[表名]" / "键=值" 文本（按需由模型生成，不再常驻一份整份文本）"""
+        return self.output_table.gxtModel().toText()
+
     def highlight_selected_section(self, section_name):
-        # Find the section content
-        lines = self.parsed_content.strip().split('\n')
-        section_found = False
+        # 从表格模型中取出该表（表名行到下一个表名行之前）的内容
+        model = self.output_table.gxtModel()
+        sections = model.sectionRows()
+        section_rows = [row for _, row in sections]
         content = []
-        for line in lines:
-            if line.startswith('['):
-                if line.startswith(f"[{section_name}]"):
-                    section_found = True
-                elif section_found:
-                    break
-                else:
-                    continue
-            if section_found:
-                content.append(line)
+        for name, row in sections:
+            if name == section_name:
+                later = [r for r in section_rows if r > row]
+                end = later[0] if later else model.rowCount()
+                keys, values = model.keys()[row + 1:end], model.values()[row + 1:end]
+                content = [f"[{name}]"] + [f"{key}={value}" for key, value in zip(keys, values)]
+                break
         if content:
             content = '\n'.join(content)
             # 在文本框内显示内容
@@ -1530,97 +1474,33 @@ class GXTViewer(QWidget):
         self.schedule_search(self.search_entry.text())
 
     def filter_table(self, text):
-        """优化的表格过滤功能"""
+        """基于搜索索引的表格过滤，结果通过代理模型一次性应用"""
         # 如果搜索文本为空，显示所有行
         if not text:
-            for row in range(self.output_table.rowCount()):
-                self.output_table.setRowHidden(row, False)
+            self.output_table.setRowFilter(None)
             return
 
-        # 正则表达式模式
+        model = self.output_table.gxtModel()
         if self.regex_mode:
+            # 正则表达式无法使用索引，逐行匹配；表达式无效时隐藏所有行
             try:
                 pattern = re.compile(text, re.IGNORECASE)
-                regex_valid = True
             except re.error:
-                regex_valid = False
-        
-        # 检查缓存 - 为正则表达式模式和普通模式分别缓存
-        cache_key = (text, self.regex_mode)
-        if cache_key in self.search_cache:
-            # 使用缓存的结果
-            cached_result = self.search_cache[cache_key]
-            for row, hidden in cached_result.items():
-                self.output_table.setRowHidden(row, hidden)
-            return
-
-        # 构建表格数据缓存（如果尚未构建）
-        if not self.table_data_cache or len(self.table_data_cache) != self.output_table.rowCount():
-            self.table_data_cache = []
-            for row in range(self.output_table.rowCount()):
-                key_item = self.output_table.item(row, 0)
-                value_item = self.output_table.item(row, 1)
-                key_text = key_item.text() if key_item else ""
-                value_text = value_item.text() if value_item else ""
-                self.table_data_cache.append((key_text, value_text))
-
-        # 执行搜索并逐个显示结果
-        result_cache = {}
-        
-        if self.regex_mode and regex_valid:
-            # 正则表达式搜索
-            for row, (key_text, value_text) in enumerate(self.table_data_cache):
-                try:
-                    match = (pattern.search(key_text) is not None or 
-                            pattern.search(value_text) is not None)
-                except re.error:
-                    match = False
-                hidden = not match
-                result_cache[row] = hidden
-                self.output_table.setRowHidden(row, hidden)
-                # 处理事件队列，使界面更新更流畅
-                if row % 100 == 0:  # 每100行处理一次事件（提高性能）
-                    QApplication.processEvents()
-        elif self.regex_mode and not regex_valid:
-            # 正则表达式无效，隐藏所有行
-            for row in range(self.output_table.rowCount()):
-                result_cache[row] = True
-                self.output_table.setRowHidden(row, True)
-                # 处理事件队列，使界面更新更流畅
-                if row % 100 == 0:  # 每100行处理一次事件（提高性能）
-                    QApplication.processEvents()
+                rows = []
+            else:
+                rows = regexRows(pattern, model.keys(), model.values())
+        elif self.search_index is not None and len(self.search_index) == model.rowCount():
+            rows = self.search_index.search(text)
         else:
-            # 普通文本搜索
-            text_lower = text.lower()
-            for row, (key_text, value_text) in enumerate(self.table_data_cache):
-                key_text_lower = key_text.lower()
-                value_text_lower = value_text.lower()
-                match = text_lower in key_text_lower or text_lower in value_text_lower
-                hidden = not match
-                result_cache[row] = hidden
-                self.output_table.setRowHidden(row, hidden)
-                # 处理事件队列，使界面更新更流畅
-                if row % 100 == 0:  # 每100行处理一次事件（提高性能）
-                    QApplication.processEvents()
-
-        # 更新缓存（限制缓存大小）
-        if len(self.search_cache) > 50:  # 限制缓存大小为50个搜索词
-            self.search_cache.clear()
-        self.search_cache[cache_key] = result_cache
+            # 索引尚在后台构建，退回线性扫描
+            rows = scanRows(text, model.keys(), model.values())
+
+        self.output_table.setRowFilter(rows)
 
     def safe_add_row(self, row):
         """安全地在指定行后插入一行（用于表格按钮）"""
+        # 新行键值为空，字体与行高由模型和视图统一提供
         self.output_table.insertRow(row + 1)
-        for col in range(self.output_table.columnCount()):
-            item = QTableWidgetItem("")
-            item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsSelectable)
-            if col == 1:  # Value列使用自定义字体
-                item.setFont(self.value_column_font)
-            # 初始化新插入行的历史记录
-            self.table_item_history.set_last_text(item, "")
-            self.output_table.setItem(row + 1, col, item)
-        # 明确设置新插入行的行高为32像素
-        self.output_table.setRowHeight(row + 1, 32)
         # 插入行后强制更新表名定位
         self.sync_sections_to_sidebar()
 
@@ -1631,13 +1511,14 @@ class GXTViewer(QWidget):
             # 删除行后强制更新表名定位
             self.sync_sections_to_sidebar()
 
-    def display_gxt_content_in_table(self, content: str):
+    def display_gxt_content_in_table(self, content):
         """
-        将GXT或TXT内容字符串渲染到表格中。
-        支持section和key=value格式，自动分配到表格行。
+        将内容渲染到表格中。content 可以是：
+          - "[表名]" / "键=值" 格式的 GXT 或 TXT 文本
+          - gta.gxt.GXTColumns 列式数据（打开 GXT 时由读取器直接产出）
+          - (键列表, 值列表)
         """
         # 极致性能优化+按钮显示修复+选中可读性
-        self.parsed_content = content
         self.output_table.setUpdatesEnabled(False)
         self.output_table.blockSignals(True)
         self.output_table.clearContents()
@@ -1646,11 +1527,7 @@ class GXTViewer(QWidget):
         self.output_table.setVisible(True)
         self.placeholder_label.setVisible(False)
 
-        # 清空搜索缓存，因为表格内容已更改
-        self.search_cache.clear()
-        self.table_data_cache = []
-
-        # 清空搜索缓存，当表格内容更改时同时清除正则模式下的缓存
+        # 表格内容更改时重置正则模式
         self.regex_mode = False
         self.regex_button.setChecked(False)
         self.regex_button.setStyleSheet("""
@@ -1675,67 +1552,22 @@ class GXTViewer(QWidget):
         # 确保按钮尺寸始终保持32x32
         self.regex_button.setFixedSize(32, 32)
 
-        # 预处理所有行，避免多次split和判断
-        lines = content.split('\n')
-        valid_lines = []
+        # 交给模型按需渲染（不创建逐单元格对象）；文本一次性拆分为并行的键/值列表
+        model = self.output_table.gxtModel()
+        model.setValueFont(self.value_column_font)
+        if isinstance(content, gta.gxt.GXTColumns):
+            model.setColumns(content)
+        elif isinstance(content, str):
+            model.setRows(*parseTableContent(content))
+        else:
+            model.setRows(*content)
+        self.start_search_index_build()
+
         section_names = []
         row_section_map = {}
-        table_row = 0
-        font_normal = QFont()
-        font_bold = QFont()
-        font_bold.setBold(True)
-
-        append_valid = valid_lines.append
-        append_section = section_names.append
-
-        # 一次性遍历并分类
-        for idx, line in enumerate(lines):
-            if not line:
-                continue
-            if line.startswith('[') and line.endswith(']'):
-                append_valid(('section', line))
-            elif '=' in line:
-                append_valid(('kv', line))
-
-        row_count = len(valid_lines)
-        self.output_table.setRowCount(row_count)
-
-
-        # 用 setItem 代替 __setitem__，避免类型错误
-        for idx, (typ, line) in enumerate(valid_lines):
-            if typ == 'section':
-                section = line[1:-1]
-                append_section(section)
-                row_section_map[section] = idx
-                item = QTableWidgetItem(line)
-                # 解除表名编辑限制，允许用户编辑表名
-                item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsEditable)
-                item.setFont(font_bold)
-                # 初始化表名监测的文本记录
-                self.table_item_history.set_last_text(item, line)
-                self.output_table.setItem(idx, 0, item)
-                self.output_table.setItem(idx, 1, QTableWidgetItem(""))
-            elif typ == 'kv':
-                eq = line.find('=')
-                key = line[:eq].strip()
-                value = line[eq+1:].strip()
-                key_item = QTableWidgetItem(key)
-                value_item = QTableWidgetItem(value)
-                key_item.setFont(font_normal)
-                value_item.setFont(self.value_column_font)  # 使用自定义字体
-                # 初始化文本记录用于修改监测
-                self.table_item_history.set_last_text(key_item, key)
-                self.table_item_history.set_last_text(value_item, value)
-                self.output_table.setItem(idx, 0, key_item)
-                self.output_table.setItem(idx, 1, value_item)
-            # 明确设置每行的行高为32像素
-            self.output_table.setRowHeight(idx, 32)
-
-        self.output_table.setRowCount(row_count)
-
-        # 设置行号
-        for i in range(row_count):
-            self.output_table.setVerticalHeaderItem(i, QTableWidgetItem(str(i + 1)))
+        for section, row in model.sectionRows():
+            section_names.append(section)
+            row_section_map[section] = row
 
         # 创建侧边栏按钮
         self.create_sidebar_buttons(section_names, row_section_map)
@@ -1746,10 +1578,7 @@ class GXTViewer(QWidget):
         if viewport is not None:
             viewport.update()
 
-        # --- 优化：鼠标悬停显示按钮 ---
-        for r in range(self.output_table.rowCount()):
-            self.output_table.removeCellWidget(r, 2)
-
+        # --- 优化：鼠标悬停显示按钮（模型重置时旧的单元格控件已随之释放） ---
         def get_btn_widget(row):
             widget = QWidget()
             widget.setStyleSheet("QWidget#btn_container { background: transparent; }")  # 只对容器设置透明背景
@@ -1865,9 +1694,8 @@ class GXTViewer(QWidget):
 
             def eventFilter(self, obj, event):
                 if event.type() == QtCore.QEvent.Type.MouseMove:
-                    pos = event.pos()
-                    index = self.table.indexAt(pos)
-                    row = index.row()
+                    # 过滤状态下视图行与源行不同，统一使用源行号
+                    row = self.table.sourceRowAt(event.pos())
                     if row != self.last_row:
                         if 0 <= self.last_row < self.table.rowCount():
                             self.table.removeCellWidget(self.last_row, 2)
@@ -1902,9 +1730,6 @@ class GXTViewer(QWidget):
             self.output_table.removeEventFilter(self._table_item_edit_filter)
         self._table_item_edit_filter = TableItemEditEventFilter(self.output_table, self)
         self.output_table.installEventFilter(self._table_item_edit_filter)
-        
-        # 连接表格项修改信号
-        self.output_table.itemChanged.connect(self.on_table_item_changed)
         # --- 结束 ---
 
         # 移除对section_combobox的引用，因为我们现在使用侧边栏导航
@@ -1963,11 +1788,7 @@ class GXTViewer(QWidget):
     def smart_translate_table(self):
         """智能翻译当前表格内容，带进度反馈，完全异步，主线程不阻塞"""
         # 计算实际可翻译行数（排除章节标记行）
-        translatable_rows = 0
-        for row in range(self.output_table.rowCount()):
-            key_item = self.output_table.item(row, 0)
-            if key_item and not (key_item.text().startswith('[') and key_item.text().endswith(']')):
-                translatable_rows += 1
+        translatable_rows = sum(1 for key in self.output_table.gxtModel().keys() if not isSectionKey(key))
 
         if translatable_rows == 0:
             QMessageBox.information(self, self.tr("info_title"), self.tr("info_no_translatable_content"))
@@ -1995,7 +1816,6 @@ class GXTViewer(QWidget):
             # 仅当终端输出显示完成时才更新进度
             if dlg.progress.value() == translatable_rows:
                 dlg.set_progress(translatable_rows, self.tr("translate_complete"))
-                self.update_parsed_content_from_table()
                 QtCore.QTimer.singleShot(800, dlg.accept)
             else:
                 # 如果进度未完成，等待终端输出更新
@@ -2021,81 +1841,52 @@ class GXTViewer(QWidget):
 
         worker.start()
 
-    def update_parsed_content_from_table(self):
-        """从表格内容更新 parsed_content 变量"""
-        content_lines = []
-        current_section = ""
-        
-        for row in range(self.output_table.rowCount()):
-            key_item = self.output_table.item(row, 0)
-            value_item = self.output_table.item(row, 1)
-            
-            if key_item and value_item:
-                key = key_item.text()
-                value = value_item.text()
-                
-                if key.startswith('[') and key.endswith(']'):
-                    current_section = key
-                    content_lines.append(key)
-                else:
-                    content_lines.append(f"{key}={value}")
-        
-        self.parsed_content = "\n".join(content_lines)
+    def on_table_cell_edited(self, row, column, old_text, key_text):
+        """处理表格单元格修改事件，更新搜索索引并监测表名修改"""
+        model = self.output_table.gxtModel()
+        if self.search_index is not None:
+            self.search_index.updateRow(row, model.keys()[row], model.values()[row])
+        else:
+            self._search_index_pending_rows.add(row)
 
-    def on_table_item_changed(self, item):
-        """处理表格项修改事件，监测表名修改"""
-        if item.column() == 0:  # 只监测Key列的修改
-            row = item.row()
-            key_item = self.output_table.item(row, 0)
-            
-            if key_item:
-                key_text = key_item.text()
-                
-                # 获取修改前的文本
-                old_text = self.table_item_history.get_last_text(item)
-                
-                # 检查表名修改的各种情况
-                is_section_now = key_text.startswith('[') and key_text.endswith(']')
-                was_section_before = old_text.startswith('[') and old_text.endswith(']')
-                
-                # 情况1：从普通文本变成表名（新增表）
-                if not was_section_before and is_section_now:
-                    section_name = key_text[1:-1]
-                    if self.validate_section_name(section_name):
-                        # 设置表名粗体字体
-                        font_bold = QFont()
-                        font_bold.setBold(True)
-                        key_item.setFont(font_bold)
-                        # 识别为新表，同步到侧边栏
-                        self.sync_sections_to_sidebar()
-                        self.status_message_label.setText(f"新增表: {section_name}")
+        if column != 0:  # 只监测Key列的修改
+            return
+
+        # 检查表名修改的各种情况
+        is_section_now = isSectionKey(key_text)
+        was_section_before = isSectionKey(old_text)
+
+        # 情况1：从普通文本变成表名（新增表），粗体由模型根据键文本自动应用
+        if not was_section_before and is_section_now:
+            section_name = key_text[1:-1]
+            if self.validate_section_name(section_name):
+                # 识别为新表，同步到侧边栏
+                self.sync_sections_to_sidebar()
+                self.status_message_label.setText(f"新增表: {section_name}")
+                QtCore.QTimer.singleShot(2000, lambda: self.status_message_label.setText(""))
+
+        # 情况2：从表名变成普通文本（删除表）
+        elif was_section_before and not is_section_now:
+            old_section_name = old_text[1:-1]
+            self.sync_sections_to_sidebar()
+            self.status_message_label.setText(f"移除表: {old_section_name}")
+            QtCore.QTimer.singleShot(2000, lambda: self.status_message_label.setText(""))
+
+        # 情况3：表名被修改（重命名表）
+        elif was_section_before and is_section_now:
+            old_section_name = old_text[1:-1]
+            new_section_name = key_text[1:-1]
+            if old_section_name != new_section_name:
+                if self.validate_section_name(new_section_name):
+                    # 处理表名重命名
+                    if self.handle_section_rename(old_section_name, new_section_name):
+                        self.status_message_label.setText(f"表名修改: {old_section_name} → {new_section_name}")
                         QtCore.QTimer.singleShot(2000, lambda: self.status_message_label.setText(""))
-                
-                # 情况2：从表名变成普通文本（删除表）
-                elif was_section_before and not is_section_now:
-                    old_section_name = old_text[1:-1]
-                    self.sync_sections_to_sidebar()
-                    self.status_message_label.setText(f"移除表: {old_section_name}")
+                else:
+                    # 表名无效，恢复原表名
+                    self.output_table.item(row, 0).setText(old_text)
+                    self.status_message_label.setText("表名包含非法字符，已恢复")
                     QtCore.QTimer.singleShot(2000, lambda: self.status_message_label.setText(""))
-                
-                # 情况3：表名被修改（重命名表）
-                elif was_section_before and is_section_now:
-                    old_section_name = old_text[1:-1]
-                    new_section_name = key_text[1:-1]
-                    if old_section_name != new_section_name:
-                        if self.validate_section_name(new_section_name):
-                            # 处理表名重命名
-                            if self.handle_section_rename(old_section_name, new_section_name):
-                                self.status_message_label.setText(f"表名修改: {old_section_name} → {new_section_name}")
-                                QtCore.QTimer.singleShot(2000, lambda: self.status_message_label.setText(""))
-                        else:
-                            # 表名无效，恢复原表名
-                            key_item.setText(old_text)
-                            self.status_message_label.setText("表名包含非法字符，已恢复")
-                            QtCore.QTimer.singleShot(2000, lambda: self.status_message_label.setText(""))
-                
-                # 保存当前文本作为下次比较的基准
-                self.table_item_history.set_last_text(item, key_text)
 
     def sync_sections_to_sidebar(self):
         """同步表格中的表名到侧边栏"""
@@ -2103,15 +1894,9 @@ class GXTViewer(QWidget):
         section_names = []
         row_section_map = {}
         
-        for row in range(self.output_table.rowCount()):
-            key_item = self.output_table.item(row, 0)
-            if key_item:
-                key_text = key_item.text()
-                # 检查是否是表名（以[]包围的文本）
-                if key_text.startswith('[') and key_text.endswith(']'):
-                    section_name = key_text[1:-1]  # 去掉方括号
-                    section_names.append(section_name)
-                    row_section_map[section_name] = row
+        for section_name, row in self.output_table.gxtModel().sectionRows():
+            section_names.append(section_name)
+            row_section_map[section_name] = row
         
         # 检查是否有新的表名出现
         current_sections = set(section_names)
@@ -2125,9 +1910,6 @@ class GXTViewer(QWidget):
         if current_sections != old_sections:
             self.create_sidebar_buttons(section_names, row_section_map)
             
-            # 更新解析内容以反映新的表名结构
-            self.update_parsed_content_from_table()
-            
             # 显示状态消息，区分修改和新增
             if new_sections:
                 self.status_message_label.setText(f"新增 {len(new_sections)} 个表，共 {len(section_names)} 个表")
@@ -2165,16 +1947,10 @@ class GXTViewer(QWidget):
         section_names = []
         row_section_map = {}
         
-        for row in range(self.output_table.rowCount()):
-            key_item = self.output_table.item(row, 0)
-            if key_item:
-                key_text = key_item.text()
-                # 检查是否是表名（以[]包围的文本）
-                if key_text.startswith('[') and key_text.endswith(']'):
-                    section_name = key_text[1:-1]  # 去掉方括号
-                    if self.validate_section_name(section_name):
-                        section_names.append(section_name)
-                        row_section_map[section_name] = row
+        for section_name, row in self.output_table.gxtModel().sectionRows():
+            if self.validate_section_name(section_name):
+                section_names.append(section_name)
+                row_section_map[section_name] = row
         
         # 检查是否有新的表名出现
         current_sections = set(section_names)
@@ -2209,24 +1985,11 @@ class GXTViewer(QWidget):
                 self.section_buttons[i] = (button, new_name)
                 break
         
-        # 更新解析内容
-        self.update_parsed_content_from_table()
-        
         return True
 
     def get_current_row_section_map(self):
         """获取当前表格的行与表名的映射关系"""
-        row_section_map = {}
-        
-        for row in range(self.output_table.rowCount()):
-            key_item = self.output_table.item(row, 0)
-            if key_item:
-                key_text = key_item.text()
-                if key_text.startswith('[') and key_text.endswith(']'):
-                    section_name = key_text[1:-1]
-                    row_section_map[section_name] = row
-        
-        return row_section_map
+        return dict(self.output_table.gxtModel().sectionRows())
 
     def show_background_settings(self):
         """显示背景设置对话框"""
@@ -2628,11 +2391,8 @@ class GXTViewer(QWidget):
             QtGui.QFont.StyleStrategy.PreferQuality
         )
             
-        # 遍历表格的所有行，更新Value列（第1列）的字体
-        for row in range(self.output_table.rowCount()):
-            value_item = self.output_table.item(row, 1)  # Value列是第1列
-            if value_item:
-                value_item.setFont(self.value_column_font)
+        # Value列（第1列）字体由模型统一提供，刷新该列即可
+        self.output_table.gxtModel().setValueFont(self.value_column_font)
 
     def save_font_settings(self):
         """保存字体设置到配置文件"""
@@ -2792,6 +2552,35 @@ class GXTViewer(QWidget):
         """覆盖关闭事件，确保程序完全退出"""
         QApplication.quit()
 
+class TxtExportWorker(QThread):
+    """后台写出 GXT 解析结果的 TXT 文件"""
+    exported = pyqtSignal(str)
+    error = pyqtSignal(str)
+
+    def __init__(self, document, out_root, gxt_name):
+        super().__init__()
+        self.document = document
+        self.out_root = out_root
+        self.gxt_name = gxt_name
+
+    def run(self):
+        try:
+            self.exported.emit(self.document.writeText(self.out_root, self.gxt_name))
+        except Exception as e:
+            self.error.emit(str(e))
+
+class SearchIndexWorker(QThread):
+    """后台构建表格搜索索引"""
+    built = pyqtSignal(object)
+
+    def __init__(self, keys, values):
+        super().__init__()
+        self.keys = keys
+        self.values = values
+
+    def run(self):
+        self.built.emit(TrigramIndex(self.keys, self.values))
+
 class TranslationWorker(QThread):
     progress = pyqtSignal(int, int, str)
     finished = pyqtSignal()
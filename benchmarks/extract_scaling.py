@@ -0,0 +1,90 @@
+"""
+单文件 TXT 提取（gta.extract.extractGXT，不使用缓存）随表解码并行度的扩展性基准
+
+生成一个多表的合成 GXT（默认 SA、160 个表），分别以下列方式提取并计时：
+  - 串行：逐表解码
+  - 线程：-t N，每个文件临时使用线程池
+  - 进程：-t N -P，所有轮次共用一个事先启动的进程池（启动耗时单独列出，不计入提取耗时）
+各方式输出的集成文本须与串行结果逐字节相同。
+表解码主要是持有 GIL 的 Python 代码，线程数增加时基本不提速；进程池的加速比应随核心数增长，
+需在多核机器上运行才能看出差别。
+
+用法（在仓库根目录执行）：
+    python -m benchmarks.extract_scaling [--version SA] [--entries 400000] [--tables 160]
+                                         [--workers 1 2 4 8] [--repeat 3]
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.roundtrip import SAMPLE_TEXTS, buildTables, makeTables
+from gta.extract import extractGXT
+
+
+def timeExtract(path, out_dir, repeat, workers=None, pool=None):
+    """重复提取 repeat 次，返回 (最短耗时, 集成文本内容)"""
+    best = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        extractGXT(path, out_dir, workers, None, pool)
+        elapsed = time.perf_counter() - start_time
+        best = elapsed if best is None else min(best, elapsed)
+    with open(os.path.join(out_dir, os.path.splitext(os.path.basename(path))[0] + '.txt'), 'rb') as f:
+        return best, f.read()
+
+
+def defaultWorkers():
+    cpus = os.cpu_count() or 1
+    workers = [1]
+    while workers[-1] * 2 <= cpus:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != cpus:
+        workers.append(cpus)
+    return workers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="单文件提取随表解码并行度的扩展性基准")
+    parser.add_argument('--version', default='SA', choices=['VC', 'SA', 'IV'])
+    parser.add_argument('--entries', type=int, default=400000, help="条目数")
+    parser.add_argument('--tables', type=int, default=160, help="表数")
+    parser.add_argument('--text', default='cp1252', choices=sorted(SAMPLE_TEXTS), help="文本类型")
+    parser.add_argument('--workers', type=int, nargs='+', default=None, help="并行度列表（默认 1、2、4… 直到 CPU 核心数）")
+    parser.add_argument('--repeat', type=int, default=3, help="每种方式重复次数（取最短耗时）")
+    args = parser.parse_args(argv)
+
+    encoding = 'cp1252' if args.version == 'SA' and args.text == 'cp1252' else 'utf-8'
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, f'{args.version}.gxt')
+        with open(path, 'wb') as f:
+            f.write(buildTables(args.version, makeTables(args.version, args.entries, args.text, args.tables), encoding))
+        out_dir = os.path.join(tmp_dir, 'out')
+        print(f"{args.version}，{args.tables} 表，{args.entries} 条，{os.path.getsize(path) / 1048576:.2f} MB，"
+              f"CPU 核心数 {os.cpu_count()}")
+
+        serial, expected = timeExtract(path, out_dir, args.repeat)
+        print(f"{'方式':>4} {'并行度':>6} {'耗时(s)':>9} {'加速比':>7} {'进程池启动(s)':>13}")
+        print(f"{'串行':>4} {1:>8} {serial:>11.3f} {1.0:>10.2f}")
+        for workers in args.workers or defaultWorkers():
+            if workers <= 1:
+                continue
+            elapsed, output = timeExtract(path, out_dir, args.repeat, workers)
+            if output != expected:
+                raise SystemExit(f"线程 {workers}：输出与串行结果不一致")
+            print(f"{'线程':>4} {workers:>8} {elapsed:>11.3f} {serial / elapsed:>10.2f}")
+
+            start_time = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # 预先启动全部工作进程
+                list(pool.map(abs, range(workers)))
+                startup = time.perf_counter() - start_time
+                elapsed, output = timeExtract(path, out_dir, args.repeat, workers, pool)
+            if output != expected:
+                raise SystemExit(f"进程 {workers}：输出与串行结果不一致")
+            print(f"{'进程':>4} {workers:>8} {elapsed:>11.3f} {serial / elapsed:>10.2f} {startup:>16.3f}")
+
+
+if __name__ == '__main__':
+    main()
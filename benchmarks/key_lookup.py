@@ -0,0 +1,76 @@
+"""
+按键名查找（gta.gxt.LazyDocument.getMany）与完整解析后逐表扫描的耗时对比
+
+对每个版本生成合成 GXT，随机抽取若干键名（含一部分不存在的键名），分别测量：
+  - 扫描：loadDocument 完整解析后，按 TABL 顺序在各表的 (键, 值) 列表中逐条比较
+  - 索引：LazyDocument 打开文件，按排序索引二分查找并只解码命中的文本
+两种方式的结果须完全一致。
+
+用法（在仓库根目录执行）：
+    python -m benchmarks.key_lookup [--entries 200000] [--lookups 100000] [--scan-lookups 200]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import gta.gxt
+from benchmarks.roundtrip import buildTables, makeTables
+
+
+def scanLookup(path, keys):
+    """完整解析后逐表线性扫描（无查找接口时的做法）"""
+    document = gta.gxt.loadDocument(path)
+    values = []
+    for key in keys:
+        value = None
+        for _, entries in document.tables:
+            value = next((v for k, v in entries if k == key), None)
+            if value is not None:
+                break
+        values.append(value)
+    return values
+
+
+def indexLookup(path, keys):
+    with gta.gxt.LazyDocument.open(path) as document:
+        return document.getMany(keys)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="按键名查找与逐表扫描的耗时对比")
+    parser.add_argument('--entries', type=int, default=200000, help="每个版本的条目数")
+    parser.add_argument('--lookups', type=int, default=100000, help="索引查找的键名数")
+    parser.add_argument('--scan-lookups', type=int, default=200, help="扫描方式查找的键名数（线性扫描很慢）")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    print(f"{'版本':>4} {'条目数':>8} {'扫描(每键 ms)':>14} {'索引(每键 us)':>14} {'索引(总 s)':>11}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for version in ('III', 'VC', 'SA', 'IV'):
+            tables = makeTables(version, args.entries, 'cjk')
+            path = os.path.join(tmp_dir, f'{version}.gxt')
+            with open(path, 'wb') as f:
+                f.write(buildTables(version, tables))
+            all_keys = [key for entries in tables.values() for key, _ in entries]
+            # 约 5% 为不存在的键名
+            keys = [rng.choice(all_keys) if rng.random() < 0.95 else f'X{i:06X}' for i in range(args.lookups)]
+
+            start_time = time.perf_counter()
+            values = indexLookup(path, keys)
+            index_elapsed = time.perf_counter() - start_time
+
+            scan_keys = keys[:args.scan_lookups]
+            start_time = time.perf_counter()
+            expected = scanLookup(path, scan_keys)
+            scan_elapsed = time.perf_counter() - start_time
+            if values[:len(scan_keys)] != expected:
+                raise SystemExit(f"{version}: 索引查找与扫描结果不一致")
+
+            print(f"{version:>4} {args.entries:>8} {scan_elapsed / len(scan_keys) * 1e3:>14.3f} "
+                  f"{index_elapsed / len(keys) * 1e6:>14.2f} {index_elapsed:>11.3f}")
+
+
+if __name__ == '__main__':
+    main()
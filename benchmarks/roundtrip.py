@@ -0,0 +1,214 @@
+"""
+读取器（gta.gxt）与构建器（builder/）的往返一致性检查与吞吐基准
+
+对 III/VC/SA/IV 各版本、不同条目数（默认 1k/10k/100k/1M）与文本类型（中日韩文字 / cp1252 西文）：
+  1. 生成合成的表数据，交给对应构建器生成 GXT（计时：构建）
+  2. 用 gta.gxt 解析生成的文件（计时：解析），结果须与原始数据完全一致
+  3. 将解析结果再次交给构建器，生成的文件须与第 1 步逐字节相同，再次解析的结果也须一致
+结果写出为 JSON，可用 --baseline 与之前的结果对比吞吐变化。
+
+用法（在仓库根目录执行）：
+    python -m benchmarks.roundtrip [--sizes 1000 10000 100000 1000000] [--versions III VC SA IV]
+                                   [--output roundtrip.json] [--baseline 旧结果.json]
+"""
+import argparse
+import importlib.machinery
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import gta.gxt
+from builder.IVGXT import build_gxt as buildIVGXT, load_tables as loadIVTables
+from builder.LCGXT import LCGXT
+from builder.SAGXT import SAGXT
+
+VCGXT = importlib.machinery.SourceFileLoader(
+    'VCGXT', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'builder', 'VCGXT.PY')
+).load_module().VCGXT
+
+SAMPLE_TEXTS = {
+    'cjk': [
+        "任务完成！ ~1~ 尊重 +",
+        "Hello ~r~世界~w~",
+        "日本語のテキスト、한국어 텍스트",
+        "混合 text 与 ASCII",
+    ],
+    'cp1252': [
+        "Mission réussie ! ~1~ respect +",
+        "Straße ~r~Größe~w~ – “quoted” €5",
+        "¡Señor! ¿Qué pasó? Ñandú",
+        "Plain ASCII text",
+    ],
+}
+
+
+def makeTables(version, entry_count, text_kind, table_count=50):
+    """生成 {表名: [(键, 值)]}；III 只有一个表名为 None 的表"""
+    samples = SAMPLE_TEXTS[text_kind]
+    if version == 'III':
+        names = [None]
+    else:
+        names = ['MAIN'] + [f'T{i:03d}' for i in range(1, max(1, min(table_count, entry_count)))]
+    per_table = -(-entry_count // len(names))
+    tables = {}
+    for table_index, name in enumerate(names):
+        first = table_index * per_table
+        indices = range(first, min(first + per_table, entry_count))
+        if version in ('III', 'VC'):
+            keys = [f'K{i:06X}' for i in indices]
+        else:
+            # 确定性的伪随机哈希，表内不重复
+            keys = [f'{(i * 2654435761) & 0xFFFFFFFF:08X}' for i in indices]
+        tables[name] = [(key, f"{samples[i % len(samples)]} {i}") for key, i in zip(keys, indices)]
+    return tables
+
+
+def buildTables(version, tables, encoding='utf-8'):
+    """用对应构建器由表数据生成 GXT 文件内容"""
+    if version == 'III':
+        generator = LCGXT()
+        if not generator.load_tables(tables):
+            raise ValueError("LCGXT.load_tables 失败")
+        return bytes(generator.build_gxt())
+    if version == 'VC':
+        generator = VCGXT()
+        if not generator.LoadTables(tables):
+            raise ValueError("VCGXT.LoadTables 失败")
+        return bytes(generator.BuildGXT())
+    if version == 'SA':
+        generator = SAGXT(encoding)
+        if not generator.load_tables(tables):
+            raise ValueError("SAGXT.load_tables 失败")
+        return bytes(generator.build_gxt())
+    return bytes(buildIVGXT(loadIVTables(tables)))
+
+
+def parseFile(path, version):
+    """解析 GXT，返回 ({表名: [(键, 值)]}, 检测到的编码)"""
+    document = gta.gxt.loadDocument(path)
+    if document.version != version:
+        raise ValueError(f"版本识别为 {document.version}，应为 {version}")
+    return {name: entries for name, entries in document.tables}, document.encoding
+
+
+def firstMismatch(expected, actual):
+    """返回第一处不一致的描述，一致时返回 None"""
+    if set(expected) != set(actual):
+        return f"表不一致: {sorted(map(str, set(expected) ^ set(actual)))[:5]}"
+    for name, entries in expected.items():
+        parsed = actual[name]
+        if len(parsed) != len(entries):
+            return f"表 {name} 条目数 {len(parsed)}，应为 {len(entries)}"
+        for index, (entry, parsed_entry) in enumerate(zip(entries, parsed)):
+            if entry != parsed_entry:
+                return f"表 {name} 第 {index} 条: {parsed_entry!r}，应为 {entry!r}"
+    return None
+
+
+def firstDiff(a, b):
+    """两段字节第一处不同的偏移"""
+    n = min(len(a), len(b))
+    diff = np.flatnonzero(np.frombuffer(a, np.uint8, n) != np.frombuffer(b, np.uint8, n))
+    return int(diff[0]) if len(diff) else n
+
+
+def runCase(version, entry_count, text_kind, tmp_dir):
+    encoding = 'cp1252' if version == 'SA' and text_kind == 'cp1252' else 'utf-8'
+    tables = makeTables(version, entry_count, text_kind)
+    path = os.path.join(tmp_dir, f'{version}.gxt')
+    result = {'version': version, 'entries': entry_count, 'text': text_kind, 'ok': False}
+
+    try:
+        start_time = time.perf_counter()
+        data = buildTables(version, tables, encoding)
+        with open(path, 'wb') as f:
+            f.write(data)
+        result['build_s'] = time.perf_counter() - start_time
+        result['size'] = len(data)
+
+        start_time = time.perf_counter()
+        parsed, detected = parseFile(path, version)
+        result['parse_s'] = time.perf_counter() - start_time
+
+        mismatch = firstMismatch(tables, parsed)
+        if mismatch is None:
+            # 解析结果再次构建，须与第一次构建逐字节相同
+            rebuilt = buildTables(version, parsed, detected or encoding)
+            if rebuilt != data:
+                mismatch = f"重新构建的文件在偏移 {firstDiff(data, rebuilt)} 处不同"
+            else:
+                with open(path, 'wb') as f:
+                    f.write(rebuilt)
+                mismatch = firstMismatch(tables, parseFile(path, version)[0])
+        if mismatch is not None:
+            result['error'] = mismatch
+        else:
+            result['ok'] = True
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+
+    size_mb = result.get('size', 0) / 1048576
+    if result.get('build_s'):
+        result['build_mb_s'] = size_mb / result['build_s']
+        result['build_entries_s'] = entry_count / result['build_s']
+    if result.get('parse_s'):
+        result['parse_mb_s'] = size_mb / result['parse_s']
+        result['parse_entries_s'] = entry_count / result['parse_s']
+    return result
+
+
+def caseKey(result):
+    return result['version'], result['entries'], result['text']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GXT 读取器/构建器往返一致性与吞吐基准")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000], help="条目数")
+    parser.add_argument('--versions', nargs='+', default=['III', 'VC', 'SA', 'IV'], choices=['III', 'VC', 'SA', 'IV'])
+    parser.add_argument('--texts', nargs='+', default=['cjk', 'cp1252'], choices=sorted(SAMPLE_TEXTS))
+    parser.add_argument('--output', default='roundtrip.json', help="结果 JSON 文件")
+    parser.add_argument('--baseline', help="用于对比的旧结果 JSON 文件")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = {caseKey(result): result for result in json.load(f)['results']}
+
+    results = []
+    print(f"{'版本':>4} {'条目数':>8} {'文本':>7} {'文件(MB)':>9} {'构建MB/s':>9} {'解析MB/s':>9} {'对比基线':>15} 结果")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for version in args.versions:
+            for size in args.sizes:
+                for text_kind in args.texts:
+                    result = runCase(version, size, text_kind, tmp_dir)
+                    results.append(result)
+                    compare = ''
+                    old = baseline.get(caseKey(result))
+                    if old and old.get('build_s') and old.get('parse_s') and result.get('parse_s'):
+                        compare = f"{old['build_s'] / result['build_s']:.2f}x/{old['parse_s'] / result['parse_s']:.2f}x"
+                    print(f"{version:>4} {size:>8} {text_kind:>7} {result.get('size', 0) / 1048576:>9.2f} "
+                          f"{result.get('build_mb_s', 0):>9.1f} {result.get('parse_mb_s', 0):>9.1f} {compare:>15} "
+                          f"{'通过' if result['ok'] else '失败: ' + result.get('error', '')}")
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    failed = sum(not result['ok'] for result in results)
+    print(f"{len(results) - failed}/{len(results)} 项通过，结果已写入 {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+SA 构建器（builder/SAGXT.py）写出耗时基准
+
+按不同条目数生成合成文本（多个表、中英文混合），测量 save_as_gxt 的耗时，
+用于确认写出时间随条目数线性增长。
+
+用法（在仓库根目录执行）：
+    python -m benchmarks.sa_builder [--sizes 1000 10000 100000 1000000] [--tables 50]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from builder.SAGXT import SAGXT
+
+SAMPLE_TEXTS = [
+    "Hello ~r~world",
+    "中文文本测试",
+    "café ~n~ 第二行",
+    "Mission passed! ~1~ respect +",
+]
+
+
+def makeBuilder(entry_count, table_count, encoding='utf-8'):
+    """生成含 entry_count 条文本、table_count 个表的 SAGXT 实例（不经过 TXT 解析）"""
+    builder = SAGXT(encoding)
+    names = ['MAIN'] + [f'T{i:05d}'[:7] for i in range(1, table_count)]
+    per_table = max(1, entry_count // len(names))
+    remaining = entry_count
+    for table_index, name in enumerate(names):
+        count = remaining if table_index == len(names) - 1 else min(per_table, remaining)
+        entries = {}
+        for i in range(count):
+            # 确定性的伪随机哈希，避免重复
+            hash_key = ((table_index << 24) + i) * 2654435761 & 0xFFFFFFFF
+            entries[hash_key] = f"{SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]} {i}"
+        builder.m_GxtData[name] = entries
+        remaining -= count
+    return builder
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SA GXT 构建器写出耗时基准")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000], help="条目数")
+    parser.add_argument('--tables', type=int, default=50, help="表数量")
+    parser.add_argument('--repeat', type=int, default=3, help="每个规模重复次数，取最快一次")
+    args = parser.parse_args(argv)
+
+    print(f"{'条目数':>10} {'耗时(s)':>10} {'每条(µs)':>10} {'文件(MB)':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        out_path = os.path.join(tmp_dir, 'bench.gxt')
+        for size in args.sizes:
+            builder = makeBuilder(size, min(args.tables, size))
+            best = float('inf')
+            for _ in range(args.repeat):
+                start_time = time.perf_counter()
+                builder.save_as_gxt(out_path)
+                best = min(best, time.perf_counter() - start_time)
+            file_size = os.path.getsize(out_path)
+            print(f"{size:>10} {best:>10.3f} {best / size * 1e6:>10.2f} {file_size / 1048576:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
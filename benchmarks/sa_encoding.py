@@ -0,0 +1,85 @@
+"""
+SA 文本编码边界情况的解码一致性检查
+
+用 SA 构建器按 cp1252 原样写入指定的 TDAT 字节，再分别通过
+gta.gxt.loadDocument（整体列式解码）与 GXTIndex.loadTable（逐表解码）读取，
+两条路径的结果都须与期望文本一致。用例固定了 _decodeSAEntry 的回退规则：
+  - gbk_cjk：GBK 中日韩文字无法转为 cp1252，按 cp1252 逐字节解码
+  - gbk_latin：GBK 解码结果可用 cp1252 表示时走 GBK 分支
+  - cp1252：同时是合法 GBK 双字节的 cp1252 西文不被当作 GBK
+  - late_utf8：编码检测样本（SA.DETECT_SAMPLE_BYTES）之后的表混有 UTF-8 与 cp1252 文本，
+    检测结果为 cp1252 时该表仍须逐条解码
+
+用法（在仓库根目录执行）：
+    python -m benchmarks.sa_encoding
+"""
+import os
+import sys
+import tempfile
+
+import gta.gxt
+from benchmarks.roundtrip import buildTables
+
+# 用例名: ({表名: [(键, TDAT 原始字节)]}, {表名: [(键, 期望文本)]})
+CASES = {
+    'gbk_cjk': (
+        {'MAIN': [('00000001', '中文'.encode('gbk'))]},
+        {'MAIN': [('00000001', 'ÖÐÎÄ')]},
+    ),
+    'gbk_latin': (
+        {'MAIN': [('00000001', b'x\xa1\xa4y')]},
+        {'MAIN': [('00000001', 'x·y')]},
+    ),
+    'cp1252': (
+        {'MAIN': [('00000001', 'Mission réussie'.encode('cp1252'))]},
+        {'MAIN': [('00000001', 'Mission réussie')]},
+    ),
+    'late_utf8': (
+        {'MAIN': [(f'{i:08X}', f'Mission réussie {i} '.encode('cp1252') * 4) for i in range(1, 4001)],
+         'LATE': [('00000001', 'Ünïcödé'.encode('utf-8')), ('00000002', 'café'.encode('cp1252'))]},
+        {'LATE': [('00000001', 'Ünïcödé'), ('00000002', 'café')]},
+    ),
+}
+
+
+def buildRaw(tables):
+    """按 cp1252 写入，使 TDAT 中的字节与给定的原始字节相同"""
+    return buildTables('SA', {name: [(key, raw.decode('cp1252')) for key, raw in entries]
+                              for name, entries in tables.items()}, 'cp1252')
+
+
+def runCase(name, tables, expected, tmp_dir):
+    """返回第一处不一致的描述，一致时返回 None"""
+    path = os.path.join(tmp_dir, f'{name}.gxt')
+    with open(path, 'wb') as f:
+        f.write(buildRaw(tables))
+    document = gta.gxt.loadDocument(path)
+    with gta.gxt.GXTIndex.open(path) as index:
+        results = {
+            'loadDocument': dict(document.tables),
+            'loadTable': {table: index.loadTable(table) for table in index.names()},
+        }
+    for method, parsed in results.items():
+        for table, entries in expected.items():
+            actual = sorted(parsed.get(table, []))
+            if actual != sorted(entries):
+                return f"{method} 表 {table}: {actual[:3]!r}，应为 {sorted(entries)[:3]!r}"
+    return None
+
+
+def main(argv=None):
+    failed = 0
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, (tables, expected) in CASES.items():
+            try:
+                mismatch = runCase(name, tables, expected, tmp_dir)
+            except Exception as e:
+                mismatch = f"{type(e).__name__}: {e}"
+            failed += mismatch is not None
+            print(f"{name:>12} {'通过' if mismatch is None else '失败: ' + mismatch}")
+    print(f"{len(CASES) - failed}/{len(CASES)} 项通过")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
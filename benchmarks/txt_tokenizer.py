@@ -0,0 +1,131 @@
+"""
+TXT 分词器（builder/gxt_text.py）与逐行正则解析的耗时对比
+
+为每个版本生成数 MB 的合成 TXT，分别测量：
+  - 正则：原构建器的逐行做法（每行对表头、条目两个正则各匹配一次）
+  - 分词：tokenize 单遍扫描（行首字符分派 + partition）
+  - 加载：对应构建器 load_text 的完整耗时（含键名校验与建表）
+以及界面版本识别 detect_version 的单遍扫描耗时。
+
+用法（在仓库根目录执行）：
+    python -m benchmarks.txt_tokenizer [--entries 200000] [--tables 50] [--repeat 3]
+"""
+import argparse
+import importlib.machinery
+import os
+import re
+import tempfile
+import time
+
+from builder.gxt_text import detect_version, open_text, tokenize
+from builder.IVGXT import load_text as loadIVText
+from builder.LCGXT import LCGXT
+from builder.SAGXT import SAGXT
+
+VCGXT = importlib.machinery.SourceFileLoader(
+    'VCGXT', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'builder', 'VCGXT.PY')
+).load_module().VCGXT
+
+SAMPLE_TEXTS = [
+    "Hello ~r~world",
+    "中文文本测试",
+    "café ~n~ 第二行",
+    "Mission passed! ~1~ respect +",
+]
+
+# 各版本原构建器使用的 (表头, 条目) 正则
+LEGACY_FORMATS = {
+    'III': (None, re.compile(r'([0-9a-zA-Z_]{1,7})=(.*)')),
+    'VC': (re.compile(r'^\[([0-9A-Z_]{1,7})\]$'), re.compile(r'^([0-9A-Z_]{1,7})=(.*)$')),
+    'SA': (re.compile(r"\[([0-9A-Z_]{1,7})\]"), re.compile(r"([0-9a-fA-F]{1,8})=(.+)")),
+    'IV': (re.compile(r'\[([0-9A-Za-z_]{1,7})\]'), re.compile(r'([0-9A-F]{8})=(.*)', re.IGNORECASE)),
+}
+
+
+def makeText(path, version, entry_count, table_count):
+    """写出一个合成 TXT：III 没有表头，VC 键名为 7 位名称，SA/IV 键名为 8 位十六进制哈希"""
+    table_count = 1 if version == 'III' else table_count
+    per_table = max(1, entry_count // table_count)
+    with open(path, 'w', encoding='utf-8') as f:
+        for table_index in range(table_count):
+            if version != 'III':
+                f.write(f"[{'MAIN' if table_index == 0 else f'T{table_index:05d}'[:7]}]\n")
+            for i in range(per_table):
+                if version in ('III', 'VC'):
+                    key = f"K{table_index:02d}{i:04X}"[:7] if version == 'VC' else f"K{i:06d}"[:7]
+                else:
+                    key = f"{((table_index << 24) + i) * 2654435761 & 0xFFFFFFFF:08X}"
+                f.write(f"{key}={SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]} {i}\n")
+            f.write("\n")
+
+
+def legacyScan(path, version):
+    """原构建器的逐行正则匹配（只统计，不建表）"""
+    table_format, entry_format = LEGACY_FORMATS[version]
+    count = 0
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith(';'):
+                continue
+            table_match = table_format.fullmatch(line) if table_format else None
+            entry_match = entry_format.fullmatch(line)
+            if table_match or entry_match:
+                count += 1
+    return count
+
+
+def tokenScan(path):
+    count = 0
+    with open_text(path) as f:
+        for _ in tokenize(f):
+            count += 1
+    return count
+
+
+def loadText(path, version):
+    if version == 'III':
+        return LCGXT().load_text(path)
+    if version == 'VC':
+        return VCGXT().LoadText(path)
+    if version == 'SA':
+        return SAGXT().load_text(path)
+    return bool(loadIVText(path))
+
+
+def detectText(path):
+    with open_text(path) as f:
+        return detect_version(f)
+
+
+def best(func, repeat):
+    elapsed = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        elapsed = min(elapsed, time.perf_counter() - start_time)
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TXT 分词器与逐行正则解析耗时对比")
+    parser.add_argument('--entries', type=int, default=200000, help="每个版本的条目数")
+    parser.add_argument('--tables', type=int, default=50, help="表数量（III 没有表）")
+    parser.add_argument('--repeat', type=int, default=3, help="重复次数，取最快一次")
+    args = parser.parse_args(argv)
+
+    print(f"{'版本':>4} {'文件(MB)':>9} {'正则(s)':>9} {'分词(s)':>9} {'加载(s)':>9} {'识别(s)':>9} {'MB/s':>8}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for version in ('III', 'VC', 'SA', 'IV'):
+            path = os.path.join(tmp_dir, f'{version}.txt')
+            makeText(path, version, args.entries, args.tables)
+            size = os.path.getsize(path) / 1048576
+            legacy = best(lambda: legacyScan(path, version), args.repeat)
+            token = best(lambda: tokenScan(path), args.repeat)
+            load = best(lambda: loadText(path, version), args.repeat)
+            detect = best(lambda: detectText(path), args.repeat)
+            print(f"{version:>4} {size:>9.2f} {legacy:>9.3f} {token:>9.3f} {load:>9.3f} {detect:>9.3f} {size / token:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,110 +2,123 @@ import re
 import struct
 import os
 
+import numpy as np
+
+from builder.gxt_layout import assemble_gxt
+from builder.gxt_text import ENTRY, SECTION, open_text, tokenize
+
+ENTRY_KEY_FORMAT = re.compile(r'[0-9A-F]{8}', re.IGNORECASE)
+TABLE_NAME_FORMAT = re.compile(r'[0-9A-Za-z_]{1,7}')
+# 文件头：版本 4，字符位数 16
+FILE_HEADER = struct.pack('<HH', 4, 16)
+
+
 def generate_gxt(input_file, output_file):
+    tables = load_text(input_file)
+    f_data = build_gxt(tables)
+    # 写入文件
+    with open(output_file, 'wb') as f:
+        f.write(f_data)
+
+
+def load_text(input_file):
+    """读取TXT文本，返回 {表名: [(哈希, 文本)]}；无效行与不属于任何表的条目被忽略"""
     tables = {}
     # 1. 检查文件是否存在
     if not os.path.isfile(input_file):
         raise FileNotFoundError(f"输入文件 '{input_file}' 不存在")
-    # 2. 读取输入文本，解析表结构
-    with open(input_file, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-    
+    # 2. 流式读取输入文本，解析表结构
     current_table = None
-    for line in lines:
-        line = line.strip()
-        if not line:
+    with open_text(input_file) as f:
+        for _, kind, name, text in tokenize(f):
+            if kind == SECTION:
+                if TABLE_NAME_FORMAT.fullmatch(name):
+                    current_table = tables[name.upper()] = []
+            elif kind == ENTRY and current_table is not None and ENTRY_KEY_FORMAT.fullmatch(name):
+                current_table.append((int(name, 16), text))
+    return tables
+
+
+def load_tables(tables):
+    """
+    将已解析的文本（表名 -> [(8位十六进制键, 文本)]）转换为 build_gxt 使用的 {表名: [(哈希, 文本)]}。
+    规则与 load_text 相同：表名转为大写，无效的键和不属于任何表的条目被忽略。
+    """
+    result = {}
+    for table_name, entries in tables.items():
+        if table_name is None:
             continue
-        # 匹配表名
-        section_match = re.match(r'\[([0-9A-Za-z_]{1,7})\]', line)
-        if section_match:
-            current_table = section_match.group(1).upper()
-            tables[current_table] = []
-            continue
-        # 匹配条目
-        entry_match = re.match(r'([0-9A-F]{8})=(.*)', line, re.IGNORECASE)
-        if entry_match and current_table:
-            hash_val = int(entry_match.group(1), 16)
-            text = entry_match.group(2)
-            tables[current_table].append((hash_val, text))
-    
-    # 2. MAIN 表必须第一个，其余保持原顺序（严格符合规范）
-    table_names = []
+        if not TABLE_NAME_FORMAT.fullmatch(table_name):
+            raise ValueError(f"无效的表名: {table_name}")
+        result[table_name.upper()] = [(int(key, 16), text) for key, text in entries
+                                      if ENTRY_KEY_FORMAT.fullmatch(key)]
+    return result
+
+
+def build_gxt(tables):
+    """由 {表名: [(哈希, 文本)]} 在内存中生成完整的 GXT 文件内容"""
+    return assemble_gxt(FILE_HEADER, build_table_blocks(tables))
+
+
+def build_table_blocks(tables, table_names=None):
+    """
+    生成各表的表块 [(表名, 表块)]，MAIN 表必须第一个，其余保持原顺序（严格符合规范）。
+    table_names 为空时生成全部表。
+    """
+    names = []
     if 'MAIN' in tables:
-        table_names.append('MAIN')
-    table_names.extend([name for name in tables.keys() if name != 'MAIN'])
-    num_tables = len(table_names)
-
-    # 3. 文件头
-    version = 4
-    char_bits = 16
-    buf = bytearray()
-    buf += struct.pack('<HH', version, char_bits)
-
-    # 4. TABL 块头
-    tabl_magic = b'TABL'
-    tabl_entry_size = 12
-    tabl_size = num_tables * tabl_entry_size
-    buf += tabl_magic + struct.pack('<I', tabl_size)
-
-    # 5. 先计算每个表的偏移
-    table_offsets = {}
-    file_offset = 4 + 8 + tabl_size  # 文件头+TABL头+TABL表项
-
-    for table_name in table_names:
-        table_offsets[table_name] = file_offset  # 偏移必须指向表块开头
-
-        entries = tables[table_name]
-        # 如果不是 MAIN，先加 8字节表名
-        if table_name != 'MAIN':
-            file_offset += 8
-
-        # TKEY
-        tkey_data_size = len(entries) * 8
-        file_offset += 8 + tkey_data_size  # 含头部+数据
-
-        # TDAT
-        str_total_len = sum(len(text.encode('utf-16le')) + 2 for _, text in entries)
-        file_offset += 8 + str_total_len  # 含头部+数据
-
-    # 6. 写 TABL 表项
-    for table_name in table_names:
-        name_padded = table_name.encode('ascii').ljust(8, b'\x00')
-        buf += name_padded + struct.pack('<I', table_offsets[table_name])
-
-    # 7. 写各表
-    for table_name in table_names:
-        entries = tables[table_name]
-
-        # 非 MAIN 表先写表名
-        if table_name != 'MAIN':
-            buf += table_name.encode('ascii').ljust(8, b'\x00')
-
-        # TKEY
-        tkey_magic = b'TKEY'
-        tkey_data_size = len(entries) * 8
-        buf += tkey_magic + struct.pack('<I', tkey_data_size)
-
-        str_offsets = []
-        cur_off = 0
-        for _, text in entries:
-            str_offsets.append(cur_off)
-            cur_off += len(text.encode('utf-16le')) + 2
-
-        for (hash_val, _), str_off in zip(entries, str_offsets):
-            buf += struct.pack('<II', str_off, hash_val)
-
-        # TDAT
-        tdat_magic = b'TDAT'
-        tdat_data_size = sum(len(text.encode('utf-16le')) + 2 for _, text in entries)
-        buf += tdat_magic + struct.pack('<I', tdat_data_size)
-
-        for _, text in entries:
-            buf += text.encode('utf-16le') + b'\x00\x00'
-
-    # 8. 写入文件
-    with open(output_file, 'wb') as f:
-        f.write(buf)
+        names.append('MAIN')
+    names.extend([name for name in tables.keys() if name != 'MAIN'])
+    if table_names is not None:
+        names = [name for name in names if name in table_names]
+    return [(name, _build_table_block(name, tables[name])) for name in names]
+
+
+def _build_table_block(table_name, entries):
+    # 表内文本整体编码一次，偏移由累加和得出
+    tdat_data, str_offsets = _encode_texts([text for _, text in entries])
+    tkey_data_size = len(entries) * 8
+    name_size = 0 if table_name == 'MAIN' else 8
+
+    buf = bytearray(name_size + 8 + tkey_data_size + 8 + len(tdat_data))
+    view = memoryview(buf)
+    # 非 MAIN 表先写表名
+    if name_size:
+        view[0:8] = table_name.encode('ascii').ljust(8, b'\x00')
+    pos = name_size
+
+    # TKEY：每项为 (TDAT 内偏移, 哈希)
+    struct.pack_into('<4sI', buf, pos, b'TKEY', tkey_data_size)
+    pos += 8
+    tkey = np.empty((len(entries), 2), dtype='<u4')
+    tkey[:, 0] = str_offsets
+    tkey[:, 1] = np.fromiter((hash_val for hash_val, _ in entries), dtype=np.uint32, count=len(entries))
+    view[pos:pos + tkey_data_size] = tkey.tobytes()
+    pos += tkey_data_size
+
+    # TDAT
+    struct.pack_into('<4sI', buf, pos, b'TDAT', len(tdat_data))
+    pos += 8
+    view[pos:pos + len(tdat_data)] = tdat_data
+    return buf
+
+
+def _encode_texts(texts):
+    """
+    将一组文本一次性编码为 UTF-16LE（每条以 \\0\\0 结尾），
+    返回 (TDAT 数据, 各条文本在 TDAT 内的字节偏移)
+    """
+    if not texts:
+        return b'', np.empty(0, dtype=np.int64)
+    data = '\x00'.join(texts + ['']).encode('utf-16le')
+    ends = np.flatnonzero(np.frombuffer(data, dtype='<u2') == 0)
+    if len(ends) != len(texts):
+        # 文本内含 \0 时无法按结尾符切分，逐条计算长度
+        ends = np.cumsum([len(text.encode('utf-16le')) // 2 + 1 for text in texts]) - 1
+    offsets = np.empty(len(texts), dtype=np.int64)
+    offsets[0] = 0
+    offsets[1:] = (ends[:-1] + 1) * 2
+    return data, offsets
 
 
 # 调用示例
@@ -1,6 +1,13 @@
 import re
 import struct
 import os
+import sys
+from array import array
+
+import numpy as np
+
+from builder.charset import CharacterSet
+from builder.gxt_text import ENTRY, TextFormatError, open_text, token_line, tokenize
 
 class LCGXT:
     SIZE_OF_TKEY = 12
@@ -12,119 +19,116 @@ class LCGXT:
     def load_text(self, path):
         self.m_GxtData = {}
         self.m_WideCharCollection = set()
+        key_format = re.compile(r'[0-9a-zA-Z_]{1,7}')
         
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.rstrip('\n')
-                    # 跳过空行和注释
-                    if not line or line.startswith(';'):
-                        continue
-                    
-                    # 使用正则匹配键值对
-                    match = re.match(r'([0-9a-zA-Z_]{1,7})=(.*)', line)
-                    if not match:
-                        print(f"Invalid line:\n{line}\n")
-                        return False
-                    
-                    key = match.group(1)
-                    value = match.group(2)
-                    utf16_data = self.utf8_to_utf16(value)
+            with open_text(path) as f:
+                # GTA3 没有表，值保留行尾空白；跳过空行和注释
+                for line_num, kind, key, value in tokenize(f, strip=False):
+                    if kind != ENTRY or not key_format.fullmatch(key):
+                        raise TextFormatError(line_num, "Invalid line", token_line(kind, key, value))
                     
-                    # 特殊键名处理
-                    if key in ["CHS2500", "CHS3000"] or key not in self.m_GxtData:
-                        self.m_GxtData[key] = utf16_data
-                        # 收集宽字符
-                        for char in utf16_data:
-                            if char >= 0x80:
-                                self.m_WideCharCollection.add(char)
+                    self._add_entry(key, value)
+        except TextFormatError as e:
+            print(e)
+            return False
         except Exception as e:
             print(f"Error reading file: {e}")
             return False
         
+        self._collect_wide_chars()
         return True
     
+    def load_tables(self, tables):
+        """
+        从已解析的文本加载（表名 -> [(键, 值)]），无需经过TXT文件。
+        GTA3 没有表，所有表的条目按顺序合并。
+        """
+        self.m_GxtData = {}
+        self.m_WideCharCollection = set()
+        key_format = re.compile(r'[0-9a-zA-Z_]{1,7}')
+        
+        for entries in tables.values():
+            for key, value in entries:
+                if not key_format.fullmatch(key):
+                    print(f"Invalid line:\n{key}={value}\n")
+                    return False
+                self._add_entry(key, value)
+        
+        self._collect_wide_chars()
+        return True
+    
+    def _add_entry(self, key, value):
+        utf16_data = self.utf8_to_utf16(value)
+        
+        # 特殊键名处理
+        if key in ["CHS2500", "CHS3000"] or key not in self.m_GxtData:
+            self.m_GxtData[key] = utf16_data
+    
+    def _collect_wide_chars(self):
+        """对全部码元做一次向量化去重，收集宽字符"""
+        self.m_WideCharCollection = set(CharacterSet.from_units(self.m_GxtData.values()))
+    
     def save_as_gxt(self, path):
         if not self.m_GxtData:
             return
         
-        # 计算块大小
-        key_block_size = len(self.m_GxtData) * self.SIZE_OF_TKEY
-        data_block_size = self.get_data_block_size()
-        
         try:
+            f_data = self.build_gxt()
             with open(path, 'wb') as f:
-                # 写入TKEY头部
-                f.write(b'TKEY')
-                f.write(struct.pack('<I', key_block_size))
-                
-                # 写入TDAT头部占位
-                f.seek(8 + key_block_size)
-                f.write(b'TDAT')
-                f.write(struct.pack('<I', data_block_size))
-                
-                # 写入键值数据
-                data_start_pos = 8 + key_block_size + 8
-                current_data_pos = data_start_pos
-                
-                for key, utf16_data in self.m_GxtData.items():
-                    # 写入TKEY条目
-                    offset = current_data_pos - (key_block_size + 16)
-                    key_name = key.ljust(7, '\x00')[:7].encode('ascii')
-                    
-                    f.seek(8 + (list(self.m_GxtData.keys()).index(key) * self.SIZE_OF_TKEY))
-                    f.write(struct.pack('<I', offset))
-                    f.write(key_name + b'\x00')
-                    
-                    # 写入字符串数据
-                    f.seek(current_data_pos)
-                    for char in utf16_data:
-                        f.write(struct.pack('<H', char))
-                    current_data_pos += len(utf16_data) * 2
+                f.write(f_data)
         except Exception as e:
             print(f"Error writing GXT file: {e}")
     
+    def build_gxt(self):
+        """在内存中拼装 TKEY/TDAT 两个块，返回完整的文件内容"""
+        keys = list(self.m_GxtData.keys())
+        values = list(self.m_GxtData.values())
+        
+        # 计算块大小
+        key_block_size = len(keys) * self.SIZE_OF_TKEY
+        data_block_size = self.get_data_block_size()
+        
+        # TKEY条目：TDAT内的字节偏移 + 8字节键名（最多7个字符，以\0结尾）
+        key_data = np.zeros(len(keys), dtype=[('offset', '<u4'), ('name', 'S8')])
+        lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+        key_data['offset'][1:] = np.cumsum(lengths[:-1]) * 2
+        key_data['name'] = [key[:7].encode('ascii') for key in keys]
+        
+        # TDAT：所有UTF-16码元连续排列
+        data = array('H')
+        for utf16_data in values:
+            data.extend(utf16_data)
+        if sys.byteorder == 'big':
+            data.byteswap()
+        
+        buf = bytearray(16 + key_block_size + data_block_size)
+        struct.pack_into('<4sI', buf, 0, b'TKEY', key_block_size)
+        buf[8:8 + key_block_size] = key_data.tobytes()
+        struct.pack_into('<4sI', buf, 8 + key_block_size, b'TDAT', data_block_size)
+        buf[16 + key_block_size:] = data.tobytes()
+        return buf
+    
     def get_data_block_size(self):
-        size = 0
-        for utf16_data in self.m_GxtData.values():
-            size += len(utf16_data) * 2
-        return size
+        return sum(map(len, self.m_GxtData.values())) * 2
     
     def generate_wmhhz_stuff(self):
         try:
+            charset = CharacterSet(self.m_WideCharCollection)
             # 写入CHARACTERS.txt
-            with open('CHARACTERS.txt', 'wb') as f:
-                f.write(b'\xFF\xFE')  # UTF-16 LE BOM
-                row = 0
-                col = 0
-                for char in sorted(self.m_WideCharCollection):
-                    f.write(struct.pack('<H', char))
-                    col += 1
-                    if col >= 64:
-                        f.write(b'\x0A\x00')  # UTF-16 LE换行
-                        row += 1
-                        col = 0
-            
+            charset.write_characters('CHARACTERS.txt')
             # 写入TABLE.txt
-            with open('TABLE.txt', 'w', encoding='utf-8') as f:
-                row = 0
-                col = 0
-                for char in sorted(self.m_WideCharCollection):
-                    f.write(f"m_Table[0x{char:04X}] = {{{row},{col}}};\n")
-                    col += 1
-                    if col >= 64:
-                        row += 1
-                        col = 0
+            charset.write_table('TABLE.txt', hex_digits=4)
         except Exception as e:
             print(f"Error generating files: {e}")
     
     @staticmethod
     def utf8_to_utf16(s):
-        """将UTF-8字符串转换为UTF-16 LE码点列表，包含结尾空字符"""
-        utf16_bytes = s.encode('utf-16le')
-        utf16_list = [char for char in struct.unpack(f'<{len(utf16_bytes)//2}H', utf16_bytes)]
-        utf16_list.append(0)  # 添加结尾空字符
-        return utf16_list
+        """将UTF-8字符串转换为UTF-16码元数组（array('H')），包含结尾空字符"""
+        utf16_data = array('H', (s + '\x00').encode('utf-16le'))
+        if sys.byteorder == 'big':
+            utf16_data.byteswap()
+        return utf16_data
 
 # 主程序
 if __name__ == "__main__":
@@ -2,152 +2,180 @@ import os
 import re
 import struct
 
+import numpy as np
+
+from builder.charset import CharacterSet
+from builder.gxt_layout import assemble_gxt
+from builder.gxt_text import ENTRY, SECTION, TextFormatError, open_text, tokenize
+
 class SAGXT:
     SizeOfTABL = 12
     SizeOfTKEY = 8
+    FILE_HEADER = b"\x04\x00\x08\x00"
+    # 可写回的文本编码
+    ENCODINGS = ('utf-8', 'cp1252', 'gbk')
 
-    def __init__(self):
+    def __init__(self, encoding='utf-8'):
         self.m_GxtData = dict()  # 表名 -> {hash: 文本}
         self.m_WideCharCollection = set()
+        # 文本编码，沿用读取器（gta.gxt.SA.encoding）检测到的编码以便原样回写；
+        # 读取器检测为混合编码（'mixed'）时没有单一编码可沿用，按 UTF-8 写回
+        if encoding == 'mixed':
+            print("原文件为混合编码，按 UTF-8 写回。")
+            encoding = 'utf-8'
+        if encoding not in self.ENCODINGS:
+            raise ValueError(f"不支持的文本编码: {encoding}（可用 {' / '.join(self.ENCODINGS)}）")
+        self.encoding = encoding
 
     def load_text(self, path: str) -> bool:
-        table_format = re.compile(r"\[([0-9A-Z_]{1,7})\]")
-        entry_format = re.compile(r"([0-9a-fA-F]{1,8})=(.+)")
+        table_format = re.compile(r"[0-9A-Z_]{1,7}")
+        key_format = re.compile(r"[0-9a-fA-F]{1,8}")
 
         current_table = None
         self.m_GxtData.clear()
         self.m_WideCharCollection.clear()
 
         try:
-            with open(path, encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith(';'):
-                        continue
-
-                    table_match = table_format.fullmatch(line)
-                    entry_match = entry_format.fullmatch(line)
-
-                    if table_match:
-                        table_name = table_match.group(1)
-                        self.m_GxtData[table_name] = dict()
-                        current_table = self.m_GxtData[table_name]
-                    elif entry_match:
+            with open_text(path) as f:
+                for line_num, kind, name, text in tokenize(f):
+                    if kind == SECTION:
+                        if not table_format.fullmatch(name):
+                            raise TextFormatError(line_num, "非法表名", f"[{name}]")
+                        table_name = name
+                        current_table = self.m_GxtData[table_name] = dict()
+                    elif kind == ENTRY:
+                        if not key_format.fullmatch(name) or not text:
+                            raise TextFormatError(line_num, "非法行", f"{name}={text}")
                         if current_table is None:
-                            print(f"键 {entry_match.group(1)} 没有对应表。")
-                            return False
-
-                        hash_key = int(entry_match.group(1), 16)
-                        text = entry_match.group(2)
+                            raise TextFormatError(line_num, f"键 {name} 没有对应表")
 
+                        hash_key = int(name, 16)
                         if hash_key in current_table:
-                            print(f"重复项:\n{entry_match.group(1)}\n所在表:\n{table_name}\n")
-                            return False
+                            raise TextFormatError(line_num, f"重复项 {name}，所在表 {table_name}")
 
                         current_table[hash_key] = text
-                        for ch in text:
-                            self.m_WideCharCollection.add(ch)
+                        self.m_WideCharCollection.update(text)
                     else:
-                        print(f"非法行:\n{line}\n")
-                        return False
+                        raise TextFormatError(line_num, "非法行", name)
             return True
+        except TextFormatError as e:
+            print(e)
+            return False
         except Exception as e:
             print(f"读取文件出错: {e}")
             return False
 
+    def load_tables(self, tables) -> bool:
+        """
+        从已解析的文本加载（表名 -> [(十六进制哈希, 文本)]），无需经过TXT文件。
+        校验规则与 load_text 相同；表名为 None 的条目视为不属于任何表。
+        """
+        table_format = re.compile(r"[0-9A-Z_]{1,7}")
+        key_format = re.compile(r"[0-9a-fA-F]{1,8}")
+
+        self.m_GxtData.clear()
+        self.m_WideCharCollection.clear()
+
+        for table_name, entries in tables.items():
+            if table_name is None:
+                if entries:
+                    print(f"键 {entries[0][0]} 没有对应表。")
+                    return False
+                continue
+            if not table_format.fullmatch(table_name):
+                print(f"非法行:\n[{table_name}]\n")
+                return False
+
+            current_table = self.m_GxtData[table_name] = dict()
+            for key, text in entries:
+                if not key_format.fullmatch(key) or not text:
+                    print(f"非法行:\n{key}={text}\n")
+                    return False
+
+                hash_key = int(key, 16)
+                if hash_key in current_table:
+                    print(f"重复项:\n{key}\n所在表:\n{table_name}\n")
+                    return False
+
+                current_table[hash_key] = text
+                self.m_WideCharCollection.update(text)
+        return True
+
     def save_as_gxt(self, path: str):
         try:
+            f_data = self.build_gxt()
             with open(path, 'wb') as f:
-                f.write(b"\x04\x00\x08\x00")
-                f.write(b"TABL")
-                table_block_size = len(self.m_GxtData) * self.SizeOfTABL
-                f.write(struct.pack('<I', table_block_size))
-
-                fo_table_block = 12
-                fo_key_block = 12 + table_block_size
-                key_block_offset = fo_key_block
-
-                # 预先计算所有表的大小以优化文件写入
-                table_info = []
-                for table_name, entries in sorted(self.m_GxtData.items(), key=self._table_sort):
-                    key_block_size = len(entries) * self.SizeOfTKEY
-                    data_block_size = self._get_data_block_size(entries)
-                    table_info.append((table_name, entries, key_block_size, data_block_size))
-
-                for table_name, entries, key_block_size, data_block_size in table_info:
-                    # 写入 TABL
-                    f.seek(fo_table_block)
-                    name_bytes = table_name.encode('ascii')[:7].ljust(8, b'\x00')
-                    f.write(name_bytes)
-                    f.write(struct.pack('<I', key_block_offset))
-                    fo_table_block += self.SizeOfTABL
-
-                    # 写入 TKEY header
-                    f.seek(fo_key_block)
-                    if table_name != "MAIN":
-                        f.write(name_bytes)
-                    f.write(b"TKEY")
-                    f.write(struct.pack('<I', key_block_size))
-                    fo_key_block = f.tell()
-                    f.seek(key_block_size, 1)
-
-                    # 写入 TDAT header
-                    tdat_offset = f.tell()
-                    f.write(b"TDAT")
-                    f.write(struct.pack('<I', data_block_size))
-                    fo_data_block = f.tell()
-
-                    # 批量写入 TKEY 和 TDAT 实际数据
-                    key_data = bytearray()
-                    data_blocks = []
-                    
-                    for hash_key, value in entries.items():
-                        data_offset = len(b''.join(data_blocks))
-                        key_data.extend(struct.pack('<II', data_offset, hash_key))
-                        data_blocks.append(value.encode('utf-8') + b'\x00')
-                    
-                    # 一次性写入所有TKEY数据
-                    f.seek(fo_key_block)
-                    f.write(key_data)
-                    
-                    # 一次性写入所有TDAT数据
-                    f.seek(fo_data_block)
-                    for data_block in data_blocks:
-                        f.write(data_block)
-                        
-                    fo_key_block = f.tell()
-                    key_block_offset = fo_key_block
+                f.write(f_data)
         except Exception as e:
             print(f"写入GXT失败: {e}")
 
-    def generate_wmhhz_stuff(self):
+    def build_gxt(self) -> bytearray:
+        """在内存中生成完整的 GXT 文件内容（MAIN 表在前，其余按表名排序）"""
+        return assemble_gxt(self.FILE_HEADER, self.build_table_blocks())
+
+    def build_table_blocks(self, table_names=None):
+        """
+        生成各表的表块 [(表名, 表块)]，表块内的偏移均为相对值，可由 gxt_layout 放到文件任意位置。
+        table_names 为空时生成全部表；每条文本只编码一次，TKEY 偏移由累加和得出。
+        """
+        tables = sorted(self.m_GxtData.items(), key=self._table_sort)
+        if table_names is not None:
+            tables = [(name, entries) for name, entries in tables if name in table_names]
+        return [(table_name, self._build_table_block(table_name, entries)) for table_name, entries in tables]
+
+    def _encode_values(self, table_name, entries):
+        """按 self.encoding 编码各条文本；有无法表示的字符时报告所在的表与键，不做替换"""
         try:
-            with open("TABLE.txt", "w", encoding='utf-8') as conv_code, \
-                open("CHARACTERS.txt", "wb") as characters_set:
-
-                characters_set.write(b"\xFF\xFE")  # UTF-16LE BOM
-
-                row, column = 0, 0
-                for char in sorted(self.m_WideCharCollection):
-                    if ord(char) <= 0x7F:
-                        continue  # 跳过 ASCII
-
-                    conv_code.write(f"m_Table[0x{ord(char):X}] = {{{row},{column}}};\n")
-                    characters_set.write(char.encode('utf-16le'))
+            return [value.encode(self.encoding) for value in entries.values()]
+        except UnicodeEncodeError:
+            pass
+        for hash_key, value in entries.items():
+            try:
+                value.encode(self.encoding)
+            except UnicodeEncodeError as e:
+                raise ValueError(f"表 {table_name} 的键 {hash_key:08X} 含有 {self.encoding} 无法表示的字符 "
+                                 f"{e.object[e.start:e.end]!r}") from e
+
+    def _build_table_block(self, table_name, entries):
+        values = self._encode_values(table_name, entries)
+        data_block_size = sum(map(len, values)) + len(values)
+        key_block_size = len(values) * self.SizeOfTKEY
+        name_size = 0 if table_name == "MAIN" else 8
+
+        buf = bytearray(name_size + 8 + key_block_size + 8 + data_block_size)
+        if name_size:
+            buf[0:8] = table_name.encode('ascii')[:7].ljust(8, b'\x00')
+        pos = name_size
+
+        # TKEY：每项为 (TDAT 内偏移, 哈希)
+        struct.pack_into('<4sI', buf, pos, b"TKEY", key_block_size)
+        pos += 8
+        if values:
+            key_data = np.empty((len(values), 2), dtype='<u4')
+            lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values)) + 1
+            key_data[0, 0] = 0
+            key_data[1:, 0] = np.cumsum(lengths[:-1])
+            key_data[:, 1] = np.fromiter(entries.keys(), dtype=np.uint32, count=len(values))
+            buf[pos:pos + key_block_size] = key_data.tobytes()
+        pos += key_block_size
+
+        # TDAT：以 \0 结尾的文本依次排列
+        struct.pack_into('<4sI', buf, pos, b"TDAT", data_block_size)
+        pos += 8
+        if values:
+            values.append(b'')
+            buf[pos:pos + data_block_size] = b'\x00'.join(values)
+        return buf
 
-                    if column < 63:
-                        column += 1
-                    else:
-                        row += 1
-                        characters_set.write('\n'.encode('utf-16le'))
-                        column = 0
+    def generate_wmhhz_stuff(self):
+        try:
+            charset = CharacterSet.from_texts(self.m_WideCharCollection)  # 跳过 ASCII
+            charset.write_table("TABLE.txt")
+            charset.write_characters("CHARACTERS.txt")
         except Exception as e:
             print(f"生成 WMHHZ 输出失败: {e}")
 
 
-    def _get_data_block_size(self, table: dict) -> int:
-        return sum(len(v.encode('utf-8')) + 1 for v in table.values())
-
     def _table_sort(self, item):
         return (item[0] != 'MAIN', item[0])  # MAIN优先，其它按字典序
 
@@ -0,0 +1,180 @@
+"""
+TXT → GXT 批量构建命令行工具（无界面）
+
+清单（JSON）中每项为一个构建任务：
+    [
+        {"txt": "chs/gtasa.txt", "version": "SA", "output": "out/chs/american.gxt"},
+        {"txt": "chs/gta3.txt", "version": "III"},
+        ...
+    ]
+也可以写成 {"jobs": [...]}。相对路径以清单所在目录为基准；省略 output 时输出到 TXT 同目录同名的 .gxt；
+version 省略或为 "auto" 时按 TXT 内容自动识别（SA/IV 无法区分时需显式指定）。
+SA 任务可额外指定 "encoding"（utf-8 / cp1252 / gbk）。
+
+各任务在进程池中独立构建，单个任务失败不影响其他任务。
+
+用法（在仓库根目录执行）：
+    python -m builder.batch <清单.json> [-j 进程数] [--report 结果.json]
+"""
+import argparse
+import importlib.machinery
+import importlib.util
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from builder.gxt_text import detect_version, open_text
+
+VERSIONS = ('III', 'VC', 'SA', 'IV')
+
+
+def _load_vc_builder():
+    """VCGXT.PY 的扩展名为大写，在区分大小写的文件系统上无法直接 import"""
+    module = sys.modules.get('builder.VCGXT')
+    if module is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'VCGXT.PY')
+        loader = importlib.machinery.SourceFileLoader('builder.VCGXT', path)
+        module = importlib.util.module_from_spec(importlib.util.spec_from_loader(loader.name, loader))
+        loader.exec_module(module)
+        sys.modules[loader.name] = module
+    return module.VCGXT
+
+
+def load_manifest(path):
+    """读取清单，返回 [(txt, version, output, encoding)]，路径均为绝对路径"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        manifest = json.load(f)
+    if isinstance(manifest, dict):
+        manifest = manifest.get('jobs', [])
+    base_dir = os.path.dirname(os.path.abspath(path))
+    jobs = []
+    for index, job in enumerate(manifest, 1):
+        if not isinstance(job, dict) or not job.get('txt'):
+            raise ValueError(f"清单第{index}项缺少 txt")
+        txt_path = os.path.join(base_dir, job['txt'])
+        output = job.get('output') or os.path.splitext(job['txt'])[0] + '.gxt'
+        jobs.append((txt_path, job.get('version') or 'auto', os.path.join(base_dir, output), job.get('encoding')))
+    return jobs
+
+
+def build_job(txt_path, version, output, encoding=None):
+    """构建单个 GXT，返回统计信息字典；加载或构建失败时抛出异常"""
+    start_time = time.perf_counter()
+    if not os.path.isfile(txt_path):
+        raise FileNotFoundError(f"输入文件 '{txt_path}' 不存在")
+
+    version = version.upper()
+    if version == 'AUTO':
+        with open_text(txt_path) as f:
+            version = detect_version(f)
+        if version not in VERSIONS:
+            raise ValueError(f"无法识别版本（{version}），请在清单中指定 version")
+    elif version not in VERSIONS:
+        raise ValueError(f"未知的版本: {version}")
+
+    if version == 'III':
+        from builder.LCGXT import LCGXT
+        generator = LCGXT()
+        loaded = generator.load_text(txt_path)
+        tables, entries = 0, len(generator.m_GxtData)
+        build = generator.build_gxt
+    elif version == 'VC':
+        generator = _load_vc_builder()()
+        loaded = generator.LoadText(txt_path)
+        tables, entries = len(generator.m_GxtData), sum(map(len, generator.m_GxtData.values()))
+        build = generator.BuildGXT
+    elif version == 'SA':
+        from builder.SAGXT import SAGXT
+        generator = SAGXT(encoding or 'utf-8')
+        loaded = generator.load_text(txt_path)
+        tables, entries = len(generator.m_GxtData), sum(map(len, generator.m_GxtData.values()))
+        build = generator.build_gxt
+    else:
+        from builder.IVGXT import load_text, build_gxt
+        iv_tables = load_text(txt_path)
+        loaded = True
+        tables, entries = len(iv_tables), sum(map(len, iv_tables.values()))
+        build = lambda: build_gxt(iv_tables)
+
+    if not loaded:
+        raise ValueError("加载文本失败")
+    gxt_data = build()
+
+    out_dir = os.path.dirname(output)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    with open(output, 'wb') as f:
+        f.write(gxt_data)
+
+    return {
+        'txt': txt_path,
+        'output': output,
+        'version': version,
+        'tables': tables,
+        'entries': entries,
+        'size': len(gxt_data),
+        'elapsed': time.perf_counter() - start_time,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="按清单批量将 TXT 构建为 GXT")
+    parser.add_argument('manifest', help="JSON 清单文件")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help="并行进程数")
+    parser.add_argument('--report', help="将每个任务的结果写出为 JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"读取清单失败: {e}", file=sys.stderr)
+        return 1
+    if not jobs:
+        print("清单中没有任务。", file=sys.stderr)
+        return 1
+
+    workers = max(1, min(args.jobs, len(jobs)))
+    results = []
+    failed = 0
+    wall_start = time.perf_counter()
+
+    def report(result):
+        results.append(result)
+        print(f"[{result['version']:>3}] {result['txt']} -> {result['output']}: {result['tables']} 表, "
+              f"{result['entries']} 条, {result['size'] / 1048576:.2f} MB, {result['elapsed']:.3f}s")
+
+    def report_error(job, error):
+        nonlocal failed
+        failed += 1
+        results.append({'txt': job[0], 'output': job[2], 'error': str(error)})
+        print(f"[失败] {job[0]}: {error}", file=sys.stderr)
+
+    if workers == 1:
+        for job in jobs:
+            try:
+                report(build_job(*job))
+            except Exception as e:
+                report_error(job, e)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(build_job, *job): job for job in jobs}
+            for future in as_completed(futures):
+                try:
+                    report(future.result())
+                except Exception as e:
+                    report_error(futures[future], e)
+
+    wall = time.perf_counter() - wall_start
+    total_bytes = sum(result.get('size', 0) for result in results)
+    print(f"完成 {len(jobs) - failed}/{len(jobs)} 个任务，共输出 {total_bytes / 1048576:.2f} MB，"
+          f"耗时 {wall:.3f}s（{workers} 进程）")
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
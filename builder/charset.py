@@ -0,0 +1,128 @@
+"""
+汉化字库（WMHHZ）字符集与字符映射生成
+
+由一个或多个 GXT 的文本得到排序去重的非 ASCII 字符集（numpy 数组），按每行 64 个字符排布，生成：
+  - CHARACTERS.txt：UTF-16LE（带 BOM）字符表，每 64 个字符换行，供制作字库贴图
+  - TABLE.txt：m_Table[0x码位] = {行,列}; 形式的映射代码
+  - wm_vcchs.dat 等：65536 项 (行, 列) 的字符映射表（128 KiB），未收录的字符为 (63, 63)
+每个文件都在内存中整体生成后一次写出。
+
+多个 GXT 合用一张字库贴图时，可在命令行一次传入所有文件（在仓库根目录执行）：
+    python -m builder.charset a.gxt b.gxt ... [-o 输出目录] [--map wm_vcchs.dat]
+"""
+import argparse
+import os
+
+import numpy as np
+
+COLUMNS = 64
+DEFAULT_CELL = 63  # 未收录字符在映射表中的行、列（'?'）
+
+
+class CharacterSet:
+    """排序去重后的非 ASCII 码位集合（uint32 数组）"""
+
+    def __init__(self, codes=()):
+        codes = np.unique(np.asarray(list(codes) if not isinstance(codes, np.ndarray) else codes,
+                                     dtype=np.uint32))
+        self.codes = codes[codes > 0x7F]
+
+    @classmethod
+    def from_texts(cls, texts, utf16=False):
+        """
+        由一组文本得到字符集。utf16 为 True 时按 UTF-16 码元统计（III/VC 的 TDAT 为 UTF-16，
+        增补平面字符拆为两个代理码元），否则按 Unicode 码位统计。
+        """
+        data = ''.join(texts)
+        if utf16:
+            return cls(np.frombuffer(data.encode('utf-16-le', errors='surrogatepass'), dtype='<u2'))
+        return cls(np.frombuffer(data.encode('utf-32-le', errors='surrogatepass'), dtype='<u4'))
+
+    @classmethod
+    def from_units(cls, arrays):
+        """由多段 UTF-16 码元（本机字节序的 array('H') / uint16 数组）得到字符集"""
+        return cls(np.frombuffer(b''.join(arrays), dtype=np.uint16))
+
+    def union(self, *others):
+        """与其他字符集合并，用于多个 GXT 共用一张字库"""
+        return CharacterSet(np.concatenate([self.codes] + [other.codes for other in others]))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __iter__(self):
+        return iter(self.codes.tolist())
+
+    def positions(self):
+        """各字符在字库贴图中的 (行, 列)"""
+        index = np.arange(len(self.codes))
+        return index // COLUMNS, index % COLUMNS
+
+    def characters_data(self):
+        """CHARACTERS.txt 的内容：UTF-16LE BOM + 字符，每满 64 个字符追加一个换行"""
+        codes = np.insert(self.codes, np.arange(COLUMNS, len(self.codes) + 1, COLUMNS), 0x0A)
+        if not len(codes) or codes.max() < 0x10000:
+            body = codes.astype('<u2').tobytes()
+        else:
+            # 含增补平面字符时经 UTF-32 转为代理对
+            body = codes.astype('<u4').tobytes().decode('utf-32-le', errors='surrogatepass') \
+                .encode('utf-16-le', errors='surrogatepass')
+        return b'\xFF\xFE' + body
+
+    def table_text(self, hex_digits=1):
+        """TABLE.txt 的内容；hex_digits 为码位十六进制的最少位数"""
+        rows, columns = self.positions()
+        return ''.join(f"m_Table[0x{code:0{hex_digits}X}] = {{{row},{column}}};\n"
+                       for code, row, column in zip(self.codes.tolist(), rows.tolist(), columns.tolist()))
+
+    def font_map(self):
+        """65536 项 (行, 列) 字节对组成的映射表，超出基本多文种平面的字符不收录"""
+        rows, columns = self.positions()
+        if len(rows) and rows[-1] > 0xFF:
+            raise ValueError(f"字符过多（{len(self.codes)}），映射表的行号不能超过 255")
+        table = np.full((0x10000, 2), DEFAULT_CELL, dtype=np.uint8)
+        in_bmp = self.codes < 0x10000
+        table[self.codes[in_bmp], 0] = rows[in_bmp]
+        table[self.codes[in_bmp], 1] = columns[in_bmp]
+        return table.tobytes()
+
+    def write_characters(self, path='CHARACTERS.txt'):
+        with open(path, 'wb') as f:
+            f.write(self.characters_data())
+
+    def write_table(self, path='TABLE.txt', hex_digits=1):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.table_text(hex_digits))
+
+    def write_font_map(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.font_map())
+
+
+def main(argv=None):
+    import gta.gxt
+
+    parser = argparse.ArgumentParser(description="由一个或多个 GXT 生成共用的汉化字库字符集与映射文件")
+    parser.add_argument('inputs', nargs='+', help="GXT 文件")
+    parser.add_argument('-o', '--output', default='.', help="输出目录")
+    parser.add_argument('--map', help="额外输出 65536 项字符映射表的文件名（如 wm_vcchs.dat）")
+    parser.add_argument('--utf16', action='store_true', help="按 UTF-16 码元统计（III/VC 字库）")
+    args = parser.parse_args(argv)
+
+    charset = CharacterSet()
+    for path in args.inputs:
+        with gta.gxt.GXTIndex.open(path) as index:
+            texts = (value for _, entries in index.iterTables() for _, value in entries)
+            charset = charset.union(CharacterSet.from_texts(texts, utf16=args.utf16))
+
+    os.makedirs(args.output, exist_ok=True)
+    charset.write_characters(os.path.join(args.output, 'CHARACTERS.txt'))
+    charset.write_table(os.path.join(args.output, 'TABLE.txt'), hex_digits=4 if args.utf16 else 1)
+    if args.map:
+        charset.write_font_map(os.path.join(args.output, args.map))
+    print(f"{len(args.inputs)} 个 GXT，共 {len(charset)} 个字符")
+    return 0
+
+
+if __name__ == '__main__':
+    main()
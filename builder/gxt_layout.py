@@ -0,0 +1,174 @@
+"""
+带 TABL 的 GXT（VC/SA/IV）文件布局与增量重建
+
+文件结构：[文件头（SA/IV 为 4 字节，VC 没有）] + TABL 块（每项 8 字节表名 + 4 字节偏移）+ 各表块。
+表块 = [8 字节表名（MAIN 表没有）] + TKEY 块 + TDAT 块，表块内部的偏移都是相对的，
+因此表块可以原样搬到文件中任意位置，只需重算 TABL 中的偏移。
+
+构建器只负责生成各表块，由 assemble_gxt / write_gxt 拼装完整文件。
+GXTLayout 在打开文件时记录各表在原文件中的范围，各表的内容指纹推迟到第一次保存时才计算；
+保存时只重新编码指纹变化的表，其余表直接从原文件的 mmap 整块拷贝。
+"""
+import hashlib
+import mmap
+import os
+import struct
+import traceback
+
+SIZE_OF_TABL = 12
+
+
+def _tabl_block(header_size, parts):
+    """根据各表块大小计算 TABL 块内容，返回 (TABL 块, [(表名, 起始偏移, 结束偏移)])"""
+    tabl_size = len(parts) * SIZE_OF_TABL
+    tabl = bytearray(8 + tabl_size)
+    struct.pack_into('<4sI', tabl, 0, b'TABL', tabl_size)
+    spans = []
+    offset = header_size + len(tabl)
+    for index, (table_name, block) in enumerate(parts):
+        name_bytes = table_name.encode('ascii')[:7].ljust(8, b'\x00')
+        struct.pack_into('<8sI', tabl, 8 + index * SIZE_OF_TABL, name_bytes, offset)
+        spans.append((table_name, offset, offset + len(block)))
+        offset += len(block)
+    return tabl, spans
+
+
+def assemble_gxt(header, parts):
+    """
+    将文件头与各表块 [(表名, 表块)] 拼装为完整的 GXT 文件内容。
+    表块可以是 bytes/bytearray/memoryview，按给定顺序排列。
+    """
+    tabl, spans = _tabl_block(len(header), parts)
+    buf = bytearray(spans[-1][2] if spans else len(header) + len(tabl))
+    view = memoryview(buf)
+    view[:len(header)] = header
+    view[len(header):len(header) + len(tabl)] = tabl
+    for (_, start, end), (_, block) in zip(spans, parts):
+        view[start:end] = block
+    return buf
+
+
+def write_gxt(path, header, parts):
+    """与 assemble_gxt 相同，但直接按顺序写入文件（表块不再额外拷贝），返回各表的新范围"""
+    tabl, spans = _tabl_block(len(header), parts)
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(tabl)
+        for _, block in parts:
+            f.write(block)
+    return spans
+
+
+def table_fingerprint(entries):
+    """表内容指纹：所有 (键, 值) 拼接后整体哈希一次"""
+    data = '\x01'.join(f"{key}\x00{value}" for key, value in entries)
+    return hashlib.blake2b(data.encode('utf-8', errors='surrogatepass'), digest_size=16).digest()
+
+
+class GXTLayout:
+    """
+    打开 GXT 时记录的表布局（表名 -> 原文件中的字节范围）与各表内容指纹。
+    tables 为无参函数，返回原文件内容的 (表名, [(键, 值)]) 序列，与之后保存时用于比较的是同一种形式，
+    如 GXTColumns.iterTables（逐表生成条目列表）或 dict.items；
+    第一次需要指纹时才调用并逐表计算，打开文件时不为整份文档生成列表。
+    """
+
+    def __init__(self, path, version, spans, tables):
+        self.path = path
+        self.version = version
+        self.spans = list(spans)
+        self._tables = tables
+        self._fingerprints = None
+        self._stat = self._file_stat(path)
+
+    @property
+    def fingerprints(self):
+        if self._fingerprints is None:
+            self._fingerprints = {name: table_fingerprint(entries) for name, entries in self._tables()}
+            self._tables = None
+        return self._fingerprints
+
+    @classmethod
+    def capture(cls, path, version, table_spans, tables):
+        """
+        由 gta.gxt.GXTIndex 的 TableSpan 列表建立布局（tables 见类说明）。
+        表块范围无法确定（无 TABL、偏移与 TKEY 位置不符）时返回 None，只能完整重建。
+        """
+        spans = []
+        for span in table_spans:
+            if span.name is None:
+                return None
+            # 表块开头到 TKEY 数据：MAIN 为 TKEY 头 8 字节，其余表另有 8 字节表名
+            if span.tkey_offset - span.offset not in (8, 16):
+                return None
+            spans.append((span.name, span.offset, span.tdat_offset + span.tdat_size))
+        if not spans:
+            return None
+        return cls(path, version, spans, tables)
+
+    @staticmethod
+    def _file_stat(path):
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+
+    def is_current(self):
+        """原文件自打开后未被其他程序修改"""
+        try:
+            return self._file_stat(self.path) == self._stat
+        except OSError:
+            return False
+
+    def changed_tables(self, tables):
+        """
+        返回内容有变化的表名（按原文件顺序）。
+        表的集合发生变化（新增、删除、改名或存在不属于任何表的条目）时返回 None，需要完整重建。
+        """
+        if tables.get(None) or set(name for name in tables if name is not None) != set(self.fingerprints):
+            return None
+        if len(self.fingerprints) != len(self.spans):
+            return None
+        return [name for name, _, _ in self.spans
+                if table_fingerprint(tables[name]) != self.fingerprints[name]]
+
+    def save(self, blocks, tables, out_path=None):
+        """
+        增量重建：blocks 为重新编码的 {表名: 表块}，其余表从原文件 mmap 整块拷贝。
+        先写入目标目录下的临时文件再替换目标文件（默认为原文件）；
+        写回原文件时，布局与指纹随之更新为新文件的状态。
+        """
+        out_path = out_path or self.path
+        tmp_path = out_path + '.tmp'
+        try:
+            with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                source = memoryview(mm)
+                parts = None
+                try:
+                    tabl_pos = mm.find(b'TABL', 0, 8)
+                    if tabl_pos < 0:
+                        raise ValueError("原文件中找不到 TABL 块")
+                    parts = [(name, blocks[name] if name in blocks else source[start:end])
+                             for name, start, end in self.spans]
+                    spans = write_gxt(tmp_path, source[:tabl_pos], parts)
+                except BaseException as e:
+                    # 回溯中 write_gxt 等帧仍引用 source 的切片，先清除，
+                    # 否则释放 source、关闭 mmap 时抛出的 BufferError 会掩盖原异常
+                    traceback.clear_frames(e.__traceback__)
+                    raise
+                finally:
+                    # 释放对 mmap 的引用后才能关闭
+                    del parts
+                    source.release()
+            os.replace(tmp_path, out_path)
+        except BaseException:
+            # 写出失败时删除临时文件，目标文件保持不变
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        if os.path.abspath(out_path) == os.path.abspath(self.path):
+            self.spans = spans
+            for name in blocks:
+                self.fingerprints[name] = table_fingerprint(tables[name])
+            self._stat = self._file_stat(self.path)
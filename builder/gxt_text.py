@@ -0,0 +1,106 @@
+"""
+GXT 文本（TXT）的流式分词器，供各版本构建器与界面的版本自动识别共用
+
+逐行读取、只扫描一遍：按行首字符分派（';' 注释、'[' 表头，其余按第一个 '=' 切分为键值），
+不对整行做正则匹配，键名/表名的合法性由调用方按各版本规则校验。
+"""
+import re
+
+SECTION = 0  # (行号, SECTION, 表名, None)
+ENTRY = 1    # (行号, ENTRY, 键, 值)
+INVALID = 2  # (行号, INVALID, 整行, None)
+
+_VC_NAME = re.compile(r'[0-9A-Z_]{1,7}')
+_SA_SECTION = re.compile(r'[A-Z_]{1,7}')
+_IV_SECTION = re.compile(r'[0-9A-Za-z_]{1,7}')
+_CRC32_KEY = re.compile(r'[0-9A-Fa-f]{8}')
+
+
+class TextFormatError(ValueError):
+    """TXT 格式错误，消息带行号"""
+
+    def __init__(self, line_num, message, line=None):
+        self.line_num = line_num
+        self.line = line
+        text = f"第{line_num}行: {message}"
+        if line is not None:
+            text += f" - {line}"
+        super().__init__(text)
+
+
+def open_text(path):
+    """以 UTF-8 打开 TXT（自动跳过 BOM）"""
+    return open(path, 'r', encoding='utf-8-sig')
+
+
+def tokenize(lines, strip=True):
+    """
+    将文本行流切分为 (行号, 类型, 名称/键, 值)，跳过空行与 ';' 注释行。
+    strip 为 False 时只去掉行尾换行符（III 的值保留行尾空白）。
+    """
+    for line_num, line in enumerate(lines, 1):
+        line = line.strip() if strip else line.rstrip('\n')
+        if not line:
+            continue
+        first = line[0]
+        if first == ';':
+            continue
+        if first == '[':
+            if line[-1] == ']':
+                yield line_num, SECTION, line[1:-1], None
+            else:
+                yield line_num, INVALID, line, None
+            continue
+        key, sep, value = line.partition('=')
+        if sep:
+            yield line_num, ENTRY, key, value
+        else:
+            yield line_num, INVALID, line, None
+
+
+def token_line(kind, name, value):
+    """还原 token 对应的行文本（用于错误信息）"""
+    if kind == SECTION:
+        return f"[{name}]"
+    if kind == ENTRY:
+        return f"{name}={value}"
+    return name
+
+
+def detect_version(lines):
+    """
+    根据 TXT 内容推测 GXT 版本，只扫描一遍：
+    没有表头为 "III"；表名/键名符合 SA 规则为 "SA/IV"，其次依次判断 VC、IV；
+    只有 [MAIN] 表时按前 10 个键是否为 CRC32 区分 IV/SA；无法判断时返回 None。
+    """
+    sections = set()
+    vc_ok = sa_ok = iv_ok = True
+    key_samples = []
+    for _, kind, name, _ in tokenize(lines):
+        if kind == SECTION:
+            sections.add(name.lower())
+            vc_ok = vc_ok and _VC_NAME.fullmatch(name) is not None
+            sa_ok = sa_ok and _SA_SECTION.fullmatch(name) is not None
+            iv_ok = iv_ok and _IV_SECTION.fullmatch(name) is not None
+        elif kind == ENTRY:
+            if len(key_samples) < 10:
+                key_samples.append(name.strip())
+            vc_ok = vc_ok and _VC_NAME.fullmatch(name) is not None
+            if sa_ok or iv_ok:
+                crc = _CRC32_KEY.fullmatch(name) is not None
+                sa_ok = sa_ok and crc
+                iv_ok = iv_ok and crc
+
+    if not sections:
+        return "III"
+    if sa_ok:
+        return "SA/IV"
+    if vc_ok:
+        return "VC"
+    if iv_ok:
+        return "IV"
+    if sections == {"main"}:
+        if all(_CRC32_KEY.fullmatch(key) for key in key_samples if key):
+            return "IV"
+        return "SA"
+    return None
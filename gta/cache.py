@@ -0,0 +1,228 @@
+"""
+GXT 解析结果的磁盘缓存
+
+同一个 GXT 被反复打开时，直接从缓存读回解析结果，跳过版本识别、TABL 解析与逐表解码。
+缓存以 (路径, 大小, 修改时间, 内容哈希) 为键：缓存文件名由路径、大小与修改时间得出，
+文件头记录内容的 blake2b 摘要，读取时重新计算摘要核对，内容不一致即视为失效。
+
+缓存文件格式（小端）：
+    b'GXTC' | 格式版本 uint32 | 元数据长度 uint32 | 元数据（UTF-8 JSON，补齐到 8 字节）
+    | 表边界 int64[表数+1] | 文本起始 int64[条目数] | 文本结束 int64[条目数] | 键名数组 | 文本
+即 gta.gxt.GXTColumns 的各个数组原样写出：元数据为版本、编码、内容摘要、表名、键名数组的类型与各表的
+TableSpan；键名全为 ASCII 时以定长字节（S8）保存，文本为一段 UTF-8，偏移为字符偏移。
+读回时经 mmap 直接得到各数组（S8 键名保持字节形式，与读取器产出的一致），文本整段解码一次，不为每条文本创建字符串。
+
+缓存目录总大小超过上限时，按最近使用时间（缓存文件的修改时间，命中时更新）淘汰最旧的缓存。
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+import gta.gxt
+
+MAGIC = b'GXTC'
+FORMAT_VERSION = 2
+CACHE_SUFFIX = '.gxc'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+_HEADER = struct.Struct('<4sII')
+
+
+def defaultCacheDir():
+    """用户缓存目录（Windows 为 %LOCALAPPDATA%，其他系统为 $XDG_CACHE_HOME 或 ~/.cache）"""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') \
+        or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'SAGXTExtracter', 'parse')
+
+
+def contentDigest(path):
+    """文件内容的 blake2b 摘要（十六进制）"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                digest.update(data)
+    return digest.hexdigest()
+
+
+def _padding(size):
+    return b'\x00' * (-size % 8)
+
+
+def _keyBytes(keys):
+    """键名数组的存储形式：全为 ASCII 时转为定长字节（每个键名 8 字节而非 32 字节）"""
+    if keys.dtype.kind == 'S':
+        return keys
+    try:
+        return keys.astype(f'S{max(keys.itemsize // 4, 1)}')
+    except UnicodeEncodeError:
+        return keys.astype(keys.dtype.newbyteorder('<'))
+
+
+def encodeDocument(document, digest):
+    """将 GXTDocument 编码为缓存文件内容"""
+    columns = document.columns
+    keys = _keyBytes(columns.keys)
+    text = columns.text.encode('utf-8', errors='surrogatepass')
+    meta = json.dumps({
+        'version': document.version,
+        'encoding': document.encoding,
+        'digest': digest,
+        'tables': columns.names,
+        'spans': [list(span) for span in document.spans],
+        'key_dtype': keys.dtype.str,
+        'text_length': len(columns.text),
+    }, ensure_ascii=False).encode('utf-8')
+    return b''.join([
+        _HEADER.pack(MAGIC, FORMAT_VERSION, len(meta)), meta, _padding(_HEADER.size + len(meta)),
+        columns.bounds.astype('<i8').tobytes(), columns.starts.astype('<i8').tobytes(),
+        columns.ends.astype('<i8').tobytes(), keys.tobytes(), text,
+    ])
+
+
+def decodeDocument(data, digest=None):
+    """由缓存文件内容（bytes/mmap）还原 GXTDocument；格式不符或摘要不一致时返回 None"""
+    if len(data) < _HEADER.size:
+        return None
+    magic, format_version, meta_size = _HEADER.unpack_from(data)
+    if magic != MAGIC or format_version != FORMAT_VERSION:
+        return None
+    meta = json.loads(bytes(data[_HEADER.size:_HEADER.size + meta_size]).decode('utf-8'))
+    if digest is not None and meta['digest'] != digest:
+        return None
+    pos = _HEADER.size + meta_size + len(_padding(_HEADER.size + meta_size))
+
+    def take(dtype, count):
+        nonlocal pos
+        # 复制出 mmap，关闭缓存文件后数组仍然有效
+        array = np.frombuffer(data, dtype=dtype, count=count, offset=pos).copy()
+        pos += array.nbytes
+        return array
+
+    bounds = take('<i8', len(meta['tables']) + 1)
+    entry_count = int(bounds[-1])
+    starts = take('<i8', entry_count)
+    ends = take('<i8', entry_count)
+    key_dtype = np.dtype(meta['key_dtype'])
+    keys = take(key_dtype, entry_count)
+    text = str(data[pos:], 'utf-8', 'surrogatepass')
+    if len(text) != meta['text_length'] or (entry_count and (ends.max() > len(text) or starts.min() < 0)):
+        return None
+    columns = gta.gxt.GXTColumns(meta['tables'], bounds, keys, text, starts, ends)
+    spans = [gta.gxt.TableSpan(*span) for span in meta['spans']]
+    return gta.gxt.GXTDocument(meta['version'], encoding=meta['encoding'], spans=spans, columns=columns)
+
+
+class ParseCache:
+    """
+    GXT 解析结果的磁盘缓存（LRU）。
+    cache_dir 为空时使用 defaultCacheDir()；max_bytes 为缓存目录的大小上限；
+    auto_evict 为 False 时写入后不淘汰，由调用方在适当时机调用 evict()（如多个进程同时写入时）。
+    读写缓存失败（权限、磁盘已满、文件损坏等）时静默回退为正常解析，不影响打开文件。
+    """
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES, auto_evict=True):
+        self.cache_dir = cache_dir or defaultCacheDir()
+        self.max_bytes = max_bytes
+        self.auto_evict = auto_evict
+
+    def cachePath(self, path):
+        """由 (绝对路径, 大小, 修改时间) 得出缓存文件路径；返回 (缓存路径, stat 结果)"""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        name = hashlib.blake2b(f"{os.path.normcase(path)}|{st.st_size}|{st.st_mtime_ns}".encode('utf-8'),
+                               digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, name + CACHE_SUFFIX), st
+
+    def load(self, path, digest=None):
+        """读取缓存，未命中或已失效时返回 None；digest 为已算好的内容摘要（可省略）"""
+        try:
+            cache_path, _ = self.cachePath(path)
+            if not os.path.isfile(cache_path):
+                return None
+            if digest is None:
+                digest = contentDigest(path)
+            with open(cache_path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    document = decodeDocument(data, digest)
+            if document is None:
+                self._remove(cache_path)
+                return None
+            # 命中时更新修改时间，作为 LRU 的最近使用时间
+            os.utime(cache_path)
+            return document
+        except (OSError, ValueError, KeyError, TypeError, BufferError):
+            return None
+
+    def store(self, path, document, digest=None, stat=None):
+        """
+        写入缓存（先写临时文件再替换）并按上限淘汰旧缓存。
+        stat 为解析前取得的 os.stat 结果：解析期间文件已被修改时不写入。
+        """
+        try:
+            cache_path, st = self.cachePath(path)
+            if stat is not None and (stat.st_size, stat.st_mtime_ns) != (st.st_size, st.st_mtime_ns):
+                return False
+            data = encodeDocument(document, digest or contentDigest(path))
+            if len(data) > self.max_bytes:
+                return False
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = cache_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, cache_path)
+            if self.auto_evict:
+                self.evict()
+            return True
+        except OSError:
+            return False
+
+    def loadDocument(self, path, workers=None, processes=False, pool=None):
+        """有可用缓存时直接读回，否则解析文件（workers/processes/pool 同 gta.gxt.loadDocument）并写入缓存，返回 GXTDocument"""
+        st = os.stat(path)
+        digest = contentDigest(path)
+        document = self.load(path, digest)
+        if document is None:
+            document = gta.gxt.loadDocument(path, workers=workers, processes=processes, pool=pool)
+            self.store(path, document, digest, st)
+        return document
+
+    def entries(self):
+        """缓存目录中的缓存文件，返回 [(最近使用时间, 大小, 路径)]"""
+        result = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(CACHE_SUFFIX) and entry.is_file():
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            # 已被其他进程淘汰
+                            continue
+                        result.append((st.st_mtime_ns, st.st_size, entry.path))
+        except FileNotFoundError:
+            pass
+        return result
+
+    def evict(self, max_bytes=None):
+        """按最近使用时间从旧到新删除缓存，直到总大小不超过上限"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, cache_path in entries:
+            if total <= max_bytes:
+                break
+            if self._remove(cache_path):
+                total -= size
+
+    def clear(self):
+        self.evict(0)
+
+    def _remove(self, cache_path):
+        try:
+            os.remove(cache_path)
+            return True
+        except OSError:
+            return False
@@ -0,0 +1,165 @@
+"""
+GXT 批量提取命令行工具（无界面）
+
+与 GUI 的 gxt_processing 输出相同的目录布局：
+  - III：<输出目录>/<文件名>.txt
+  - VC/SA/IV：<输出目录>/<文件名>/<表名>.txt 分文本 + <输出目录>/<文件名>.txt 集成文本
+
+多个文件通过进程池并行解析，每个工作进程独立完成一次 parseDocument（getReader + parseTables/parseTKeyTDat）。
+单个大文件（如 SA）可用 -t 在文件内按表并行解码：默认为线程池；表解码主要是持有 GIL 的 Python 代码，
+加 -P 后改用进程池，所有文件共用同一个进程池并逐个处理，解码随核心数扩展（见 benchmarks.extract_scaling）。
+默认逐表解码并流式写出，内存占用以单个表为上限；--cache 启用磁盘缓存（gta.cache），
+再次提取未修改的文件时直接读回，但每个文件都要完整载入内存并写出缓存文件。
+
+用法（在仓库根目录执行）：
+    python -m gta.extract <目录|文件|通配符> [...] [-j 进程数] [-t 表解码线程/进程数] [-P] [-o 输出目录] [-r]
+                          [--cache [缓存目录]]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import gta.gxt
+from gta.cache import ParseCache
+
+
+def extractGXT(file_path, out_root=None, table_workers=None, cache=None, table_pool=None):
+    """
+    解析单个 GXT 并写出 TXT，返回统计信息字典。
+    out_root 为空时输出到 GXT 所在目录（与 GUI 行为一致）；table_workers > 1 时各表并行解码，
+    table_pool 为共用的进程池（或线程池）时在其中解码，否则每个文件临时使用线程池。
+    cache 为 ParseCache 时经缓存读取整个文档，否则逐表解码并流式写出。
+    """
+    gxt_name = os.path.splitext(os.path.basename(file_path))[0]
+    if out_root is None:
+        out_root = os.path.dirname(os.path.abspath(file_path))
+    start_time = time.perf_counter()
+    entry_count = 0
+
+    def counted(tables):
+        nonlocal entry_count
+        for table_name, entries in tables:
+            entry_count += len(entries)
+            yield table_name, entries
+
+    if cache is not None:
+        document = cache.loadDocument(file_path, workers=table_workers, pool=table_pool)
+        version, has_tables, table_count = document.version, document.hasTables(), document.columns.tableCount()
+        gta.gxt.writeTables(counted(document.columns.iterTables()), out_root, gxt_name, has_tables)
+    else:
+        # 逐表解码并流式写出，内存占用以单个表（或一批并行表）为上限
+        with gta.gxt.GXTIndex.open(file_path) as index:
+            version, has_tables, table_count = index.version, index.reader.hasTables(), len(index)
+            gta.gxt.writeTables(counted(index.iterTables(workers=table_workers, pool=table_pool)),
+                                out_root, gxt_name, has_tables)
+
+    return {
+        'path': file_path,
+        'version': version,
+        'size': os.path.getsize(file_path),
+        'tables': table_count if has_tables else 0,
+        'entries': entry_count,
+        'elapsed': time.perf_counter() - start_time,
+    }
+
+
+def collectGXTFiles(patterns, recursive=False):
+    """将目录/文件/通配符参数展开为去重后的 GXT 文件列表（保持输入顺序）"""
+    files = []
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            sub = os.path.join(pattern, '**', '*') if recursive else os.path.join(pattern, '*')
+            candidates = sorted(p for p in glob.glob(sub, recursive=recursive)
+                                if p.lower().endswith('.gxt') and os.path.isfile(p))
+        elif os.path.isfile(pattern):
+            candidates = [pattern]
+        else:
+            candidates = sorted(p for p in glob.glob(pattern, recursive=recursive) if os.path.isfile(p))
+        for path in candidates:
+            real = os.path.realpath(path)
+            if real not in seen:
+                seen.add(real)
+                files.append(path)
+    return files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="批量将 GXT 文件提取为 TXT 文本")
+    parser.add_argument('inputs', nargs='+', help="GXT 文件、目录或通配符")
+    parser.add_argument('-o', '--output', help="输出目录（默认与各 GXT 文件同目录）")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="并行处理文件的进程数（默认为 CPU 核心数）")
+    parser.add_argument('-t', '--table-workers', type=int, default=None,
+                        help="单个文件内并行解码表的线程数；-P 时为进程数（默认为 CPU 核心数）")
+    parser.add_argument('-P', '--table-processes', action='store_true',
+                        help="表解码使用进程池（所有文件共用一个，文件逐个处理，不能与 -j > 1 同时使用）")
+    parser.add_argument('-r', '--recursive', action='store_true', help="递归搜索目录")
+    parser.add_argument('--cache', nargs='?', const='', metavar='DIR',
+                        help="读写解析缓存（可指定缓存目录，默认为用户缓存目录）；整个文件载入内存，不再流式写出")
+    args = parser.parse_args(argv)
+    if args.table_processes:
+        if args.jobs is not None and args.jobs > 1:
+            parser.error("-P 与 -j > 1 不能同时使用")
+        args.jobs = 1
+        args.table_workers = args.table_workers or os.cpu_count() or 1
+    # 各工作进程写入缓存时不淘汰，全部完成后由主进程统一淘汰一次
+    cache = None if args.cache is None else ParseCache(args.cache or None, auto_evict=False)
+
+    files = collectGXTFiles(args.inputs, args.recursive)
+    if not files:
+        print("未找到 GXT 文件。", file=sys.stderr)
+        return 1
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+
+    jobs = max(1, min(args.jobs or os.cpu_count() or 1, len(files)))
+    failed = 0
+    total_bytes = 0
+    wall_start = time.perf_counter()
+
+    def report(result):
+        nonlocal total_bytes
+        total_bytes += result['size']
+        print(f"[{result['version']:>9}] {result['path']}: {result['tables']} 表, {result['entries']} 条, "
+              f"{result['size'] / 1048576:.2f} MB, {result['elapsed']:.3f}s")
+
+    if jobs == 1:
+        # -P：所有文件共用一个表解码进程池
+        table_pool = None
+        if args.table_processes and args.table_workers > 1:
+            table_pool = ProcessPoolExecutor(max_workers=args.table_workers)
+        try:
+            for path in files:
+                try:
+                    report(extractGXT(path, args.output, args.table_workers, cache, table_pool))
+                except Exception as e:
+                    failed += 1
+                    print(f"[   失败  ] {path}: {e}", file=sys.stderr)
+        finally:
+            if table_pool is not None:
+                table_pool.shutdown()
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(extractGXT, path, args.output, args.table_workers, cache): path for path in files}
+            for future in as_completed(futures):
+                try:
+                    report(future.result())
+                except Exception as e:
+                    failed += 1
+                    print(f"[   失败  ] {futures[future]}: {e}", file=sys.stderr)
+
+    if cache is not None:
+        cache.evict()
+    wall = time.perf_counter() - wall_start
+    mode = f"表解码 {args.table_workers} 进程" if args.table_processes else f"{jobs} 进程"
+    throughput = total_bytes / 1048576 / wall if wall > 0 else 0.0
+    print(f"完成 {len(files) - failed}/{len(files)} 个文件，共 {total_bytes / 1048576:.2f} MB，"
+          f"耗时 {wall:.3f}s，吞吐 {throughput:.2f} MB/s（{mode}）")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
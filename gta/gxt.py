@@ -1,78 +1,210 @@
 import struct
 import os
-import sys
 import mmap
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import repeat
+import threading
 import numpy as np
 
 # =======================
 # 极致优化版 GXT 解析（兼容IV版本生成格式）
 # =======================
 
-class III:
+def _locateTKeyTDat(stream):
+    """
+    从当前位置定位 TKEY 与 TDAT 数据区，返回 (tkey_offset, tkey_size, tdat_offset, tdat_size)，
+    返回后流位于 TDAT 数据区之后（即下一个表的起始处）。
+    """
+    tkey_size = findBlock(stream, 'TKEY')
+    tkey_offset = stream.tell()
+    stream.seek(tkey_size, os.SEEK_CUR)
+    tdat_size = findBlock(stream, 'TDAT')
+    tdat_offset = stream.tell()
+    stream.seek(tdat_size, os.SEEK_CUR)
+    return tkey_offset, tkey_size, tdat_offset, tdat_size
+
+def _readSpan(stream, offset, size):
+    stream.seek(offset, os.SEEK_SET)
+    return stream.read(size)
+
+def _splitUtf16(arr, starts, ends):
+    """
+    按码元索引 [starts[i], ends[i]) 把 UTF-16LE 数组切分为字符串列表。
+    不含代理项时整个 TDAT 只解码一次，码元索引即字符索引，逐条仅做一次切片；
+    含代理项（码元与字符不再一一对应）时退回逐条解码。
+    """
+    starts = starts.tolist()
+    ends = ends.tolist()
+    if not np.any((arr >= 0xD800) & (arr <= 0xDFFF)):
+        text = arr.tobytes().decode('utf-16le')
+        return [text[s:e] for s, e in zip(starts, ends)]
+    values = []
+    for s, e in zip(starts, ends):
+        if s >= e:
+            values.append("")
+            continue
+        values.append(arr[s:e].tobytes().decode('utf-16le', errors='ignore'))
+    return values
+
+# 十六进制数字表，下标为半字节的值
+_HEX_DIGITS = np.frombuffer(b'0123456789ABCDEF', dtype=np.uint8)
+_NIBBLE_SHIFTS = np.arange(28, -1, -4, dtype=np.uint32)
+
+def _hexKeys(crcs):
+    """
+    SA/IV 的 CRC 键名：uint32 数组按半字节查表写入一个 n×8 的字节缓冲区，
+    整体视为定长字节数组（S8），结果与逐条 f"{crc:08X}" 相同。
+    """
+    nibbles = (np.asarray(crcs, dtype=np.uint32)[:, None] >> _NIBBLE_SHIFTS) & 0xF
+    return _HEX_DIGITS[nibbles].view('S8').ravel()
+
+def _nameKeys(raw_keys):
+    """
+    III/VC 的 8 字节键名：第一个 \0 及之后的字节整体置零（定长字节数组会去掉末尾的 \0），
+    结果与逐条 k.split(b'\x00')[0].decode(errors='ignore') 相同。
+    全为 ASCII 时返回定长字节数组（S8），否则逐条解码为 Unicode 数组。
+    """
+    data = np.ascontiguousarray(raw_keys, dtype='S8').view(np.uint8).reshape(-1, 8)
+    data = np.where(np.logical_or.accumulate(data == 0, axis=1), np.uint8(0), data)
+    names = data.view('S8').ravel()
+    if len(data) and data.max() >= 0x80:
+        return np.array([name.decode(errors='ignore') for name in names.tolist()], dtype='<U8')
+    return names
+
+def _keyList(keys):
+    """键名数组（S8 或 Unicode）转为字符串列表"""
+    if keys.dtype.kind == 'S':
+        keys = keys.astype(f'<U{max(keys.itemsize, 1)}')
+    return keys.tolist()
+
+def _joinValues(values):
+    """将逐条解码的文本以 \0 连接为一个字符串，返回 (文本, 起始字符数组, 结束字符数组)"""
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    starts = np.zeros(len(values), dtype=np.int64)
+    if len(values) > 1:
+        np.cumsum(lengths[:-1] + 1, out=starts[1:])
+    return '\x00'.join(values), starts, starts + lengths
+
+class _Reader:
+    """
+    各版本读取器的公共流程：locateTable 负责定位，decodeTable 负责解码 TKEY/TDAT 数据。
+    indexTable/decodeKey/valueDecoder 供 LazyTable 使用：只建立键与文本范围数组，文本在访问时才解码。
+    decodeColumns 供 GXTColumns 使用：整个 TDAT 解码为一个字符串，各条文本只记录字符范围。
+    """
+    # TKEY 每项的结构（III/VC 为 4 字节偏移 + 8 字节键名，SA/IV 为 4 字节偏移 + 4 字节 CRC）
+    TKEY_DTYPE = np.dtype([('offset', '<u4'), ('key', 'S8')])
+    # TDAT 中每个字符单元的字节数（SA 为单字节编码）
+    CHAR_SIZE = 2
+
+    def locateTable(self, stream):
+        return _locateTKeyTDat(stream)
+
+    def indexTable(self, tkey_data, TDat):
+        """不解码文本，返回 (原始键数组, 各条文本在 TDAT 内的起始字节, 结束字节)"""
+        tkey_np = np.frombuffer(tkey_data, dtype=self.TKEY_DTYPE, count=len(tkey_data) // self.TKEY_DTYPE.itemsize)
+        unit_count = len(TDat) // self.CHAR_SIZE
+        units = np.frombuffer(TDat, dtype=np.uint8 if self.CHAR_SIZE == 1 else '<u2', count=unit_count)
+        starts = np.clip(tkey_np['offset'].astype(np.int64) // self.CHAR_SIZE, 0, unit_count)
+        zero_idx = np.flatnonzero(units == 0)
+        # 末尾追加数据区长度作为哨兵，没有终止符的条目取到末尾
+        ends = np.append(zero_idx, unit_count)[np.searchsorted(zero_idx, starts, side='left')]
+        return tkey_np['key'].copy(), starts * self.CHAR_SIZE, ends * self.CHAR_SIZE
+
+    def decodeKey(self, raw_key):
+        return raw_key.split(b'\x00')[0].decode(errors='ignore')
+
+    def encodeKey(self, key):
+        """将键名转换为原始键数组中的值，无效的键名返回 None"""
+        try:
+            raw_key = key.encode('ascii')
+        except UnicodeEncodeError:
+            return None
+        return raw_key if 0 < len(raw_key) <= 8 and b'\x00' not in raw_key else None
+
+    def encodeKeys(self, keys):
+        """批量转换键名，返回 (原始键数组, 有效掩码)；无效键名在数组中的值无意义"""
+        raw_keys = [self.encodeKey(key) for key in keys]
+        valid = np.array([raw_key is not None for raw_key in raw_keys], dtype=bool)
+        placeholder = self.TKEY_DTYPE['key'].type()
+        encoded = np.array([placeholder if raw_key is None else raw_key for raw_key in raw_keys],
+                           dtype=self.TKEY_DTYPE['key'])
+        return encoded, valid
+
+    def valueDecoder(self, TDat, starts, ends):
+        """返回按字节范围解码单条文本的函数，结果与 decodeTable 一致"""
+        return lambda start, end: str(TDat[start:end], 'utf-16le', 'ignore')
+
+    def keyArray(self, raw_keys):
+        """原始键数组批量转为键名数组：全为 ASCII 时为定长字节（S8），显示时才转为字符串（见 _keyList）"""
+        return _nameKeys(raw_keys)
+
+    def decodeText(self, TDat, starts, ends):
+        """
+        将 TDAT 解码为一个字符串，返回 (文本, 各条起始字符, 结束字符)，切片结果与 decodeTable 一致。
+        starts/ends 为 indexTable 得到的字节范围。
+        """
+        units = np.frombuffer(TDat, dtype='<u2', count=len(TDat) // 2)
+        starts, ends = starts // 2, ends // 2
+        if not np.any((units >= 0xD800) & (units <= 0xDFFF)):
+            # 码元与字符一一对应，码元索引即字符索引
+            return str(TDat[:len(units) * 2], 'utf-16le'), starts, ends
+        return _joinValues(_splitUtf16(units, starts, ends))
+
+    def decodeColumns(self, tkey_data, TDat):
+        """列式解码单个表，返回 (键名数组, 文本, 起始字符数组, 结束字符数组)"""
+        raw_keys, starts, ends = self.indexTable(tkey_data, TDat)
+        return (self.keyArray(raw_keys),) + self.decodeText(TDat, starts, ends)
+
+    def parseTKeyTDat(self, stream):
+        tkey_offset, tkey_size, tdat_offset, tdat_size = self.locateTable(stream)
+        end_pos = stream.tell()
+        tkey_data = _readSpan(stream, tkey_offset, tkey_size)
+        TDat = _readSpan(stream, tdat_offset, tdat_size)
+        stream.seek(end_pos, os.SEEK_SET)
+        return self.decodeTable(tkey_data, TDat)
+
+class III(_Reader):
     def hasTables(self):
         return False
 
     def parseTables(self, stream):
         return []
 
-    def parseTKeyTDat(self, stream):
+    def decodeTable(self, tkey_data, TDat):
         # III极速优化：一次性读取TKEY和TDAT，批量numpy分割+批量解码
-        size = findBlock(stream, 'TKEY')
-        if size == 0:
-            return []
-        entry_count = size // 12
+        entry_count = len(tkey_data) // 12
         if entry_count == 0:
             return []
-        tkey_data = stream.read(size)
         # III 假设结构为 (offset:uint32, key:8 bytes)
-        tkey_np = np.frombuffer(tkey_data, dtype=[('offset', '<u4'), ('key', 'S8')])
+        tkey_np = np.frombuffer(tkey_data, dtype=[('offset', '<u4'), ('key', 'S8')], count=entry_count)
         offsets = tkey_np['offset']
-        keys = [k.split(b'\x00')[0].decode(errors='ignore') for k in tkey_np['key']]
-        datSize = findBlock(stream, 'TDAT')
-        if datSize == 0:
-            return list(zip(keys, [""] * len(keys)))
-        TDat = stream.read(datSize)
-        if datSize == 0:
+        keys = _keyList(_nameKeys(tkey_np['key']))
+        if len(TDat) < 2:
             return list(zip(keys, [""] * len(keys)))
-        arr = np.frombuffer(TDat, dtype=np.uint16)
+        arr = np.frombuffer(TDat, dtype=np.uint16, count=len(TDat) // 2)
         zero_idx = np.where(arr == 0)[0]
         starts = offsets // 2
         starts = np.clip(starts, 0, len(arr))
         ends = np.searchsorted(zero_idx, starts, side='left')
         ends = np.where(ends < len(zero_idx), zero_idx[ends], len(arr))
-        values = []
-        for i in range(entry_count):
-            s = starts[i]
-            e = ends[i]
-            if s >= e:
-                values.append("")
-                continue
-            raw = arr[s:e].tobytes()
-            try:
-                v = raw.decode('utf-16le', errors='ignore')
-            except Exception:
-                v = ""
-            v = v.rstrip('\x00')
-            values.append(v)
+        values = _splitUtf16(arr, starts, ends)
         return list(zip(keys, values))
 
-class VC:
+class VC(_Reader):
     def hasTables(self):
         return True
 
     def parseTables(self, stream):
         return _parseTables(stream)
 
-    def parseTKeyTDat(self, stream):
-        size = findBlock(stream, 'TKEY')
-        entry_count = size // 12
-        tkey_data = stream.read(size)
-        tkey_np = np.frombuffer(tkey_data, dtype=[('offset', '<u4'), ('key', 'S8')])
+    def decodeTable(self, tkey_data, TDat):
+        entry_count = len(tkey_data) // 12
+        tkey_np = np.frombuffer(tkey_data, dtype=[('offset', '<u4'), ('key', 'S8')], count=entry_count)
         offsets = tkey_np['offset']
-        keys = [k.split(b'\x00')[0].decode(errors='ignore') for k in tkey_np['key']]
-        datSize = findBlock(stream, 'TDAT')
-        TDat = stream.read(datSize)
-        arr = np.frombuffer(TDat, dtype=np.uint16)
+        keys = _keyList(_nameKeys(tkey_np['key']))
+        arr = np.frombuffer(TDat, dtype=np.uint16, count=len(TDat) // 2)
         zero_idx = np.where(arr == 0)[0]
         starts = offsets // 2
         # safe handling for ends to avoid out-of-bounds indexing
@@ -81,78 +213,239 @@ class VC:
         mask = ends_idx < zero_idx.size
         ends[mask] = zero_idx[ends_idx[mask]]
         ends[~mask] = len(arr)
-        values = []
-        for i in range(entry_count):
-            raw = arr[starts[i]:ends[i]].tobytes()
-            try:
-                v = raw.decode('utf-16le', errors='ignore')
-            except Exception:
-                v = ""
-            idx = v.find('\x00')
-            if idx != -1:
-                v = v[:idx]
-            values.append(v)
+        values = _splitUtf16(arr, starts, ends)
         return list(zip(keys, values))
 
-class SA:
+def _decodeSAEntry(raw):
+    """
+    SA 单条文本的逐条回退解码（UTF-8 → GBK 转 cp1252 → cp1252），
+    返回 (文本, 实际使用的编码)：
+      - 整条是合法 UTF-8 时按 UTF-8 解码；
+      - 否则按 GBK 严格解码，且结果的每个字符都能用 cp1252 表示时（如 b'x\\xa1\\xa4y' → 'x·y'）记为 'gbk'；
+      - 其余按 cp1252 逐字节解码。GBK 中日韩文字无法转为 cp1252，
+        因此走此分支：b'\\xd6\\xd0\\xce\\xc4'（GBK 的“中文”）得到 'ÖÐÎÄ'，按 cp1252 保存时写回相同字节。
+    """
+    try:
+        return raw.decode('utf-8', errors='strict'), 'utf-8'
+    except UnicodeDecodeError:
+        try:
+            ansi_bytes = raw.decode('gbk', errors='strict').encode('cp1252', errors='strict')
+            return ansi_bytes.decode('cp1252', errors='replace'), 'gbk'
+        except UnicodeError:
+            return raw.decode('cp1252', errors='replace'), 'cp1252'
+
+def _hasUtf8Entry(data):
+    """
+    TDAT 中是否有以 \0 分隔、含非 ASCII 字节且整条是合法 UTF-8 的文本。
+    只对出现“多字节首字节后接续字节”的条目逐条试探，其余条目不可能是非 ASCII 的合法 UTF-8。
+    """
+    arr = np.frombuffer(data, dtype=np.uint8)
+    lead = np.flatnonzero((arr[:-1] >= 0xC2) & (arr[:-1] <= 0xF4) & ((arr[1:] & 0xC0) == 0x80))
+    if not len(lead):
+        return False
+    zero_idx = np.flatnonzero(arr == 0)
+    bounds = np.concatenate(([-1], zero_idx, [len(arr)])).tolist()
+    for k in np.unique(np.searchsorted(zero_idx, lead, side='left')).tolist():
+        try:
+            data[bounds[k] + 1:bounds[k + 1]].decode('utf-8', errors='strict')
+            return True
+        except UnicodeDecodeError:
+            pass
+    return False
+
+def _encodeCrcKey(key):
+    """SA/IV 的键名（8 位十六进制 CRC）转为 uint32，无效时返回 None"""
+    if not 0 < len(key) <= 8:
+        return None
+    try:
+        return int(key, 16)
+    except ValueError:
+        return None
+
+class SA(_Reader):
+    """
+    encoding：TDAT 文本编码，'utf-8' / 'gbk' / 'cp1252' / 'mixed'。
+    为 None 时由 GXTIndex 在首次解码前调用 detectEncoding，按 TABL 顺序取前 DETECT_SAMPLE_BYTES 字节的
+    TDAT 检测一次（打开索引时不读取文本），之后每个表按检测结果整体解码；
+    与检测结果不符的表逐条回退解码，结果不受影响。
+    """
+    TKEY_DTYPE = np.dtype([('offset', '<u4'), ('key', '<u4')])
+    CHAR_SIZE = 1
+    # 检测编码时最多逐条试探的非 ASCII 文本数
+    DETECT_SAMPLE_SIZE = 256
+    # 检测编码时最多读取的 TDAT 字节数
+    DETECT_SAMPLE_BYTES = 256 * 1024
+
+    def __init__(self, encoding=None):
+        self.encoding = encoding
+
     def hasTables(self):
         return True
 
     def parseTables(self, stream):
         return _parseTables(stream)
 
-    def parseTKeyTDat(self, stream):
+    def detectEncoding(self, tdat_blocks):
+        """
+        根据各表 TDAT 检测整个文件的编码（结果与逐条回退解码所走的分支一致）。
+        tdat_blocks 可以是惰性的迭代器，累计读取 DETECT_SAMPLE_BYTES 字节后即停止；
+        超出部分截断到最后一个 \0 处，不切开多字节字符。
+        """
+        found = set()
+        sampled = 0
+        remaining = self.DETECT_SAMPLE_BYTES
+        for TDat in tdat_blocks:
+            if remaining <= 0:
+                break
+            if len(TDat) > remaining:
+                data = bytes(TDat[:remaining])
+                data = data[:max(data.rfind(b'\x00'), 0)]
+            else:
+                data = bytes(TDat)
+            remaining -= len(TDat)
+            if data.isascii():
+                continue
+            try:
+                data.decode('utf-8', errors='strict')
+                found.add('utf-8')
+                continue
+            except UnicodeDecodeError:
+                pass
+            for raw in data.split(b'\x00'):
+                if raw.isascii():
+                    continue
+                found.add(_decodeSAEntry(raw)[1])
+                sampled += 1
+                if sampled >= self.DETECT_SAMPLE_SIZE:
+                    break
+            if sampled >= self.DETECT_SAMPLE_SIZE:
+                break
+        if not found:
+            return 'utf-8'  # 纯 ASCII
+        return found.pop() if len(found) == 1 else 'mixed'
+
+    def _bulkDecode(self, data):
+        """
+        整体解码 TDAT，返回 (文本, 所用编码)；无法保证与逐条解码结果一致时返回 (None, None)。
+        检测结果只来自文件开头的样本，按 cp1252/GBK 整体解码前须确认表中没有逐条解码会按 UTF-8 解码的文本。
+        """
+        if data.isascii():
+            return data.decode('ascii'), 'utf-8'
+        try:
+            return data.decode('utf-8', errors='strict'), 'utf-8'
+        except UnicodeDecodeError:
+            pass
+        if self.encoding not in ('cp1252', 'gbk') or _hasUtf8Entry(data):
+            return None, None
+        if self.encoding == 'cp1252':
+            return data.decode('cp1252', errors='replace'), 'cp1252'
+        if self.encoding == 'gbk':
+            try:
+                return data.decode('gbk', errors='strict').encode('cp1252', errors='strict').decode('cp1252', errors='replace'), 'gbk'
+            except UnicodeError:
+                pass
+        return None, None
+
+    def decodeKey(self, raw_key):
+        return f"{int(raw_key):08X}"
+
+    def keyArray(self, raw_keys):
+        return _hexKeys(raw_keys)
+
+    def encodeKey(self, key):
+        return _encodeCrcKey(key)
+
+    def valueDecoder(self, TDat, starts, ends):
+        """与 decodeTable 相同的规则：能整体解码的表按同一编码逐条解码，否则逐条回退"""
+        data = bytes(TDat)
+        arr = np.frombuffer(data, dtype=np.uint8)
+        aligned = bool(np.all((starts >= ends) | (starts == 0) | (arr[np.maximum(starts, 1) - 1] == 0))) \
+            if len(arr) else True
+        codec = self._bulkDecode(data)[1] if aligned else None
+        if codec == 'utf-8':
+            return lambda start, end: str(TDat[start:end], 'utf-8')
+        if codec == 'cp1252':
+            return lambda start, end: str(TDat[start:end], 'cp1252', 'replace')
+        if codec == 'gbk':
+            return lambda start, end: str(TDat[start:end], 'gbk').encode('cp1252').decode('cp1252', errors='replace')
+        return lambda start, end: _decodeSAEntry(TDat[start:end].tobytes())[0]
+
+    def decodeText(self, TDat, starts, ends):
+        data = bytes(TDat)
+        arr = np.frombuffer(data, dtype=np.uint8)
+        empty = starts >= ends
+        aligned = bool(np.all(empty | (starts == 0) | (arr[np.maximum(starts, 1) - 1] == 0))) if len(arr) else True
+        text, codec = self._bulkDecode(data) if aligned else (None, None)
+        if text is None:
+            return _joinValues(["" if s >= e else _decodeSAEntry(data[s:e])[0]
+                                for s, e in zip(starts.tolist(), ends.tolist())])
+        if codec == 'cp1252' or data.isascii():
+            # 单字节编码，字节偏移即字符偏移
+            return text, starts, np.where(empty, starts, ends)
+        if codec == 'utf-8':
+            # 字节偏移前的非续字节数即字符偏移
+            prefix = np.zeros(len(arr) + 1, dtype=np.int64)
+            np.cumsum((arr & 0xC0) != 0x80, out=prefix[1:])
+            char_starts = prefix[starts]
+            return text, char_starts, np.where(empty, char_starts, prefix[ends])
+        # GBK 等多字节编码：由各段长度得到每段在文本中的起始字符
+        lengths = np.fromiter(map(len, text.split('\x00')), dtype=np.int64)
+        segment_starts = np.zeros(len(lengths), dtype=np.int64)
+        np.cumsum(lengths[:-1] + 1, out=segment_starts[1:])
+        seg_idx = np.searchsorted(np.flatnonzero(arr == 0), starts, side='left')
+        char_starts = segment_starts[seg_idx]
+        return text, char_starts, np.where(empty, char_starts, char_starts + lengths[seg_idx])
+
+    def decodeTable(self, tkey_bytes, TDat):
         # SA极速优化：一次性读取TKEY和TDAT，批量分割，批量解码
-        size = findBlock(stream, 'TKEY')
-        if size == 0:
-            return []
-        entry_count = size // 8
+        entry_count = len(tkey_bytes) // 8
         if entry_count == 0:
             return []
-        tkey_bytes = stream.read(size)
-        tkey_np = np.frombuffer(tkey_bytes, dtype=np.uint32).reshape(-1, 2)
+        tkey_np = np.frombuffer(tkey_bytes, dtype=np.uint32, count=entry_count * 2).reshape(-1, 2)
         offsets = tkey_np[:, 0]
-        crcs = tkey_np[:, 1]
-        datSize = findBlock(stream, 'TDAT')
-        if datSize == 0:
-            keys = [f"{crc:08X}" for crc in crcs]
+        keys = _keyList(_hexKeys(tkey_np[:, 1]))
+        if len(TDat) == 0:
             return list(zip(keys, [""] * len(keys)))
-        TDat = stream.read(datSize)
-        if datSize == 0:
-            keys = [f"{crc:08X}" for crc in crcs]
-            return list(zip(keys, [""] * len(keys)))
-        arr = np.frombuffer(TDat, dtype=np.uint8)
+        data = bytes(TDat)
+        arr = np.frombuffer(data, dtype=np.uint8)
         zero_idx = np.where(arr == 0)[0]
-        starts = offsets
-        starts = np.clip(starts, 0, len(arr))
-        ends = np.searchsorted(zero_idx, starts, side='left')
-        ends = np.where(ends < len(zero_idx), zero_idx[ends], len(arr))
-        mv = memoryview(TDat)
-        values = []
-        for i in range(entry_count):
-            s = starts[i]; e = ends[i]
-            if s >= e:
-                values.append("")
-                continue
-            raw = mv[s:e]
-            try:
-                v = raw.tobytes().decode('utf-8', errors='strict')
-            except Exception:
-                try:
-                    gbk_bytes = raw.tobytes()
-                    ansi_bytes = gbk_bytes.decode('gbk', errors='strict').encode('cp1252', errors='replace')
-                    v = ansi_bytes.decode('cp1252', errors='replace')
-                except Exception:
-                    v = raw.tobytes().decode('cp1252', errors='replace')
-            v = v.rstrip('\x00')
-            values.append(v)
-        keys = [f"{crc:08X}" for crc in crcs]
+        starts = np.clip(offsets, 0, len(arr))
+        seg_idx = np.searchsorted(zero_idx, starts, side='left')
+        # 末尾追加数据区长度作为哨兵，没有终止符的条目取到末尾
+        ends = np.append(zero_idx, len(arr))[seg_idx]
+        empty = starts >= ends
+        # 所有条目都从某个 \0 之后（或数据区开头）开始时，才能按 \0 切分整体解码结果
+        aligned = bool(np.all(empty | (starts == 0) | (arr[np.maximum(starts, 1) - 1] == 0)))
+        text = self._bulkDecode(data)[0] if aligned else None
+        if text is not None:
+            segments = text.split('\x00')
+            values = [segments[k] for k in seg_idx.tolist()]
+            for i in np.flatnonzero(empty).tolist():
+                values[i] = ""
+        else:
+            values = []
+            for s, e in zip(starts.tolist(), ends.tolist()):
+                if s >= e:
+                    values.append("")
+                    continue
+                values.append(_decodeSAEntry(data[s:e])[0])
         return list(zip(keys, values))
 
-class IV:
+class IV(_Reader):
+    TKEY_DTYPE = np.dtype([('offset', '<u4'), ('key', '<u4')])
+
     def hasTables(self):
         return True
 
+    def decodeKey(self, raw_key):
+        return f"{int(raw_key):08X}"
+
+    def keyArray(self, raw_keys):
+        return _hexKeys(raw_keys)
+
+    def encodeKey(self, key):
+        return _encodeCrcKey(key)
+
     def parseTables(self, stream):
         # 检查是否存在 TABL，如果没有就直接 fallback 到 main
         peek = stream.peek(16)
@@ -160,15 +453,13 @@ class IV:
             return [("MAIN", 0)]
         return _parseTables(stream)
 
-    def parseTKeyTDat(self, stream):
+    def locateTable(self, stream):
         """
-        IV 版本解析：
+        IV 版本定位：
         - 非 MAIN 表块会有 8 字节表名前缀，MAIN 表没有表名。
         - findBlock(stream, 'TKEY') 会定位到 TKEY 的 header 之后（流位置在数据区开始）。
         - 这里要在定位 TKEY 之前判断是否需要跳过表名。
         """
-        import struct
-        
         # 先 peek 足够字节以判断当前位置是表名还是直接是 TKEY
         head = stream.peek(8)
         # 若已有至少4字节并且前4字节是 TKEY，则当前位置直接为 TKEY header（不应跳过）
@@ -206,26 +497,30 @@ class IV:
                 block_name = stream.read(4)
                 tkey_block_size = struct.unpack("<I", stream.read(4))[0]
 
+        tkey_offset = stream.tell()
+        stream.seek(tkey_block_size, os.SEEK_CUR)
+        tdat_block_size = findBlock(stream, 'TDAT')
+        tdat_offset = stream.tell()
+        stream.seek(tdat_block_size, os.SEEK_CUR)
+        return tkey_offset, tkey_block_size, tdat_offset, tdat_block_size
+
+    def decodeTable(self, tkey_bytes, TDat):
         # IV TKEY 每条 8 字节（4 字节偏移 + 4 字节 CRC/hash）
-        entry_count = int(tkey_block_size // 8)
+        entry_count = len(tkey_bytes) // 8
         if entry_count == 0:
             return []
 
-        # 读取 TKEY 数据并解析（小端 uint32）
-        tkey_bytes = stream.read(tkey_block_size)
-        tkey_np = np.frombuffer(tkey_bytes, dtype=np.uint32).reshape(-1, 2)
+        # 解析 TKEY 数据（小端 uint32）
+        tkey_np = np.frombuffer(tkey_bytes, dtype=np.uint32, count=entry_count * 2).reshape(-1, 2)
         offsets = tkey_np[:, 0].astype(np.int64)  # 字节偏移（相对于 TDAT 数据区起始 = 数据区第 0 字节）
-        crcs = tkey_np[:, 1]
+        keys = _keyList(_hexKeys(tkey_np[:, 1]))
 
-        # 读取 TDAT 块
-        tdat_block_size = findBlock(stream, 'TDAT')
-        TDat = stream.read(tdat_block_size)
         # 如果没有数据，则返回空字符串对应的条目
-        if tdat_block_size == 0 or len(TDat) == 0:
-            return [(f"{crc:08X}", "") for crc in crcs]
+        if len(TDat) < 2:
+            return [(key, "") for key in keys]
 
         # 将 TDAT 当作 UTF-16LE 的 uint16 数组处理（每 2 字节一个字符）
-        arr = np.frombuffer(TDat, dtype=np.uint16)
+        arr = np.frombuffer(TDat, dtype=np.uint16, count=len(TDat) // 2)
         tdat_char_len = len(arr)  # 字符（uint16 单位）长度
         zero_idx = np.where(arr == 0)[0]  # 终止符位置（字符索引）
 
@@ -233,35 +528,11 @@ class IV:
         starts = (offsets // 2).astype(np.int64)
         starts = np.clip(starts, 0, tdat_char_len)
 
-        # 查找每个 start 对应的第一个终止符索引
-        if zero_idx.size == 0:
-            # 没有任何终止符，全部取到末尾
-            ends = np.full_like(starts, tdat_char_len)
-        else:
-            ends_idx = np.searchsorted(zero_idx, starts, side='left')
-            ends = np.where(ends_idx < len(zero_idx), zero_idx[ends_idx], tdat_char_len)
-
-        # 批量解码并处理越界
-        values = []
-        for i in range(entry_count):
-            s = int(starts[i]); e = int(ends[i])
-            if s >= e or s >= tdat_char_len:
-                values.append(sys.intern(""))
-                continue
-            # 切片并转回字节再解码
-            try:
-                raw_bytes = arr[s:e].tobytes()
-            except Exception:
-                values.append(sys.intern(""))
-                continue
-            try:
-                v = raw_bytes.decode('utf-16le', errors='ignore')
-            except Exception:
-                v = ""
-            v = v.rstrip('\x00')
-            values.append(sys.intern(v))
+        # 查找每个 start 对应的第一个终止符索引；末尾追加数据区长度作为哨兵，没有终止符的条目取到末尾
+        ends = np.append(zero_idx, tdat_char_len)[np.searchsorted(zero_idx, starts, side='left')]
 
-        keys = [f"{crc:08X}" for crc in crcs]
+        # 整体解码一次后按索引切片
+        values = _splitUtf16(arr, starts, ends)
         return list(zip(keys, values))
 
 def parseTKeyTDat_common(stream, entry_size, key_format, value_encoding):
@@ -333,55 +604,44 @@ def findBlock(stream, block):
     在当前流位置向后查找 4 字节 magic（block），找到后将流定位到 magic 之后（即 header 后）
     并返回块数据大小（不含 magic+size 的 8 字节）。
     若未找到则抛出 ValueError。
-    说明：stream 必须实现 .tell(), .seek(), .peek(size) 和底层 mmap 可通过 stream._mmap 访问长度。
+    说明：优先在 stream._mmap（mmap/bytes，均支持 .find）上做原生子串查找；
+    普通文件对象则按块读取后查找，不再逐字节迭代。
     """
     block_bytes = block.encode('ascii')
     if len(block_bytes) != 4:
         raise ValueError("块标识必须为4字节 ASCII 字符串。")
 
-    # 试图使用底层 mmap 直接扫描以获得准确且高效的定位
-    # 要求 MemoryMappedFile 实现有 _mmap 属性（当前实现中存在）
-    try:
-        mmap_obj = stream._mmap
-    except AttributeError:
-        # 若没有 _mmap，则回退到基于 peek/seek 的逐字节查找
-        start_pos = stream.tell()
-        file_pos = start_pos
-        # 获取文件长度（尝试使用 seek/tell）
-        # 先定位到末尾获取长度
-        stream.seek(0, os.SEEK_END)
-        file_len = stream.tell()
-        stream.seek(start_pos, os.SEEK_SET)
-
-        while file_pos + 8 <= file_len:
-            stream.seek(file_pos, os.SEEK_SET)
-            head = stream.read(4)
-            if head == block_bytes:
-                # 读取 size（下一 4 字节 小端）
-                size_bytes = stream.read(4)
-                if len(size_bytes) < 4:
-                    raise ValueError(f"在 {file_pos} 找到 {block} 标志但无法读取大小（文件截断）。")
-                size = struct.unpack('<I', size_bytes)[0]
-                # 定位到数据区（magic+size 已被读过），即文件指针在数据区开始
-                return size
-            file_pos += 1
-        raise ValueError(f"GXT 文件中未找到 {block} 块（格式错误或文件截断）")
-
-    # 使用 mmap 的快速查找
     start = stream.tell()
-    file_len = len(mmap_obj)
-    pos = start
-    # 逐字节搜索，确保不会越界访问（需要至少 8 字节以读取 size）
-    while pos + 8 <= file_len:
-        if mmap_obj[pos:pos+4] == block_bytes:
-            # 直接从 mmap 中读取 size（小端 uint32）
-            size = struct.unpack_from('<I', mmap_obj, pos+4)[0]
+    buf = getattr(stream, '_mmap', None)
+    if buf is not None:
+        pos = buf.find(block_bytes, start)
+        # 需要至少 8 字节以读取 size
+        if pos != -1 and pos + 8 <= len(buf):
+            size = struct.unpack_from('<I', buf, pos + 4)[0]
             # 将流定位到 magic+size 后（即数据区起始）
             stream.seek(pos + 8, os.SEEK_SET)
             return size
-        pos += 1
+        raise ValueError(f"GXT 文件中未找到 {block} 块（格式错误或文件截断）")
 
-    # 未找到
+    # 无底层缓冲区：分块读取，块间保留 7 字节重叠以免 magic+size 跨块
+    chunk_size = 1 << 16
+    base = start
+    tail = b''
+    stream.seek(start, os.SEEK_SET)
+    while True:
+        chunk = stream.read(chunk_size)
+        data = tail + chunk
+        pos = data.find(block_bytes)
+        if pos != -1 and pos + 8 <= len(data):
+            size = struct.unpack_from('<I', data, pos + 4)[0]
+            stream.seek(base + pos + 8, os.SEEK_SET)
+            return size
+        if not chunk:
+            break
+        keep = min(len(data), 7)
+        base += len(data) - keep
+        tail = data[len(data) - keep:]
+    stream.seek(start, os.SEEK_SET)
     raise ValueError(f"GXT 文件中未找到 {block} 块（格式错误或文件截断）")
 
 def getVersion(stream):
@@ -446,16 +706,592 @@ def _parseTables(stream):
             Tables.append((table_name, offset))
     return Tables
 
+TableSpan = namedtuple('TableSpan', 'name offset tkey_offset tkey_size tdat_offset tdat_size')
+
+def _decodeFileSpan(path, reader, span, method='decodeTable'):
+    """进程池任务：在子进程中映射文件并解码单个表（reader 随任务传入以保留检测到的编码）"""
+    with MemoryMappedFile(path) as stream:
+        buf = stream._mmap
+        return getattr(reader, method)(buf[span.tkey_offset:span.tkey_offset + span.tkey_size],
+                                       buf[span.tdat_offset:span.tdat_offset + span.tdat_size])
+
+def _decodeRawSpan(reader, tkey_data, TDat, method='decodeTable'):
+    return getattr(reader, method)(tkey_data, TDat)
+
+class GXTIndex:
+    """
+    基于 TABL 偏移的随机访问索引。
+    构建时直接跳转到每个表的偏移处定位 TKEY/TDAT，并记录两者数据区在文件中的范围（TableSpan），
+    之后加载任意单个表只需读取该表自身的数据，无需顺序扫描其他表。
+    III 没有表，索引中唯一一项的表名为 None。
+    """
+    def __init__(self, stream, version=None):
+        if version is None:
+            version = getVersion(stream)
+            if not version:
+                raise ValueError("无法识别的 GXT 版本")
+        self.stream = stream
+        self.version = version
+        self.reader = getReader(version)
+        self.spans = []
+        self._by_name = {}
+        self.path = None
+        self._owns_stream = False
+        self._lock = threading.Lock()
+        self._build()
+
+    @classmethod
+    def open(cls, path):
+        """打开文件并建立索引，索引关闭时一并关闭文件"""
+        stream = MemoryMappedFile(path)
+        try:
+            index = cls(stream)
+        except Exception:
+            stream.close()
+            raise
+        index.path = path
+        index._owns_stream = True
+        return index
+
+    def _build(self):
+        stream = self.stream
+        if not self.reader.hasTables():
+            stream.seek(0)
+            self.spans.append(TableSpan(None, 0, *self.reader.locateTable(stream)))
+        else:
+            for table_name, offset in self.reader.parseTables(stream):
+                # 顺序位置（上一个表之后）作为偏移无效时的回退
+                sequential_pos = stream.tell()
+                try:
+                    stream.seek(offset)
+                    located = self.reader.locateTable(stream)
+                except ValueError:
+                    stream.seek(sequential_pos)
+                    located = self.reader.locateTable(stream)
+                self.spans.append(TableSpan(table_name, offset, *located))
+        for span in self.spans:
+            self._by_name.setdefault(span.name, span)
+
+    def detectEncoding(self):
+        """
+        单字节编码版本（SA）的文本编码：首次调用时由读取器按前若干表的 TDAT 抽样检测一次并保存在读取器上，
+        建立索引时不读取文本。其他版本返回 None。
+        """
+        reader = self.reader
+        if not hasattr(reader, 'detectEncoding'):
+            return None
+        if reader.encoding is None:
+            reader.encoding = reader.detectEncoding(self.viewSpan(span)[1] for span in self.spans)
+        return reader.encoding
+
+    def names(self):
+        return [span.name for span in self.spans]
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __contains__(self, table_name):
+        return table_name in self._by_name
+
+    def span(self, table_name):
+        try:
+            return self._by_name[table_name]
+        except KeyError:
+            raise KeyError(f"GXT 中不存在表：{table_name}") from None
+
+    def readSpan(self, span):
+        """读取表的原始 TKEY/TDAT 数据（基于 mmap/bytes 时直接切片，不改变流位置，可多线程并发调用）"""
+        buf = getattr(self.stream, '_mmap', None)
+        if buf is not None:
+            return (buf[span.tkey_offset:span.tkey_offset + span.tkey_size],
+                    buf[span.tdat_offset:span.tdat_offset + span.tdat_size])
+        with self._lock:
+            return (_readSpan(self.stream, span.tkey_offset, span.tkey_size),
+                    _readSpan(self.stream, span.tdat_offset, span.tdat_size))
+
+    def viewSpan(self, span):
+        """与 readSpan 相同，但基于 mmap 时返回零拷贝的 memoryview（关闭文件前须先 release）"""
+        buf = getattr(self.stream, '_mmap', None)
+        if buf is None:
+            return self.readSpan(span)
+        view = memoryview(buf)
+        try:
+            return (view[span.tkey_offset:span.tkey_offset + span.tkey_size],
+                    view[span.tdat_offset:span.tdat_offset + span.tdat_size])
+        finally:
+            view.release()
+
+    def loadTable(self, table_name):
+        """只读取并解码单个表，返回 [(key, value), ...]"""
+        self.detectEncoding()
+        return self.reader.decodeTable(*self.readSpan(self.span(table_name)))
+
+    def loadTables(self, names=None, workers=None, processes=False, pool=None):
+        """
+        解码多个表（默认全部），按 TABL 顺序返回 [(table_name, entries), ...]。
+        workers > 1 时并行解码：默认使用线程池共享同一个 mmap；
+        processes=True 时使用进程池，各进程自行映射同一文件（无文件路径时传递原始数据）。
+        pool 为调用方已有的线程池/进程池（如批量提取时多个文件共用一个进程池），传入时不再新建。
+        """
+        spans = self.spans if names is None else [self.span(name) for name in names]
+        return self._decodeSpans(spans, workers, processes, pool=pool)
+
+    def iterTables(self, workers=None, processes=False, pool=None):
+        """
+        逐个产出 (table_name, entries)，同一时刻只持有一个表的解码结果；
+        workers > 1 时每批并行解码 workers 个表，内存上限为一批。
+        整个迭代共用一个线程池/进程池（不再每批新建）；pool 为调用方已有的池时直接使用，迭代结束后不关闭。
+        """
+        if not workers or workers <= 1 or len(self.spans) <= 1:
+            for span in self.spans:
+                yield from self._decodeSpans([span])
+            return
+        with nullcontext(pool) if pool is not None else self._executor(workers, processes) as executor:
+            for i in range(0, len(self.spans), workers):
+                yield from self._decodeSpans(self.spans[i:i + workers], pool=executor)
+
+    def iterEntries(self):
+        """逐条产出 (table_name, key, value)"""
+        for table_name, entries in self.iterTables():
+            for key, value in entries:
+                yield table_name, key, value
+
+    @staticmethod
+    def _executor(workers, processes=False):
+        return ProcessPoolExecutor(max_workers=workers) if processes else ThreadPoolExecutor(max_workers=workers)
+
+    def _decodeSpans(self, spans, workers=None, processes=False, method='decodeTable', pool=None):
+        """
+        method 为读取器的解码方法名（decodeTable 或 decodeColumns）。
+        pool 为已有的线程池/进程池时在其中解码（是否跨进程由池的类型决定），否则按 workers/processes 临时新建。
+        """
+        # 先确定编码，进程池中的读取器随任务传入时已带有检测结果
+        self.detectEncoding()
+        decode = getattr(self.reader, method)
+        if len(spans) <= 1 or (pool is None and (not workers or workers <= 1)):
+            return [(span.name, decode(*self.readSpan(span))) for span in spans]
+        if pool is None:
+            with self._executor(min(workers, len(spans)), processes) as pool:
+                return self._decodeSpans(spans, method=method, pool=pool)
+        if isinstance(pool, ProcessPoolExecutor):
+            if self.path is not None:
+                results = pool.map(_decodeFileSpan, repeat(self.path), repeat(self.reader), spans, repeat(method))
+            else:
+                results = pool.map(_decodeRawSpan, repeat(self.reader), *zip(*map(self.readSpan, spans)),
+                                   repeat(method))
+        else:
+            results = pool.map(lambda span: decode(*self.readSpan(span)), spans)
+        return list(zip((span.name for span in spans), results))
+
+    def toColumns(self, workers=None, processes=False, pool=None):
+        """解码全部表为列式的 GXTColumns；workers/processes/pool 含义同 loadTables"""
+        return GXTColumns.concat(self._decodeSpans(self.spans, workers, processes, 'decodeColumns', pool))
+
+    def toDocument(self, workers=None, processes=False, pool=None):
+        columns = self.toColumns(workers=workers, processes=processes, pool=pool)
+        return GXTDocument(self.version, encoding=self.detectEncoding(), spans=self.spans, columns=columns)
+
+    def close(self):
+        if self._owns_stream:
+            self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+class GXTColumns:
+    """
+    列式存储的表数据，读取器直接产出，界面、搜索、码表转换、缓存与构建器共用：
+      names   各表表名（III 没有表，唯一一项为 None）
+      bounds  int64[表数+1]，第 t 个表的条目为 [bounds[t], bounds[t+1])
+      keys    全部键名（numpy 定长数组：读取器产出的 ASCII 键名为 S8 字节，显示时才转为字符串）
+      text    全部文本所在的一个字符串，starts/ends 为各条文本在其中的字符范围（int64）
+    文本只在访问时切片，不为每条文本单独保存 Python 字符串，也不再拼接整份 "键=值" 文本后重新拆分。
+    """
+    def __init__(self, names, bounds, keys, text, starts, ends):
+        self.names = list(names)
+        self.bounds = np.asarray(bounds, dtype=np.int64)
+        self.keys = keys
+        self.text = text
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+
+    @classmethod
+    def concat(cls, parts):
+        """由 [(table_name, (键名数组, 文本, 起始字符, 结束字符)), ...] 合并"""
+        names = [name for name, _ in parts]
+        bounds = np.zeros(len(parts) + 1, dtype=np.int64)
+        np.cumsum([len(keys) for _, (keys, _, _, _) in parts], out=bounds[1:])
+        # 各表文本之间以 \0 分隔，偏移按前面文本的总长平移
+        shifts = np.zeros(len(parts), dtype=np.int64)
+        if len(parts) > 1:
+            np.cumsum([len(text) + 1 for _, (_, text, _, _) in parts[:-1]], out=shifts[1:])
+        if not parts:
+            return cls(names, bounds, np.empty(0, dtype='S8'), "", [], [])
+        return cls(names, bounds,
+                   np.concatenate([keys for _, (keys, _, _, _) in parts]),
+                   '\x00'.join(text for _, (_, text, _, _) in parts),
+                   np.concatenate([starts + shift for (_, (_, _, starts, _)), shift in zip(parts, shifts)]),
+                   np.concatenate([ends + shift for (_, (_, _, _, ends)), shift in zip(parts, shifts)]))
+
+    @classmethod
+    def fromTables(cls, tables):
+        """由 [(table_name, [(key, value), ...]), ...] 构造"""
+        parts = []
+        for name, entries in tables:
+            keys = [key for key, _ in entries]
+            parts.append((name, (np.array(keys, dtype=str) if keys else np.empty(0, dtype='S8'),)
+                          + _joinValues([value for _, value in entries])))
+        return cls.concat(parts)
+
+    def __len__(self):
+        return int(self.bounds[-1])
+
+    def tableCount(self):
+        return len(self.names)
+
+    def key(self, i):
+        key = self.keys[i]
+        return key.decode('ascii') if isinstance(key, bytes) else str(key)
+
+    def keyList(self, index=slice(None)):
+        """按切片或序号数组取出的键名列表"""
+        return _keyList(self.keys[index])
+
+    def value(self, i):
+        return self.text[self.starts[i]:self.ends[i]]
+
+    def valueList(self, first=0, last=None):
+        """第 first 到 last 条的文本列表"""
+        text = self.text
+        last = len(self) if last is None else last
+        return [text[s:e] for s, e in zip(self.starts[first:last].tolist(), self.ends[first:last].tolist())]
+
+    def tableEntries(self, table_index):
+        """第 table_index 个表的 [(key, value), ...]"""
+        first, last = int(self.bounds[table_index]), int(self.bounds[table_index + 1])
+        return list(zip(self.keyList(slice(first, last)), self.valueList(first, last)))
+
+    def iterTables(self):
+        """逐个产出 (table_name, entries)，同一时刻只生成一个表的条目列表"""
+        for table_index, name in enumerate(self.names):
+            yield name, self.tableEntries(table_index)
+
+    def toTables(self):
+        return list(self.iterTables())
+
+class GXTDocument:
+    """
+    一次解析得到的 GXT 文档，供表格渲染与 TXT 导出共用，避免重复解析。
+    columns 为列式的 GXTColumns；也可传入 tables（[(table_name, [(key, value), ...]), ...]）构造。
+    tables 属性按需由 columns 生成列表；III 没有表，唯一一项的表名为 None。
+    encoding 为读取器检测到的文本编码（仅 SA 有意义），供构建器回写时沿用。
+    spans 为各表在文件中的 TableSpan，供保存时增量重建（builder.gxt_layout）。
+    """
+    def __init__(self, version, tables=None, encoding=None, spans=None, columns=None):
+        self.version = version
+        self.columns = columns if columns is not None else GXTColumns.fromTables(tables or [])
+        self.encoding = encoding
+        self.spans = spans or []
+
+    @property
+    def tables(self):
+        return self.columns.toTables()
+
+    def hasTables(self):
+        return self.version != 'III'
+
+    def entryCount(self):
+        return len(self.columns)
+
+    def tableText(self, table_name, entries):
+        """单个表的文本（与 gxt_processing 的分文本格式一致，末尾无换行）"""
+        lines = [f"{key}={value}" for key, value in entries]
+        if table_name is not None:
+            lines.insert(0, f"[{table_name}]")
+        return "\n".join(lines)
+
+    def toText(self):
+        """集成文本：III 为 key=value 列表，其他版本各表之间以空行分隔"""
+        return "\n\n".join(self.tableText(name, entries) for name, entries in self.columns.iterTables())
+
+    def writeText(self, out_root, gxt_name):
+        """
+        写出 TXT：III 仅输出 <gxt_name>.txt；其他版本额外输出 <gxt_name>/<表名>.txt 分文本。
+        返回集成文本路径。
+        """
+        return writeTables(self.columns.iterTables(), out_root, gxt_name, self.hasTables())
+
+class LazyTable:
+    """
+    按需解码的单个表：键与文本范围保存为 numpy 数组，TKEY/TDAT 直接引用 mmap（memoryview），
+    只有访问 table[i] / table.value(i) / table.get(key) 时才解码对应的文本，结果与 decodeTable 完全一致。
+    """
+    def __init__(self, name, reader, tkey_data, TDat):
+        self.name = name
+        self.reader = reader
+        self._tkey = tkey_data
+        self._tdat = TDat
+        self.raw_keys, self.starts, self.ends = reader.indexTable(tkey_data, TDat)
+        self._decode = None
+        self._sorted = None
+
+    def __len__(self):
+        return len(self.raw_keys)
+
+    def key(self, i):
+        return self.reader.decodeKey(self.raw_keys[i])
+
+    def value(self, i):
+        start, end = int(self.starts[i]), int(self.ends[i])
+        if start >= end:
+            return ""
+        if self._decode is None:
+            self._decode = self.reader.valueDecoder(self._tdat, self.starts, self.ends)
+        return self._decode(start, end)
+
+    def __getitem__(self, i):
+        """table[i] 返回 (key, value)，支持负数索引与切片"""
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("条目索引超出范围")
+        return self.key(i), self.value(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.key(i), self.value(i)
+
+    def keys(self):
+        return _keyList(self.reader.keyArray(self.raw_keys))
+
+    def sortedIndex(self):
+        """
+        返回 (排序后的原始键, 各项在表中的索引)，首次调用时建立并缓存。
+        原版 TKEY 通常已按 CRC/键名排序（游戏内按二分查找），此时直接沿用 TKEY 顺序，不再排序；
+        否则做稳定排序，重复键名仍以表中第一次出现的一项为准。
+        """
+        if self._sorted is None:
+            raw_keys = self.raw_keys
+            if len(raw_keys) < 2 or bool(np.all(raw_keys[1:] > raw_keys[:-1])):
+                self._sorted = (raw_keys, None)
+            else:
+                order = np.argsort(raw_keys, kind='stable')
+                self._sorted = (raw_keys[order], order)
+        return self._sorted
+
+    def findMany(self, keys):
+        """批量二分查找，返回各键名的索引数组（int64），不存在的为 -1"""
+        return self.findEncoded(*self.reader.encodeKeys(keys))
+
+    def findEncoded(self, encoded, valid):
+        """同 findMany，参数为 encodeKeys 的结果（跨表查找时只转换一次键名）"""
+        sorted_keys, order = self.sortedIndex()
+        if not len(sorted_keys):
+            return np.full(len(encoded), -1, dtype=np.int64)
+        pos = np.searchsorted(sorted_keys, encoded, side='left')
+        clipped = np.minimum(pos, len(sorted_keys) - 1)
+        found = valid & (pos < len(sorted_keys)) & (sorted_keys[clipped] == encoded)
+        index = clipped.astype(np.int64) if order is None else order[clipped].astype(np.int64)
+        return np.where(found, index, -1)
+
+    def find(self, key):
+        """键名第一次出现的索引（二分查找），不存在时返回 -1"""
+        return int(self.findMany([key])[0])
+
+    def get(self, key, default=None):
+        i = self.find(key)
+        return default if i < 0 else self.value(i)
+
+    def getMany(self, keys, default=None):
+        return [default if i < 0 else self.value(i) for i in self.findMany(keys).tolist()]
+
+    def release(self):
+        """释放对 mmap 的引用"""
+        for buf in (self._tkey, self._tdat):
+            if isinstance(buf, memoryview):
+                buf.release()
+        self._decode = None
+
+class LazyDocument:
+    """
+    基于 GXTIndex 的惰性文档：打开时只建立表索引，doc[table_name] 首次访问时才为该表建立
+    键与偏移数组（LazyTable），文本在 doc[table_name][i] 或 doc.get(key) 时逐条解码。
+    适合每次只显示一屏的界面或只读取少数键的流程；未访问的文本不产生任何 Python 字符串。
+    """
+    def __init__(self, index):
+        self.index = index
+        self.version = index.version
+        self._tables = {}
+
+    @classmethod
+    def open(cls, path):
+        return cls(GXTIndex.open(path))
+
+    @property
+    def encoding(self):
+        return self.index.detectEncoding()
+
+    def hasTables(self):
+        return self.version != 'III'
+
+    def names(self):
+        return self.index.names()
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, table_name):
+        return table_name in self.index
+
+    def __iter__(self):
+        return iter(self.names())
+
+    def __getitem__(self, table_name):
+        """III 没有表，表名用 None"""
+        table = self._tables.get(table_name)
+        if table is None:
+            self.index.detectEncoding()
+            table = LazyTable(table_name, self.index.reader, *self.index.viewSpan(self.index.span(table_name)))
+            self._tables[table_name] = table
+        return table
+
+    def get(self, key, default=None, table=None):
+        """按键名取文本；未指定 table 时按 TABL 顺序在各表中查找"""
+        return self.getMany([key], default, table)[0]
+
+    def _locate(self, keys, table=None):
+        """
+        逐表产出 (table_name, 键名位置数组, 表内索引数组)。每个表建立一次排序索引后按二分查找；
+        未指定 table 时按 TABL 顺序查找，只有前面的表中找不到的键名才会在后面的表中继续查找。
+        """
+        encoded, valid = self.index.reader.encodeKeys(keys)
+        pending = np.flatnonzero(valid)
+        for table_name in (self.names() if table is None else [table]):
+            if not len(pending):
+                break
+            found = self[table_name].findEncoded(encoded[pending], valid[pending])
+            hit = found >= 0
+            yield table_name, pending[hit], found[hit]
+            pending = pending[~hit]
+
+    def locateMany(self, keys, table=None):
+        """批量定位键名，返回 [(table_name, index) 或 None, ...]"""
+        keys = list(keys)
+        located = [None] * len(keys)
+        for table_name, positions, found in self._locate(keys, table):
+            for i, index in zip(positions.tolist(), found.tolist()):
+                located[i] = (table_name, index)
+        return located
+
+    def getMany(self, keys, default=None, table=None):
+        """批量按键名取文本，找不到的为 default"""
+        keys = list(keys)
+        values = [default] * len(keys)
+        for table_name, positions, found in self._locate(keys, table):
+            value = self[table_name].value
+            for i, index in zip(positions.tolist(), found.tolist()):
+                values[i] = value(index)
+        return values
+
+    def entryCount(self):
+        return sum(len(self[table_name]) for table_name in self.names())
+
+    def toDocument(self):
+        """完整解码为 GXTDocument"""
+        return self.index.toDocument()
+
+    def close(self):
+        for table in self._tables.values():
+            table.release()
+        self._tables.clear()
+        self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+def writeTables(tables, out_root, gxt_name, has_tables=True):
+    """
+    流式写出 TXT（格式与 GXTDocument.tableText/toText 完全一致）。
+    tables 可以是逐个产出 (table_name, entries) 的生成器（如 GXTIndex.iterTables），
+    每条直接写入带缓冲的文件句柄，不拼接整份文本，峰值内存只取决于单个表。
+    返回集成文本路径。
+    """
+    txt_path = os.path.join(out_root, f"{gxt_name}.txt")
+    gxt_dir = os.path.join(out_root, gxt_name)
+    if has_tables:
+        os.makedirs(gxt_dir, exist_ok=True)
+    with open(txt_path, 'w', encoding='utf-8', buffering=1 << 20) as output_file:
+        first_line = True
+        for table_index, (table_name, entries) in enumerate(tables):
+            if table_index:
+                output_file.write("\n\n")
+                first_line = True
+            table_file = None
+            if has_tables:
+                table_file = open(os.path.join(gxt_dir, f"{table_name}.txt"), 'w', encoding='utf-8', buffering=1 << 16)
+            try:
+                if table_name is not None:
+                    header = f"[{table_name}]"
+                    output_file.write(header)
+                    if table_file is not None:
+                        table_file.write(header)
+                    first_line = False
+                for key, value in entries:
+                    line = f"{key}={value}" if first_line else f"\n{key}={value}"
+                    first_line = False
+                    output_file.write(line)
+                    if table_file is not None:
+                        table_file.write(line)
+            finally:
+                if table_file is not None:
+                    table_file.close()
+    return txt_path
+
+def parseDocument(stream, version=None, workers=None):
+    """
+    从流中完整解析 GXT（按 TABL 偏移逐表定位），返回 GXTDocument；version 为空时自动检测。
+    workers > 1 时各表在线程池中并行解码。
+    """
+    return GXTIndex(stream, version).toDocument(workers=workers)
+
+def loadDocument(path, workers=None, processes=False, pool=None):
+    """打开 GXT 文件并解析为 GXTDocument；workers/processes/pool 含义同 GXTIndex.loadTables"""
+    with GXTIndex.open(path) as index:
+        return index.toDocument(workers=workers, processes=processes, pool=pool)
+
 class MemoryMappedFile:
     """轻量化的 mmap 读取包装，提供 read/seek/peek/tell"""
     def __init__(self, filename):
         if not os.path.exists(filename):
             raise FileNotFoundError(f"文件不存在：{filename}")
         self._file = open(filename, 'rb')
-        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if os.fstat(self._file.fileno()).st_size == 0:
+            # 空文件无法 mmap，使用空 bytes 代替（同样支持 find/切片）
+            self._mmap = b''
+        else:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
         self._pos = 0
 
-    def read(self, size):
+    @classmethod
+    def fromBytes(cls, data):
+        """以内存中的 bytes/bytearray/memoryview 构造同接口的读取对象"""
+        obj = cls.__new__(cls)
+        obj._file = None
+        obj._mmap = data if isinstance(data, bytes) else bytes(data)
+        obj._pos = 0
+        return obj
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = len(self._mmap) - self._pos
         if size <= 0:
             return b''
         end_pos = min(self._pos + size, len(self._mmap))
@@ -481,8 +1317,10 @@ class MemoryMappedFile:
         return self._pos
 
     def close(self):
-        self._mmap.close()
-        self._file.close()
+        if isinstance(self._mmap, mmap.mmap):
+            self._mmap.close()
+        if self._file is not None:
+            self._file.close()
 
     def __enter__(self):
         return self
@@ -4,6 +4,8 @@ import tempfile
 from PyQt6.QtWidgets import QFileDialog, QMessageBox, QApplication, QDialog, QLabel
 from PyQt6.QtCore import Qt
 
+from master.gxt_table_model import isSectionKey
+
 def convert_using_table(viewer):
     """修改为挂载码表功能"""
     try:
@@ -115,54 +117,47 @@ def swap_and_decode(text):
         return text
 
 
+def translation_table(mapping):
+    """
+    将码表映射转换为 str.translate 使用的字典，查找优先级与逐字符匹配一致：
+    先按字符本身匹配，其次按码位的小写四位十六进制、大写四位十六进制匹配。
+    """
+    table = {}
+    hex_keys = []
+    for key, replacement in mapping.items():
+        if len(key) == 1:
+            continue
+        try:
+            code = int(key, 16)
+        except ValueError:
+            continue
+        hex_keys.append((key, code, replacement))
+    for key, code, replacement in hex_keys:
+        if key == f"{code:04X}":
+            table[code] = replacement
+    for key, code, replacement in hex_keys:
+        if key == f"{code:04x}":
+            table[code] = replacement
+    for key, replacement in mapping.items():
+        if len(key) == 1:
+            table[ord(key)] = replacement
+    return table
+
+
+def convert_table_values(viewer, mapping):
+    """按码表逐行转换表格中的值（表名行不变），直接以键/值列表更新表格"""
+    table = translation_table(mapping)
+    model = viewer.output_table.gxtModel()
+    keys = list(model.keys())
+    values = [value if isSectionKey(key) else value.translate(table) for key, value in zip(keys, model.values())]
+    viewer.display_gxt_content_in_table((keys, values))
+
+
 def process_forward_conversion(viewer):
     """正向转换：码表字符转Unicode字符"""
     try:
-        # 创建反向映射表（码表字符 -> Unicode字符）
-        reverse_mapping = {v: k for k, v in viewer.mounted_table.items()}
-        
-        # 获取当前表格内容
-        content_lines = []
-        for row in range(viewer.output_table.rowCount()):
-            key_item = viewer.output_table.item(row, 0)
-            value_item = viewer.output_table.item(row, 1)
-            
-            if key_item and value_item:
-                key = key_item.text()
-                value = value_item.text()
-                
-                if key.startswith('[') and key.endswith(']'):
-                    # Section行保持不变
-                    content_lines.append(key)
-                else:
-                    # Value行进行正向转换（码表字符 -> Unicode字符）
-                    converted_value = ""
-                    for char in value:
-                        # 先尝试直接匹配
-                        if char in reverse_mapping:
-                            converted_value += reverse_mapping[char]
-                        else:
-                            # 尝试十六进制小写格式匹配
-                            hex_lower = f"{ord(char):04x}"
-                            if hex_lower in reverse_mapping:
-                                converted_value += reverse_mapping[hex_lower]
-                            else:
-                                # 尝试十六进制大写格式匹配
-                                hex_upper = hex_lower.upper()
-                                if hex_upper in reverse_mapping:
-                                    converted_value += reverse_mapping[hex_upper]
-                                else:
-                                    # 如果都没有匹配，保留原字符
-                                    converted_value += char
-                    content_lines.append(f"{key}={converted_value}")
-        
-        # 更新表格显示
-        content_str = "\n".join(content_lines)
-        viewer.display_gxt_content_in_table(content_str)
-        
-        # 更新内部状态
-        viewer.parsed_content = content_str
-        
+        # 反向映射表（码表字符 -> Unicode字符）
+        convert_table_values(viewer, {v: k for k, v in viewer.mounted_table.items()})
     except Exception as e:
         QMessageBox.critical(viewer, viewer.tr("错误"), viewer.tr("正向转换时出错: ") + str(e))
 
@@ -170,47 +165,6 @@ def process_forward_conversion(viewer):
 def process_reverse_conversion(viewer):
     """反向转换：Unicode字符转码表字符"""
     try:
-        # 获取当前表格内容
-        content_lines = []
-        for row in range(viewer.output_table.rowCount()):
-            key_item = viewer.output_table.item(row, 0)
-            value_item = viewer.output_table.item(row, 1)
-            
-            if key_item and value_item:
-                key = key_item.text()
-                value = value_item.text()
-                
-                if key.startswith('[') and key.endswith(']'):
-                    # Section行保持不变
-                    content_lines.append(key)
-                else:
-                    # Value行进行反向转换（Unicode字符 -> 码表字符）
-                    converted_value = ""
-                    for char in value:
-                        # 先尝试直接匹配
-                        if char in viewer.mounted_table:
-                            converted_value += viewer.mounted_table[char]
-                        else:
-                            # 尝试小写十六进制匹配
-                            hex_lower = f"{ord(char):04x}"
-                            if hex_lower in viewer.mounted_table:
-                                converted_value += viewer.mounted_table[hex_lower]
-                            else:
-                                # 尝试大写十六进制匹配
-                                hex_upper = hex_lower.upper()
-                                if hex_upper in viewer.mounted_table:
-                                    converted_value += viewer.mounted_table[hex_upper]
-                                else:
-                                    # 如果都没有匹配，保留原字符
-                                    converted_value += char
-                    content_lines.append(f"{key}={converted_value}")
-        
-        # 更新表格显示
-        content_str = "\n".join(content_lines)
-        viewer.display_gxt_content_in_table(content_str)
-        
-        # 更新内部状态
-        viewer.parsed_content = content_str
-        
+        convert_table_values(viewer, viewer.mounted_table)
     except Exception as e:
         QMessageBox.critical(viewer, viewer.tr("错误"), viewer.tr("反向转换时出错: ") + str(e))
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""
+表格搜索的三元组（trigram）倒排索引
+
+每行的键与值（小写，以 '\\0' 分隔）拼接成一份语料，按码位切出所有三元组，
+排序去重后得到 三元组 -> 行号 的倒排表。子串查询取各三元组倒排表的交集作为候选行，
+再对候选行做一次精确比对；不足三个字符的查询直接在码位数组上做向量化匹配。
+
+各行的小写文本不单独保存，精确比对时从语料中按行切片。
+索引只需在文档载入后构建一次（可在后台线程完成）；单元格被编辑时通过 updateRow
+登记为脏行，查询时对脏行按当前文本重新比对，行数发生变化时需重建索引。
+"""
+import numpy as np
+
+_SEP = '\x00'
+
+
+def _rowText(key, value):
+    return f"{key}{_SEP}{value}".lower()
+
+
+def _codes(text, compact=False):
+    """码位数组；compact 为 True 且全部码位在基本多文种平面内时使用 uint16 保存"""
+    codes = np.frombuffer(text.encode('utf-32-le', errors='surrogatepass'), dtype=np.uint32)
+    if compact and (not len(codes) or codes.max() < 0x10000):
+        return codes.astype(np.uint16)
+    return codes
+
+
+def _packTrigrams(codes):
+    """将相邻三个码位打包为一个 uint64（每个码位 21 位）"""
+    a = codes[:-2].astype(np.uint64)
+    b = codes[1:-1].astype(np.uint64)
+    c = codes[2:].astype(np.uint64)
+    return (a << np.uint64(42)) | (b << np.uint64(21)) | c
+
+
+def scanRows(text, keys, values):
+    """无索引时的线性子串搜索（忽略大小写），返回匹配的行号数组"""
+    needle = text.lower()
+    return np.fromiter((row for row, (key, value) in enumerate(zip(keys, values))
+                        if needle in key.lower() or needle in value.lower()), dtype=np.int64)
+
+
+def regexRows(pattern, keys, values):
+    """正则搜索，返回键或值匹配的行号数组"""
+    search = pattern.search
+    return np.fromiter((row for row, (key, value) in enumerate(zip(keys, values))
+                        if search(key) is not None or search(value) is not None), dtype=np.int64)
+
+
+class TrigramIndex:
+    """
+    键/值子串搜索索引。
+    keys/values 为并行序列（与 GXTTableModel 一致），search 返回升序的匹配行号数组。
+    """
+
+    def __init__(self, keys, values):
+        texts = [_rowText(key, value) for key, value in zip(keys, values)]
+        self._row_count = len(texts)
+        # 被编辑过的行：{行号: 当前小写文本}
+        self._dirty = {}
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        # 每行在语料中的起始、结束位置（行间以 '\0' 分隔）
+        self._starts = np.zeros(len(texts), dtype=np.int64)
+        if len(lengths) > 1:
+            np.cumsum(lengths[:-1] + 1, out=self._starts[1:])
+        self._ends = self._starts + lengths
+        self._corpus = _SEP.join(texts)
+        del texts, lengths
+        self._codes = _codes(self._corpus, compact=True)
+
+        if len(self._codes) < 3:
+            self._grams = np.empty(0, dtype=np.uint64)
+            self._offsets = np.zeros(1, dtype=np.int64)
+            self._postings = np.empty(0, dtype=np.int32)
+            return
+
+        codes = self._codes
+        # 跨越分隔符的三元组不可能出现在查询中，直接丢弃
+        positions = np.flatnonzero((codes[:-2] != 0) & (codes[1:-1] != 0) & (codes[2:] != 0))
+        grams = _packTrigrams(codes)[positions]
+        rows = np.searchsorted(self._starts, positions, side='right') - 1
+
+        # 稳定排序后同一三元组内行号仍为升序，去掉相邻重复的 (三元组, 行)
+        order = np.argsort(grams, kind='stable')
+        grams = grams[order]
+        rows = rows[order]
+        keep = np.ones(len(grams), dtype=bool)
+        keep[1:] = (grams[1:] != grams[:-1]) | (rows[1:] != rows[:-1])
+        grams = grams[keep]
+
+        self._grams, first = np.unique(grams, return_index=True)
+        self._offsets = np.append(first, len(grams)).astype(np.int64)
+        self._postings = rows[keep].astype(np.int32)
+
+    def __len__(self):
+        return self._row_count
+
+    def _text(self, row):
+        text = self._dirty.get(row)
+        if text is None:
+            text = self._corpus[self._starts[row]:self._ends[row]]
+        return text
+
+    def updateRow(self, row, key, value):
+        """单元格被编辑后更新该行文本，倒排表不变，查询时对该行重新比对"""
+        self._dirty[row] = _rowText(key, value)
+
+    def _postingsFor(self, gram):
+        pos = np.searchsorted(self._grams, gram)
+        if pos >= len(self._grams) or self._grams[pos] != gram:
+            return self._postings[:0]
+        return self._postings[self._offsets[pos]:self._offsets[pos + 1]]
+
+    def _shortQuery(self, needle):
+        """一到两个字符的查询：直接在码位数组上比较"""
+        query = _codes(needle)
+        codes = self._codes
+        if len(codes) < len(query):
+            return np.empty(0, dtype=np.int64)
+        mask = codes[:len(codes) - len(query) + 1] == query[0]
+        for i in range(1, len(query)):
+            mask &= codes[i:len(codes) - len(query) + 1 + i] == query[i]
+        positions = np.flatnonzero(mask)
+        rows = np.unique(np.searchsorted(self._starts, positions, side='right') - 1)
+        if not self._dirty:
+            return rows
+        # 脏行的码位已过期，改为按当前文本比对
+        dirty = np.fromiter(self._dirty, dtype=np.int64)
+        rows = np.setdiff1d(rows, dirty, assume_unique=True)
+        matched = np.fromiter((row for row, text in self._dirty.items() if needle in text), dtype=np.int64)
+        return np.union1d(rows, matched)
+
+    def search(self, text):
+        """忽略大小写的子串搜索，返回升序行号数组"""
+        needle = text.lower()
+        if not needle:
+            return np.arange(self._row_count, dtype=np.int64)
+        if _SEP in needle:
+            return np.empty(0, dtype=np.int64)
+        if len(needle) < 3:
+            return self._shortQuery(needle)
+
+        # 按倒排表长度从短到长求交集
+        grams = np.unique(_packTrigrams(_codes(needle)))
+        lists = sorted((self._postingsFor(gram) for gram in grams), key=len)
+        candidates = lists[0]
+        for postings in lists[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, postings, assume_unique=True)
+        if self._dirty:
+            candidates = np.union1d(candidates, np.fromiter(self._dirty, dtype=np.int64))
+
+        text = self._text
+        return np.fromiter((row for row in candidates.tolist() if needle in text(row)), dtype=np.int64)
@@ -0,0 +1,576 @@
+"""
+GXT 表格的 Model/View 实现
+
+键、值分别保存在两个并行序列中，由 QAbstractTableModel 按需提供给视图，
+打开文件时不再为每个单元格创建 QTableWidgetItem，Qt 对象数量只与可见行数相关。
+表名行以 "[表名]" 形式保存在键序列中，对应值为空字符串。
+
+打开 GXT 时模型直接引用读取器产出的列式数据（gta.gxt.GXTColumns），两个序列为 ColumnSequence：
+单元格文本在访问时才从文本缓冲区切片，编辑的单元格记录在覆盖表中；
+插入或删除行时才转换为普通列表。
+
+搜索过滤通过 RowFilterProxyModel 完成：过滤结果是一组源行号，代理模型只做行号映射，
+不再逐行调用 setRowHidden。
+
+GXTTableView 在 QTableView 之上保留了主界面及 master/ 模块用到的 QTableWidget 接口
+（rowCount/item/setText/insertRow/removeRow/setCellWidget 等），便于沿用原有调用方式；
+这些接口中的行号始终指源模型的行号，与当前过滤状态无关。
+"""
+import numpy as np
+from PyQt6.QtCore import Qt, QAbstractTableModel, QAbstractProxyModel, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QTableView, QHeaderView, QAbstractItemView
+
+KEY_COLUMN = 0
+VALUE_COLUMN = 1
+BUTTON_COLUMN = 2
+
+
+def isSectionKey(key):
+    """键是否为表名行（以[]包围）"""
+    return key.startswith('[') and key.endswith(']')
+
+
+def parseTableContent(content):
+    """
+    将 "[表名]" / "键=值" 格式的文本拆分为并行的键、值列表。
+    空行及不含 '=' 的普通行被忽略，键和值去除首尾空白。
+    """
+    keys = []
+    values = []
+    append_key = keys.append
+    append_value = values.append
+    for line in content.split('\n'):
+        if not line:
+            continue
+        if line.startswith('[') and line.endswith(']'):
+            append_key(line)
+            append_value("")
+        else:
+            key, sep, value = line.partition('=')
+            if sep:
+                append_key(key.strip())
+                append_value(value.strip())
+    return keys, values
+
+
+class ColumnSequence:
+    """
+    GXTColumns 按表格行展开后的键列或值列（只读切片 + 单元格覆盖）。
+    rows 为各行对应的条目序号，表名行为 -(表序号 + 1)；overrides 为 {行号: 编辑后的文本}。
+    """
+
+    def __init__(self, columns, rows, is_key, overrides=None):
+        self._columns = columns
+        self._rows = rows
+        self._is_key = is_key
+        self._overrides = {} if overrides is None else overrides
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _cell(self, row):
+        text = self._overrides.get(row)
+        if text is not None:
+            return text
+        entry = int(self._rows[row])
+        if entry < 0:
+            return f"[{self._columns.names[-entry - 1]}]" if self._is_key else ""
+        return self._columns.key(entry) if self._is_key else self._columns.value(entry)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self._cell(i) for i in range(*row.indices(len(self._rows)))]
+        if row < 0:
+            row += len(self._rows)
+        if not 0 <= row < len(self._rows):
+            raise IndexError("行号超出范围")
+        return self._cell(row)
+
+    def __setitem__(self, row, text):
+        if row < 0:
+            row += len(self._rows)
+        self._overrides[row] = text
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def tolist(self):
+        """按行展开为列表（覆盖的单元格取编辑后的文本）"""
+        columns = self._columns
+        rows = self._rows
+        is_entry = rows >= 0
+        entries = rows[is_entry]
+        cells = [""] * len(rows)
+        if self._is_key:
+            texts = columns.keyList(entries)
+        else:
+            text = columns.text
+            texts = [text[s:e] for s, e in zip(columns.starts[entries].tolist(), columns.ends[entries].tolist())]
+        for row, cell in zip(np.flatnonzero(is_entry).tolist(), texts):
+            cells[row] = cell
+        if self._is_key:
+            for row in np.flatnonzero(~is_entry).tolist():
+                cells[row] = f"[{columns.names[-int(rows[row]) - 1]}]"
+        for row, cell in self._overrides.items():
+            cells[row] = cell
+        return cells
+
+    def copy(self):
+        return ColumnSequence(self._columns, self._rows, self._is_key, dict(self._overrides))
+
+
+def columnRows(columns):
+    """GXTColumns 各表依次展开为表格行时，各行对应的条目序号（表名行为 -(表序号 + 1)，None 表没有表名行）"""
+    has_header = np.array([name is not None for name in columns.names], dtype=bool)
+    header_rows = columns.bounds[:-1] + np.cumsum(has_header) - 1
+    rows = np.empty(len(columns) + int(has_header.sum()), dtype=np.int64)
+    is_header = np.zeros(len(rows), dtype=bool)
+    is_header[header_rows[has_header]] = True
+    rows[is_header] = -(np.flatnonzero(has_header) + 1)
+    rows[~is_header] = np.arange(len(columns))
+    return rows
+
+
+class GXTTableModel(QAbstractTableModel):
+    """基于并行键/值序列的表格模型，第三列为悬停按钮占位列"""
+
+    # 单元格文本被修改：行, 列, 旧文本, 新文本
+    cellEdited = pyqtSignal(int, int, str, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._keys = []
+        self._values = []
+        self._columns = None  # 未经结构修改的列式数据（ColumnSequence 的来源）
+        self._headers = ["", "", ""]
+        self._value_font = QFont()
+        self._section_font = QFont()
+        self._section_font.setBold(True)
+
+    # ---- 数据访问 ----
+    def keys(self):
+        """键序列（列表或 ColumnSequence，直接引用，调用方只读）"""
+        return self._keys
+
+    def values(self):
+        """值序列（列表或 ColumnSequence，直接引用，调用方只读）"""
+        return self._values
+
+    def snapshot(self):
+        """键、值序列的副本，供后台线程使用（列式数据本身不可变，只复制覆盖表）"""
+        if self._columns is not None:
+            return self._keys.copy(), self._values.copy()
+        return list(self._keys), list(self._values)
+
+    def setRows(self, keys, values):
+        """整体替换表格内容，仅触发一次模型重置"""
+        self.beginResetModel()
+        self._columns = None
+        self._keys = list(keys)
+        self._values = list(values)
+        self.endResetModel()
+
+    def setColumns(self, columns):
+        """以列式数据（gta.gxt.GXTColumns）替换表格内容，不展开为逐行字符串"""
+        self.beginResetModel()
+        self._columns = columns
+        rows = columnRows(columns)
+        self._keys = ColumnSequence(columns, rows, True)
+        self._values = ColumnSequence(columns, rows, False)
+        self.endResetModel()
+
+    def _materialize(self):
+        """插入/删除行前转换为普通列表"""
+        if self._columns is not None:
+            self._keys = self._keys.tolist()
+            self._values = self._values.tolist()
+            self._columns = None
+
+    def cellText(self, row, column):
+        if column == KEY_COLUMN:
+            return self._keys[row]
+        if column == VALUE_COLUMN:
+            return self._values[row]
+        return ""
+
+    def isSection(self, row):
+        return isSectionKey(self._keys[row])
+
+    def sectionRows(self):
+        """返回 [(表名, 行号)]，表名不含方括号"""
+        if self._columns is not None and not self._keys._overrides:
+            rows = self._keys._rows
+            return [(self._columns.names[-int(rows[row]) - 1], row) for row in np.flatnonzero(rows < 0).tolist()]
+        return [(key[1:-1], row) for row, key in enumerate(self._keys) if isSectionKey(key)]
+
+    def toText(self):
+        """按 "[表名]" / "键=值" 格式拼接全部行"""
+        return "\n".join(key if isSectionKey(key) else f"{key}={value}"
+                         for key, value in zip(self._keys, self._values))
+
+    def toTables(self):
+        """
+        按表名分组返回 {表名: [(键, 值)]}（表名不含方括号，保持出现顺序），供构建器直接使用。
+        第一个表名之前的条目归入 None（GTA3 没有表，全部条目都在 None 下）；同名表合并。
+        """
+        if self._columns is not None and not self._keys._overrides and not self._values._overrides:
+            # 未编辑过的列式数据直接按表取出
+            tables = {}
+            for table_index, name in enumerate(self._columns.names):
+                tables.setdefault(name, []).extend(self._columns.tableEntries(table_index))
+            return tables
+        tables = {}
+        current = None
+        for key, value in zip(self._keys, self._values):
+            if isSectionKey(key):
+                current = tables.setdefault(key[1:-1], [])
+            else:
+                if current is None:
+                    current = tables.setdefault(None, [])
+                current.append((key, value))
+        return tables
+
+    def setValueFont(self, font):
+        """设置Value列字体并刷新该列"""
+        self._value_font = QFont(font)
+        if self._keys:
+            self.dataChanged.emit(self.index(0, VALUE_COLUMN),
+                                  self.index(len(self._keys) - 1, VALUE_COLUMN),
+                                  [Qt.ItemDataRole.FontRole])
+
+    def setHeaderLabels(self, labels):
+        self._headers = (list(labels) + ["", "", ""])[:3]
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, 2)
+
+    # ---- QAbstractTableModel 接口 ----
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._keys)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 3
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.EditRole:
+            if column == KEY_COLUMN:
+                return self._keys[row]
+            if column == VALUE_COLUMN:
+                return self._values[row]
+            return None
+        if role == Qt.ItemDataRole.FontRole:
+            if column == VALUE_COLUMN:
+                return self._value_font
+            if column == KEY_COLUMN and isSectionKey(self._keys[row]):
+                return self._section_font
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        row, column = index.row(), index.column()
+        if column == KEY_COLUMN:
+            column_data = self._keys
+        elif column == VALUE_COLUMN:
+            column_data = self._values
+        else:
+            return False
+        new_text = "" if value is None else str(value)
+        old_text = column_data[row]
+        if new_text == old_text:
+            return False
+        column_data[row] = new_text
+        # 键列变化可能改变表名粗体，整行刷新
+        self.dataChanged.emit(self.index(row, KEY_COLUMN), self.index(row, VALUE_COLUMN))
+        self.cellEdited.emit(row, column, old_text, new_text)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        if index.column() == BUTTON_COLUMN:
+            return Qt.ItemFlag.ItemIsEnabled
+        if index.column() == KEY_COLUMN and isSectionKey(self._keys[index.row()]):
+            # 表名允许编辑但不参与选中
+            return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsEditable
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsEditable | Qt.ItemFlag.ItemIsSelectable
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._headers[section] if 0 <= section < len(self._headers) else None
+        return str(section + 1)
+
+    def insertRows(self, row, count, parent=QModelIndex()):
+        if count <= 0 or row < 0 or row > len(self._keys):
+            return False
+        self._materialize()
+        self.beginInsertRows(parent, row, row + count - 1)
+        self._keys[row:row] = [""] * count
+        self._values[row:row] = [""] * count
+        self.endInsertRows()
+        return True
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if count <= 0 or row < 0 or row + count > len(self._keys):
+            return False
+        self._materialize()
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self._keys[row:row + count]
+        del self._values[row:row + count]
+        self.endRemoveRows()
+        return True
+
+
+class RowFilterProxyModel(QAbstractProxyModel):
+    """按给定的源行号集合过滤行的代理模型；行号为 None 时显示全部行"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = None  # 升序的源行号数组
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        model.dataChanged.connect(self._onSourceDataChanged)
+        model.headerDataChanged.connect(self.headerDataChanged)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._onSourceReset)
+        model.rowsAboutToBeInserted.connect(self._onSourceRowsAboutToBeInserted)
+        model.rowsInserted.connect(self._onSourceRowsInserted)
+        model.rowsAboutToBeRemoved.connect(self._onSourceRowsAboutToBeRemoved)
+        model.rowsRemoved.connect(self._onSourceRowsRemoved)
+
+    def filterRows(self):
+        return self._rows
+
+    def setFilterRows(self, rows):
+        """设置可见的源行号（任意可迭代对象），None 表示取消过滤"""
+        self.beginResetModel()
+        self._rows = None if rows is None else np.unique(np.asarray(rows, dtype=np.int64))
+        self.endResetModel()
+
+    # ---- 行号映射 ----
+    def mapToSource(self, proxy_index):
+        source = self.sourceModel()
+        if source is None or not proxy_index.isValid():
+            return QModelIndex()
+        row = proxy_index.row()
+        if self._rows is not None:
+            row = int(self._rows[row])
+        return source.index(row, proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = source_index.row()
+        if self._rows is not None:
+            pos = int(np.searchsorted(self._rows, row))
+            if pos >= len(self._rows) or self._rows[pos] != row:
+                return QModelIndex()
+            row = pos
+        return self.index(row, source_index.column())
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < self.rowCount() and 0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        source = self.sourceModel()
+        if parent.isValid() or source is None:
+            return 0
+        return source.rowCount() if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        source = self.sourceModel()
+        if parent.isValid() or source is None:
+            return 0
+        return source.columnCount()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        source = self.sourceModel()
+        if source is None:
+            return None
+        if orientation == Qt.Orientation.Vertical and self._rows is not None:
+            if not 0 <= section < len(self._rows):
+                return None
+            # 过滤后仍显示源行号
+            section = int(self._rows[section])
+        return source.headerData(section, orientation, role)
+
+    # ---- 源模型变化 ----
+    def _onSourceDataChanged(self, top_left, bottom_right, roles=()):
+        first, last = top_left.row(), bottom_right.row()
+        if self._rows is not None:
+            first = int(np.searchsorted(self._rows, first))
+            last = int(np.searchsorted(self._rows, last, side='right')) - 1
+            if first > last:
+                return
+        self.dataChanged.emit(self.index(first, top_left.column()),
+                              self.index(last, bottom_right.column()), roles)
+
+    def _onSourceReset(self):
+        # 新内容载入后取消过滤
+        self._rows = None
+        self.endResetModel()
+
+    def _onSourceRowsAboutToBeInserted(self, parent, first, last):
+        if self._rows is None:
+            self.beginInsertRows(QModelIndex(), first, last)
+
+    def _onSourceRowsInserted(self, parent, first, last):
+        if self._rows is None:
+            self.endInsertRows()
+            return
+        # 过滤状态下新插入的行总是可见，其后的行号整体后移
+        self.beginResetModel()
+        count = last - first + 1
+        rows = self._rows
+        self._rows = np.concatenate((rows[rows < first], np.arange(first, last + 1, dtype=np.int64),
+                                     rows[rows >= first] + count))
+        self.endResetModel()
+
+    def _onSourceRowsAboutToBeRemoved(self, parent, first, last):
+        if self._rows is None:
+            self.beginRemoveRows(QModelIndex(), first, last)
+
+    def _onSourceRowsRemoved(self, parent, first, last):
+        if self._rows is None:
+            self.endRemoveRows()
+            return
+        self.beginResetModel()
+        count = last - first + 1
+        rows = self._rows
+        self._rows = np.concatenate((rows[rows < first], rows[rows > last] - count))
+        self.endResetModel()
+
+
+class TableCell:
+    """按需生成的轻量单元格句柄，兼容 QTableWidgetItem 的常用读写接口"""
+    __slots__ = ('_model', '_row', '_column')
+
+    def __init__(self, model, row, column):
+        self._model = model
+        self._row = row
+        self._column = column
+
+    def row(self):
+        return self._row
+
+    def column(self):
+        return self._column
+
+    def text(self):
+        return self._model.cellText(self._row, self._column)
+
+    def setText(self, text):
+        self._model.setData(self._model.index(self._row, self._column), text)
+
+    def setFont(self, font):
+        # 字体由模型统一提供（表名粗体、Value列自定义字体），此处无需逐项设置
+        pass
+
+
+class GXTTableView(QTableView):
+    """使用 GXTTableModel 的表格视图，保留 QTableWidget 风格的行/单元格接口"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._model = GXTTableModel(self)
+        self._proxy = RowFilterProxyModel(self)
+        self._proxy.setSourceModel(self._model)
+        self.setModel(self._proxy)
+        vh = self.verticalHeader()
+        if vh is not None:
+            # 统一行高，视图无需逐行计算尺寸
+            vh.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+            vh.setDefaultSectionSize(32)
+
+    def gxtModel(self):
+        return self._model
+
+    def setRowFilter(self, rows):
+        """只显示给定的源行号，None 显示全部行"""
+        self._proxy.setFilterRows(rows)
+
+    def _viewIndex(self, row, column):
+        return self._proxy.mapFromSource(self._model.index(row, column))
+
+    def sourceRowAt(self, pos):
+        """视口坐标处的源行号，无对应行时返回 -1"""
+        index = self.indexAt(pos)
+        return self._proxy.mapToSource(index).row() if index.isValid() else -1
+
+    def isRowHidden(self, row):
+        return not self._viewIndex(row, 0).isValid()
+
+    def selectRow(self, row):
+        index = self._viewIndex(row, 0)
+        if index.isValid():
+            super().selectRow(index.row())
+
+    def rowCount(self):
+        return self._model.rowCount()
+
+    def columnCount(self):
+        return self._model.columnCount()
+
+    def setColumnCount(self, count):
+        # 列数固定为 键/值/按钮 三列
+        pass
+
+    def setRowCount(self, count):
+        current = self._model.rowCount()
+        if count <= 0:
+            self._model.setRows([], [])
+        elif count < current:
+            self._model.removeRows(count, current - count)
+        elif count > current:
+            self._model.insertRows(current, count - current)
+
+    def clearContents(self):
+        self._model.setRows([], [])
+
+    def setHorizontalHeaderLabels(self, labels):
+        self._model.setHeaderLabels(labels)
+
+    def item(self, row, column):
+        if 0 <= row < self._model.rowCount() and 0 <= column < 3:
+            return TableCell(self._model, row, column)
+        return None
+
+    def selectedItems(self):
+        return [TableCell(self._model, source.row(), source.column())
+                for source in map(self._proxy.mapToSource, self.selectedIndexes())]
+
+    def scrollToItem(self, item, hint=QAbstractItemView.ScrollHint.EnsureVisible):
+        if item is not None:
+            index = self._viewIndex(item.row(), item.column())
+            if index.isValid():
+                self.scrollTo(index, hint)
+
+    def insertRow(self, row):
+        self._model.insertRows(row, 1)
+
+    def removeRow(self, row):
+        self._model.removeRows(row, 1)
+
+    def setRowHeight(self, row, height):
+        # 行高统一由垂直表头默认尺寸决定
+        pass
+
+    def setCellWidget(self, row, column, widget):
+        index = self._viewIndex(row, column)
+        if index.isValid():
+            self.setIndexWidget(index, widget)
+
+    def removeCellWidget(self, row, column):
+        index = self._viewIndex(row, column)
+        if index.isValid() and self.indexWidget(index) is not None:
+            self.setIndexWidget(index, None)